@@ -0,0 +1,100 @@
+import pygame
+from collections import OrderedDict
+from constants import ROTATION_STEPS, ROTATION_CACHE_BYTES
+
+
+class AssetCache:
+    """
+    Process-wide store of loaded images, keyed by (path, size, flags).
+    Each key is decoded, converted and scaled once; every later request gets
+    the same Surface, so callers must treat the result as read-only (copy()
+    it before drawing on it). flags is pygame.SRCALPHA for convert_alpha(),
+    0 for an opaque convert().
+    Rotated frames of those surfaces are cached too, see rotated().
+    """
+    def __init__(self, rotation_steps=ROTATION_STEPS, rotation_bytes=ROTATION_CACHE_BYTES):
+        self.surfaces = {}
+        self.keys = {}   # id of a cached surface -> its key
+        self.frames = OrderedDict()  # (key, step) -> rotated surface, least recently used first
+        self.rotation_steps = rotation_steps
+        self.rotation_bytes = rotation_bytes
+        self.bytes = 0   # Pixel memory held by the cached surfaces
+        self.frame_bytes = 0  # ... and by the rotated frames
+        self.loads = 0   # Images decoded from disk
+        self.hits = 0    # Requests answered from the cache
+
+    def image(self, path, size=None, flags=pygame.SRCALPHA):
+        key = (path, tuple(size) if size is not None else None, flags)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+        # Only the requested size is kept: most sprites are drawn far smaller
+        # than their source files.
+        self.loads += 1
+        surface = pygame.image.load(path)
+        surface = surface.convert_alpha() if flags & pygame.SRCALPHA else surface.convert()
+        if size is not None:
+            surface = pygame.transform.scale(surface, size)
+        self.surfaces[key] = surface
+        self.keys[id(surface)] = key
+        self.bytes += surface_bytes(surface)
+        return surface
+
+    def rotated(self, surface, angle):
+        """
+        pygame.transform.rotate(surface, angle) with the angle snapped to the
+        nearest of rotation_steps buckets. Each frame of a cached surface is
+        rendered on first use and shared by every entity drawing that sprite;
+        frames beyond rotation_bytes are dropped least recently used first.
+        Surfaces that did not come from the cache are rotated exactly.
+        """
+        key = self.keys.get(id(surface))
+        if key is None:
+            return pygame.transform.rotate(surface, angle)
+        step = round(angle * self.rotation_steps / 360) % self.rotation_steps
+        frame = self.frames.get((key, step))
+        if frame is not None:
+            self.frames.move_to_end((key, step))
+            return frame
+        frame = pygame.transform.rotate(surface, step * 360 / self.rotation_steps)
+        self.frames[(key, step)] = frame
+        self.frame_bytes += surface_bytes(frame)
+        while self.frame_bytes > self.rotation_bytes and len(self.frames) > 1:
+            _, dropped = self.frames.popitem(last=False)
+            self.frame_bytes -= surface_bytes(dropped)
+        return frame
+
+    def preload(self, entries):
+        """Load (path, size) or (path, size, flags) entries ahead of use, e.g. when a level starts."""
+        for entry in entries:
+            self.image(*entry)
+
+    def clear(self):
+        self.surfaces = {}
+        self.keys = {}
+        self.frames = OrderedDict()
+        self.bytes = 0
+        self.frame_bytes = 0
+
+    def stats(self):
+        return (f"{len(self.surfaces)} surfaces, {self.bytes / 1024 / 1024:.1f} MB, "
+                f"{len(self.frames)} rotated frames, {self.frame_bytes / 1024 / 1024:.1f} MB, "
+                f"{self.loads} loads, {self.hits} hits")
+
+
+def surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+asset_cache = AssetCache()
+
+
+def load_image(path, size=None, flags=pygame.SRCALPHA):
+    """Shared Surface for path at size from the process-wide asset_cache."""
+    return asset_cache.image(path, size, flags)
+
+
+def rotate_image(surface, angle):
+    """surface rotated by angle degrees, from the process-wide asset_cache."""
+    return asset_cache.rotated(surface, angle)
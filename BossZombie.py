@@ -1,8 +1,12 @@
 import pygame
 import math
-from constants import ZOMBIE_COLOR, ZOMBIE_SIZE, ZOMBIE_SPEED, COLLISION_THRESHOLD
+from constants import ZOMBIE_COLOR, ZOMBIE_SIZE, ZOMBIE_SPEED, COLLISION_THRESHOLD, BOSS_ZOMBIE_IMAGE_PATH
+from AssetCache import load_image, rotate_image
 from MapManager import line_of_sight_clear
+from FlowField import follow_flow_field
+from Zombie import request_path
 from ToxicPuddle import ToxicPuddle
+from SpatialHash import static_index_for
 
 class BossZombie:
     def __init__(self, spawn_pos, speed_multiplier=1.0):
@@ -20,9 +24,7 @@ class BossZombie:
         self.attack_cooldown = 3000  # Cooldown for ranged attack (3 seconds)
         self.toxic_puddles = []  # List to store toxic puddles
 
-        ZOMBIE_IMAGE_PATH = "assets/Boss_zombie.png"
-        self.original_image = pygame.image.load(ZOMBIE_IMAGE_PATH).convert_alpha()
-        self.original_image = pygame.transform.scale(self.original_image, (self.size, self.size))
+        self.original_image = load_image(BOSS_ZOMBIE_IMAGE_PATH, (self.size, self.size))
         self.image = self.original_image
 
     def take_damage(self, damage, game=None):
@@ -43,10 +45,13 @@ class BossZombie:
             puddle_position = player_pos.copy()
             self.toxic_puddles.append(ToxicPuddle(puddle_position))  # Add a toxic puddle
 
-    def update(self, player_pos, obstacles, map_manager):
+    def update(self, player_pos, obstacles, map_manager, los_clear=None):
         current_time = pygame.time.get_ticks()
+        # los_clear is passed in when line of sight was batched for every enemy.
+        if los_clear is None:
+            los_clear = line_of_sight_clear(self.pos, player_pos, obstacles)
         # Try direct approach if line-of-sight is clear.
-        if line_of_sight_clear(self.pos, player_pos, obstacles):
+        if los_clear:
             direction = player_pos - self.pos
             if direction.length() > 0:
                 self.angle = math.degrees(math.atan2(-direction.y, direction.x)) - 90
@@ -55,21 +60,22 @@ class BossZombie:
                 candidate_rect = pygame.Rect(candidate_pos.x - self.size // 2,
                                              candidate_pos.y - self.size // 2,
                                              self.size, self.size)
-                collision = any(candidate_rect.colliderect(obs) for obs in obstacles)
+                collision = static_index_for(obstacles).collides(candidate_rect)
                 if not collision:
                     self.pos = candidate_pos
                     self.path = []
                     self.path_index = 0
                     self.last_path_update = current_time
-                else:
+                elif not follow_flow_field(self, map_manager, obstacles):
                     if current_time - self.last_path_update > 500 and map_manager:
-                        self.path = map_manager.astar(self.pos, player_pos)
-                        self.path_index = 0
+                        request_path(self, player_pos, obstacles, map_manager)
                         self.last_path_update = current_time
+        elif follow_flow_field(self, map_manager, obstacles):
+            self.path = []
+            self.path_index = 0
         else:
             if (not self.path or self.path_index >= len(self.path)) and (current_time - self.last_path_update > 500) and map_manager:
-                self.path = map_manager.astar(self.pos, player_pos)
-                self.path_index = 0
+                request_path(self, player_pos, obstacles, map_manager)
                 self.last_path_update = current_time
             if self.path and self.path_index < len(self.path):
                 target = self.path[self.path_index]
@@ -83,16 +89,22 @@ class BossZombie:
                     candidate_rect = pygame.Rect(candidate_pos.x - self.size // 2,
                                                  candidate_pos.y - self.size // 2,
                                                  self.size, self.size)
-                    collision = any(candidate_rect.colliderect(obs) for obs in obstacles)
+                    collision = static_index_for(obstacles).collides(candidate_rect)
                     if not collision:
                         self.pos = candidate_pos
                     else:
                         if current_time - self.last_path_update > 500 and map_manager:
-                            self.path = map_manager.astar(self.pos, player_pos)
-                            self.path_index = 0
+                            request_path(self, player_pos, obstacles, map_manager)
                             self.last_path_update = current_time
                 self.angle = math.degrees(math.atan2(-direction.y, direction.x)) - 90
 
+        self.update_attacks(player_pos)
+
+    def update_attacks(self, player_pos):
+        """
+        Ranged attack and toxic puddles, every frame after moving. EnemyPool
+        calls this directly for the frames it moves the boss itself.
+        """
         # Perform ranged attack
         self.ranged_attack(player_pos)
 
@@ -104,9 +116,15 @@ class BossZombie:
                            self.pos.y - self.size // 2,
                            self.size, self.size)
 
-    def draw(self, surface, offset, player):
+    def puddle_damage(self, player):
+        """Hurt the player for each of this boss's puddles they stand in."""
+        for puddle in self.toxic_puddles:
+            if player.get_rect().colliderect(puddle.rect):
+                player.take_damage(puddle.damage)
+
+    def draw(self, surface, offset):
         # Draw the boss zombie
-        rotated_image = pygame.transform.rotate(self.original_image, self.angle)
+        rotated_image = rotate_image(self.original_image, self.angle)
         img_rect = rotated_image.get_rect(center=(self.pos.x - offset.x, self.pos.y - offset.y))
         surface.blit(rotated_image, img_rect)
         self.draw_health_bar(surface, offset)
@@ -114,8 +132,6 @@ class BossZombie:
         # Draw toxic puddles
         for puddle in self.toxic_puddles:
             puddle.draw(surface, offset)
-            if player.get_rect().colliderect(puddle.rect):  # Check if player is in the puddle
-                player.take_damage(puddle.damage)
     
     def draw_health_bar(self, surface, offset):
         """
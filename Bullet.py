@@ -3,12 +3,23 @@ from constants import BULLET_SPEED
 
 
 class Bullet:
+    __slots__ = ("pos", "direction", "speed", "distance_traveled", "prev_pos", "size", "pool_index")
+
     def __init__(self, pos, direction):
-        self.pos = pos
-        self.direction = direction
+        self.pos = pygame.Vector2(pos)
+        self.direction = pygame.Vector2(direction)
         self.speed = BULLET_SPEED
         self.distance_traveled = 0
+        self.prev_pos = pygame.Vector2(self.pos)  # Where the last BulletSweep left it
         self.size = 5
+        self.pool_index = -1
+
+    def reset(self, pos, direction):
+        """Reuse this bullet for a new shot (see ObjectPool)."""
+        self.pos.update(pos)
+        self.direction.update(direction)
+        self.distance_traveled = 0
+        self.prev_pos.update(pos)
 
     def update(self):
         self.pos += self.direction * self.speed
@@ -17,4 +28,13 @@ class Bullet:
     def draw(self, surface, offset):
         pygame.draw.circle(surface, (255, 255, 0), 
                           (int(self.pos.x - offset.x), int(self.pos.y - offset.y)), 
-                          self.size)
\ No newline at end of file
+                          self.size)
+
+
+def draw_bullets(surface, bullets, camera):
+    """Bullet.draw for a list of bullets, moved to screen space in one go."""
+    if not bullets:
+        return
+    points = camera.world_to_screen([(bullet.pos.x, bullet.pos.y) for bullet in bullets]).astype(int)
+    for bullet, point in zip(bullets, points.tolist()):
+        pygame.draw.circle(surface, (255, 255, 0), point, bullet.size)
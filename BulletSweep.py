@@ -0,0 +1,123 @@
+import numpy as np
+from VisibilityTable import segment_box_entry
+from SpatialHash import static_index_for
+from constants import ENEMY_BUCKET_SIZE
+
+
+def circle_entry(p0, p1, centres, radii):
+    """
+    Row-wise: parameter t in [0, 1] where segment p0[i]-p1[i] first comes
+    closer than radii[i] to centres[i], or inf. Segments starting inside enter at 0.
+    """
+    d = p1 - p0
+    f = p0 - centres
+    a = (d * d).sum(axis=1)
+    b = 2 * (f * d).sum(axis=1)
+    c = (f * f).sum(axis=1) - radii ** 2
+    disc = b * b - 4 * a * c
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (-b - np.sqrt(np.maximum(disc, 0))) / (2 * a)
+    entered = (disc > 0) & (a > 0) & (t >= 0) & (t <= 1)
+    return np.where(c < 0, 0.0, np.where(entered, t, np.inf))
+
+
+def cell_pairs(low, high, cells, cell_size):
+    """
+    (i, k) index arrays pairing box i [low[i], high[i]] with every entry k
+    whose hash cell cells[k] (col, row) the box covers. Entries are sorted by
+    cell key, so each box only reads the cells it covers rather than every entry.
+    """
+    if not len(cells) or not len(low):
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+    first, last = cells.min(axis=0), cells.max(axis=0)
+    width = last[0] - first[0] + 1
+    keys = (cells[:, 0] - first[0]) + (cells[:, 1] - first[1]) * width
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+
+    # The cells of each box, clipped to those holding any entry.
+    low = np.maximum(np.floor(low / cell_size).astype(int), first)
+    high = np.minimum(np.floor(high / cell_size).astype(int), last)
+    span = np.maximum(high - low + 1, 0)
+    count = span[:, 0] * span[:, 1]
+    box = np.repeat(np.arange(len(low)), count)
+    k = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+    col = low[box, 0] + k % span[box, 0]
+    row = low[box, 1] + k // span[box, 0]
+    cell = (col - first[0]) + (row - first[1]) * width
+
+    # Every entry of each of those cells.
+    start = np.searchsorted(keys, cell, side="left")
+    n = np.searchsorted(keys, cell, side="right") - start
+    offset = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+    return np.repeat(box, n), order[np.repeat(start, n) + offset]
+
+
+class BulletSweep:
+    """
+    First thing each bullet touched since the previous sweep (prev_pos to pos):
+    an enemy, closer than enemy.size to its centre, or one of the collision
+    rects. Candidates come from spatial indexes around each bullet's swept box
+    (enemy hash cells of ENEMY_BUCKET_SIZE, the map's StaticSpatialHash of
+    the walls); the exact hits are then resolved for all pairs at once with NumPy,
+    so fast bullets no longer tunnel through small enemies or walls.
+    """
+    def __init__(self, bullets, enemies, obstacles):
+        self.enemies = list(enemies)  # Callers remove kills from their own list
+        self.columns = {id(enemy): j for j, enemy in enumerate(self.enemies)}
+        starts = np.array([(b.prev_pos.x, b.prev_pos.y) for b in bullets], dtype=float).reshape(-1, 2)
+        ends = np.array([(b.pos.x, b.pos.y) for b in bullets], dtype=float).reshape(-1, 2)
+        # The next sweep starts here, however many updates a bullet gets in between.
+        for bullet in bullets:
+            bullet.prev_pos.update(bullet.pos)
+        seg_low = np.minimum(starts, ends)
+        seg_high = np.maximum(starts, ends)
+
+        # Enemies: circles whose centre lies in a hash cell within reach of the swept box.
+        centres = np.array([(e.pos.x, e.pos.y) for e in self.enemies], dtype=float).reshape(-1, 2)
+        radii = np.array([e.size for e in self.enemies], dtype=float)
+        reach = radii.max() if len(radii) else 0
+        cells = np.floor(centres / ENEMY_BUCKET_SIZE).astype(int)
+        seg, enemy = cell_pairs(seg_low - reach, seg_high + reach, cells, ENEMY_BUCKET_SIZE)
+        t = circle_entry(starts[seg], ends[seg], centres[enemy], radii[enemy])
+        hit = np.isfinite(t)
+        seg, enemy, t = seg[hit], enemy[hit], t[hit]
+        # Per bullet: (t, column) of every enemy on its path, earliest first,
+        # ties in list order. hit() skips the ones already killed.
+        self.candidates = [[] for _ in range(len(starts))]
+        order = np.lexsort((enemy, t, seg))
+        for i, j, entry in zip(seg[order].tolist(), enemy[order].tolist(), t[order].tolist()):
+            self.candidates[i].append((entry, j))
+
+        # Walls: rects the map's static index holds in the cells of the swept box.
+        static_index = static_index_for(obstacles)
+        cells, boxes = static_index.arrays()
+        seg, box = cell_pairs(seg_low - 1, seg_high + 1, cells, static_index.bucket_size)
+        low = boxes[box, :2]
+        high = low + boxes[box, 2:]
+        self.wall_t = np.full(len(starts), np.inf)
+        # A rect spanning several cells may be paired twice; the minimum does not mind.
+        np.minimum.at(self.wall_t, seg, segment_box_entry(starts[seg], ends[seg], low, high))
+        self.wall_t = self.wall_t.tolist()
+        self.dead = set()
+
+    def hit(self, index):
+        """
+        (enemy, wall) for bullet index: the enemy it reached first, or None,
+        and whether a wall stopped it before any enemy.
+        """
+        j, t = None, np.inf
+        for entry, column in self.candidates[index]:
+            if column not in self.dead:
+                j, t = column, entry
+                break
+        wall_t = self.wall_t[index]
+        if t <= wall_t and t != np.inf:
+            return self.enemies[j], False
+        return None, wall_t != np.inf
+
+    def remove(self, enemy):
+        """Killed enemies stop later bullets of the same sweep."""
+        j = self.columns.get(id(enemy))
+        if j is not None:
+            self.dead.add(j)
@@ -0,0 +1,39 @@
+import numpy as np
+import pygame
+from constants import WIDTH, HEIGHT, CAMERA_SMOOTHING
+
+
+class Camera:
+    """
+    The viewport. offset is the world position of the screen's top-left
+    corner; follow() keeps a target (the player) centred. smoothing is the part
+    of the way to the target left to cover each frame: 0 snaps to it, values
+    towards 1 trail further behind. Jumps of more than a screen always snap.
+    """
+    def __init__(self, view_size=(WIDTH, HEIGHT), smoothing=CAMERA_SMOOTHING):
+        self.view_size = view_size
+        self.smoothing = smoothing
+        self.offset = pygame.Vector2()
+        self.following = False
+
+    def follow(self, target):
+        """Move towards centring target; call once per frame."""
+        goal = pygame.Vector2(target.x - self.view_size[0] // 2, target.y - self.view_size[1] // 2)
+        far = abs(goal.x - self.offset.x) > self.view_size[0] or abs(goal.y - self.offset.y) > self.view_size[1]
+        if not self.smoothing or not self.following or far:
+            self.offset.update(goal)
+        else:
+            self.offset += (goal - self.offset) * (1 - self.smoothing)
+        self.following = True
+
+    def visible_rect(self, margin=0):
+        """The world rect on screen, grown by margin on every side."""
+        return pygame.Rect(int(self.offset.x) - margin, int(self.offset.y) - margin,
+                           self.view_size[0] + 2 * margin, self.view_size[1] + 2 * margin)
+
+    def screen_to_world(self, pos):
+        return pygame.Vector2(pos) + self.offset
+
+    def world_to_screen(self, positions):
+        """(n, 2) array of world positions to screen positions, in one NumPy operation."""
+        return np.asarray(positions, dtype=float).reshape(-1, 2) - (self.offset.x, self.offset.y)
@@ -0,0 +1,113 @@
+import math
+import pygame
+from collections import OrderedDict
+from constants import MAP_CHUNK_SIZE, MAP_CHUNK_CACHE_BYTES
+
+
+class ChunkCache:
+    """
+    Static map layers pre-rendered into chunk_size squares. Chunks are baked
+    on first sight with the per-tile path (draw_tiles / object_blits), then a
+    frame is a handful of chunk blits. layer_name None stands for all tile
+    layers together, any other name for the tile objects of that object layer.
+    Chunks over max_bytes are dropped least recently used first. Only the map
+    drawn last is cached: drawing another one clears everything.
+    """
+    def __init__(self, chunk_size=MAP_CHUNK_SIZE, max_bytes=MAP_CHUNK_CACHE_BYTES):
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self.tmx_data = None
+        self.chunks = OrderedDict()  # (layer_name, col, row) -> Surface
+        self.empty = set()           # (layer_name, col, row) of chunks with nothing to draw
+        self.extents = {}            # layer_name -> Rect the layer draws into, or None
+        self.bytes = 0
+        self.renders = 0
+
+    def clear(self):
+        self.tmx_data = None
+        self.chunks = OrderedDict()
+        self.empty = set()
+        self.extents = {}
+        self.bytes = 0
+
+    def extent(self, tmx_data, layer_name):
+        key = layer_name
+        if key not in self.extents:
+            from utilityFunctions import tile_overhang, object_blits
+            if layer_name is None:
+                extra_cols, extra_rows = tile_overhang(tmx_data)
+                area = pygame.Rect(0, 0, (tmx_data.width + extra_cols) * tmx_data.tilewidth,
+                                   (tmx_data.height + extra_rows) * tmx_data.tileheight)
+            else:
+                layer = tmx_data.get_layer_by_name(layer_name)
+                rects = [image.get_rect(topleft=position)
+                         for image, position in object_blits(tmx_data, layer, pygame.Vector2(), None)]
+                area = rects[0].unionall(rects[1:]) if rects else None
+            self.extents[key] = area
+        return self.extents[key]
+
+    def render(self, tmx_data, layer_name, col, row):
+        """Bake one chunk; None if nothing of the layer falls into it."""
+        from utilityFunctions import tile_blits, object_blits
+        self.renders += 1
+        origin = pygame.Vector2(col * self.chunk_size, row * self.chunk_size)
+        size = (self.chunk_size, self.chunk_size)
+        if layer_name is None:
+            batch = tile_blits(tmx_data, origin, size)
+        else:
+            batch = object_blits(tmx_data, tmx_data.get_layer_by_name(layer_name), origin, size)
+        if not batch:
+            return None
+        chunk = pygame.Surface(size, pygame.SRCALPHA)
+        chunk.blits(batch, False)
+        if pygame.mask.from_surface(chunk, 254).count() == size[0] * size[1]:
+            chunk = chunk.convert()  # Fully opaque: same pixels, cheaper blits
+        return chunk
+
+    def chunk(self, tmx_data, layer_name, col, row):
+        key = (layer_name, col, row)
+        if key in self.chunks:
+            self.chunks.move_to_end(key)
+            return self.chunks[key]
+        if key in self.empty:
+            return None
+        chunk = self.render(tmx_data, layer_name, col, row)
+        if chunk is None:
+            self.empty.add(key)  # Bounded by the map's size, so kept until the map changes
+            return None
+        self.chunks[key] = chunk
+        self.bytes += chunk.get_width() * chunk.get_height() * chunk.get_bytesize()
+        while self.bytes > self.max_bytes and len(self.chunks) > 1:
+            _, dropped = self.chunks.popitem(last=False)
+            self.bytes -= dropped.get_width() * dropped.get_height() * dropped.get_bytesize()
+        return chunk
+
+    def draw(self, surface, tmx_data, layer_name, offset):
+        """Blit the chunks of the layer that overlap surface, seen from offset."""
+        if tmx_data is not self.tmx_data:
+            self.clear()  # Drop the previous map's chunks and its tmx_data with them
+            self.tmx_data = tmx_data
+        area = self.extent(tmx_data, layer_name)
+        if area is None:
+            return
+        width, height = surface.get_size()
+        size = self.chunk_size
+        left, top = math.ceil(offset.x), math.ceil(offset.y)  # Same whole-pixel offset as tile_blits
+        col_start = max(left // size, area.left // size)
+        row_start = max(top // size, area.top // size)
+        col_end = min(-(-(left + width) // size), -(-area.right // size))
+        row_end = min(-(-(top + height) // size), -(-area.bottom // size))
+        batch = []
+        for row in range(row_start, row_end):
+            for col in range(col_start, col_end):
+                chunk = self.chunk(tmx_data, layer_name, col, row)
+                if chunk is not None:
+                    batch.append((chunk, (col * size - left, row * size - top)))
+        surface.blits(batch, False)
+
+    def stats(self):
+        return (f"{len(self.chunks)} map chunks, {len(self.empty)} empty, "
+                f"{self.bytes / 1024 / 1024:.1f} MB, {self.renders} renders")
+
+
+chunk_cache = ChunkCache()
@@ -1,8 +1,11 @@
 import pygame, math
 from constants import PLAYER_SPEED, PLAYER_SIZE, PLAYER_MAX_HEALTH, HEALTH_PACK_AMOUNT, AMMO_PACK_AMOUNT, GUN_COMPANION
 from CompanionBullet import CompanionBullet
-from constants import PLAYER_SPEED, PLAYER_SIZE, PLAYER_MAX_HEALTH, HEALTH_PACK_AMOUNT, AMMO_PACK_AMOUNT, GUN_COMPANION
+from constants import PLAYER_SPEED, PLAYER_SIZE, PLAYER_MAX_HEALTH, HEALTH_PACK_AMOUNT, AMMO_PACK_AMOUNT, GUN_COMPANION, COMPANION_BULLET_POOL_SIZE
 from CompanionBullet import CompanionBullet
+from ObjectPool import ObjectPool
+from AssetCache import load_image, rotate_image
+from SpatialHash import static_index_for
 
 class Companion:
     def __init__(self, pos, comp_type):
@@ -16,11 +19,10 @@ class Companion:
         self.last_action = 0
         self.action_cooldown = 1000  # milliseconds cooldown
         # Load an image for the companion (gun companion for example)
-        self.image = pygame.image.load(GUN_COMPANION).convert_alpha()
-        self.image = pygame.transform.scale(self.image, (self.size, self.size))
+        self.image = load_image(GUN_COMPANION, (self.size, self.size))
         self.original_image = self.image  # Store the original image for rotation
         self.rect = self.image.get_rect(center=(self.pos.x, self.pos.y))
-        self.bullets = []
+        self.bullets = ObjectPool(CompanionBullet, COMPANION_BULLET_POOL_SIZE)
         self.angle = 0  # Initial angle
 
     def update(self, player, zombies, obstacles):
@@ -38,8 +40,8 @@ class Companion:
             new_rect = self.rect.copy()
             new_rect.center = new_pos
 
-            # Check for collisions with obstacles (use obs directly)
-            collision = any(new_rect.colliderect(obs) for obs in obstacles)
+            # Check for collisions with the obstacles near the new rect
+            collision = static_index_for(obstacles).collides(new_rect)
             if not collision:
                 self.pos = new_pos
 
@@ -51,9 +53,9 @@ class Companion:
                 closest = min(zombies, key=lambda z: (z.pos - self.pos).length())
                 if (closest.pos - self.pos).length() < 300:
                     bullet_direction = closest.pos - self.pos
-                    self.bullets.append(CompanionBullet(self.pos, bullet_direction))
+                    self.bullets.spawn(self.pos, bullet_direction)
                     bullet_direction = closest.pos - self.pos
-                    self.bullets.append(CompanionBullet(self.pos, bullet_direction))
+                    self.bullets.spawn(self.pos, bullet_direction)
                     self.last_action = current_time
                     self.angle = math.degrees(math.atan2(bullet_direction.y, bullet_direction.x))
                     self.angle = math.degrees(math.atan2(bullet_direction.y, bullet_direction.x))
@@ -80,29 +82,29 @@ class Companion:
                 self.last_action = current_time
 
         # Update bullets
-        for bullet in self.bullets[:]:
+        for bullet in list(self.bullets):
             bullet.update()
             if bullet.distance_traveled > bullet.max_distance:
-                self.bullets.remove(bullet)
+                self.bullets.release(bullet)
 
         self.rect.center = (self.pos.x, self.pos.y)
 
         # Update companion bullets.
-        for bullet in self.bullets[:]:
+        for bullet in list(self.bullets):
             bullet.update()
             if bullet.distance_traveled > bullet.max_distance:
-                self.bullets.remove(bullet)
+                self.bullets.release(bullet)
 
         self.rect.center = (self.pos.x, self.pos.y)
 
     def draw(self, surface, offset):
-        rotated_image = pygame.transform.rotate(self.original_image, -self.angle)
+        rotated_image = rotate_image(self.original_image, -self.angle)
         new_rect = rotated_image.get_rect(center=self.rect.center)
         surface.blit(rotated_image, (self.pos.x - offset.x - new_rect.width // 2, self.pos.y - offset.y - new_rect.height // 2))
         for bullet in self.bullets:
             bullet.draw(surface, offset)
 
-        rotated_image = pygame.transform.rotate(self.original_image, -self.angle)
+        rotated_image = rotate_image(self.original_image, -self.angle)
         new_rect = rotated_image.get_rect(center=self.rect.center)
         surface.blit(rotated_image, (self.pos.x - offset.x - new_rect.width // 2, self.pos.y - offset.y - new_rect.height // 2))
         for bullet in self.bullets:
@@ -2,13 +2,25 @@ import pygame
 from constants import BULLET_COLOR
 
 class CompanionBullet:
+    __slots__ = ("pos", "direction", "speed", "size", "distance_traveled", "prev_pos", "max_distance", "pool_index")
+
     def __init__(self, pos, direction):
         self.pos = pygame.Vector2(pos)
         self.direction = direction.normalize()
         self.speed = 10
         self.size = 5
         self.distance_traveled = 0
+        self.prev_pos = pygame.Vector2(self.pos)  # Where the last BulletSweep left it
         self.max_distance = 500
+        self.pool_index = -1
+
+    def reset(self, pos, direction):
+        """Reuse this bullet for a new shot (see ObjectPool)."""
+        self.pos.update(pos)
+        self.direction.update(direction)
+        self.direction.normalize_ip()
+        self.distance_traveled = 0
+        self.prev_pos.update(pos)
 
     def update(self):
         self.pos += self.direction * self.speed
@@ -0,0 +1,169 @@
+import math
+import pygame
+from constants import DECAL_LIFETIME, DECAL_BUCKETS, DECAL_CHUNK_SIZE, DECAL_LAYER_MIN
+
+
+class DecalLayer:
+    """
+    Blood splatters stamped into world-space chunk surfaces. Time is split into
+    buckets of lifetime / buckets ms, each with its own chunks, kept in a ring:
+    when the ring comes round to a bucket again its chunks are wiped and
+    reused, so nothing is tracked per decal. The buckets are flattened into one
+    composite chunk per cell, rebuilt only where a bucket expires or fades, so
+    a frame is one blit per cell in view however many zombies have died.
+
+    A bucket stays fully opaque until its newest splatter is lifetime old, so
+    each splatter is shown whole for lifetime to lifetime + one bucket of ms
+    (5 to 5.5 s by default), then fades out in fade_steps steps over one more
+    bucket. With fewer than min_live splatters alive the composites are slower
+    than the sprites themselves, so those are blitted one by one instead.
+    """
+    def __init__(self, sprite, anchor=(50, 20), lifetime=DECAL_LIFETIME, buckets=DECAL_BUCKETS,
+                 chunk_size=DECAL_CHUNK_SIZE, fade_steps=4, min_live=DECAL_LAYER_MIN):
+        self.sprite = sprite
+        self.fading_sprite = sprite.copy()  # Carries the fading bucket's alpha
+        self.anchor = pygame.Vector2(anchor)  # Sprite pixel that lands on the decal position
+        self.bucket_ms = lifetime // buckets
+        self.chunk_size = chunk_size
+        self.fade_steps = fade_steps
+        self.min_live = min_live
+        ring = buckets + 2  # The bucket being stamped and the one fading out
+        self.epochs = [None] * ring  # Bucket number each ring slot holds, None if empty
+        self.layers = [{} for _ in range(ring)]  # ring slot -> {(col, row): Surface}
+        self.spots = [[] for _ in range(ring)]  # ring slot -> sprite topleft of each splatter
+        self.alphas = [255] * ring
+        self.composite = {}  # (col, row) -> all live buckets blitted together
+        self.dirty = set()   # Cells whose composite must be rebuilt
+        self.spare = []      # Wiped chunks waiting to be reused
+        self.stamps = 0
+        self.rebuilds = 0
+
+    def new_chunk(self):
+        if self.spare:
+            return self.spare.pop()
+        return pygame.Surface((self.chunk_size, self.chunk_size), pygame.SRCALPHA)
+
+    def free_chunk(self, chunk):
+        chunk.fill((0, 0, 0, 0))
+        chunk.set_alpha(255)
+        self.spare.append(chunk)
+
+    def wipe(self, index):
+        for cell, chunk in self.layers[index].items():
+            self.free_chunk(chunk)
+            self.dirty.add(cell)
+        self.layers[index] = {}
+        self.spots[index] = []
+        self.epochs[index] = None
+        self.alphas[index] = 255
+
+    def stamp(self, pos, time):
+        """Leave the sprite at world pos, stamped at time (ms)."""
+        self.stamps += 1
+        epoch = time // self.bucket_ms
+        index = epoch % len(self.layers)
+        if self.epochs[index] != epoch:
+            self.wipe(index)
+            self.epochs[index] = epoch
+        layer = self.layers[index]
+        size = self.chunk_size
+        rect = self.sprite.get_rect(topleft=(math.floor(pos[0] - self.anchor.x), math.floor(pos[1] - self.anchor.y)))
+        self.spots[index].append(rect.topleft)
+        for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+            for col in range(rect.left // size, (rect.right - 1) // size + 1):
+                position = (rect.left - col * size, rect.top - row * size)
+                chunk = layer.get((col, row))
+                if chunk is None:
+                    chunk = layer[(col, row)] = self.new_chunk()
+                chunk.blit(self.sprite, position)
+                # The newest bucket is composited last, so it can be stamped straight on top
+                if (col, row) not in self.dirty:
+                    if (col, row) not in self.composite:
+                        self.composite[(col, row)] = self.new_chunk()
+                    self.composite[(col, row)].blit(self.sprite, position)
+
+    def update(self, time):
+        """Expire and fade buckets as of time (ms), then rebuild the cells they touched."""
+        epoch = time // self.bucket_ms
+        ring = len(self.layers)
+        for index in range(ring):
+            if self.epochs[index] is None:
+                continue
+            age = epoch - self.epochs[index]
+            if age >= ring:
+                self.wipe(index)
+            elif age == ring - 1:
+                # Steps of fade left in the bucket's last stretch of time
+                left = ((self.epochs[index] + ring) * self.bucket_ms - time) * self.fade_steps // self.bucket_ms + 1
+                alpha = 255 * left // (self.fade_steps + 1)
+                if alpha != self.alphas[index]:
+                    self.alphas[index] = alpha
+                    self.dirty.update(self.layers[index])
+        if self.dirty:
+            self.rebuild(epoch)
+
+    def rebuild(self, epoch):
+        ring = len(self.layers)
+        oldest_first = sorted((index for index in range(ring) if self.epochs[index] is not None),
+                              key=lambda index: self.epochs[index])
+        for cell in self.dirty:
+            chunks = [(self.layers[index][cell], self.alphas[index])
+                      for index in oldest_first if cell in self.layers[index]]
+            composite = self.composite.pop(cell, None)
+            if not chunks:
+                if composite is not None:
+                    self.free_chunk(composite)
+                continue
+            if composite is None:
+                composite = self.new_chunk()
+            else:
+                composite.fill((0, 0, 0, 0))
+            for chunk, alpha in chunks:
+                chunk.set_alpha(alpha)
+                composite.blit(chunk, (0, 0))
+            self.composite[cell] = composite
+            self.rebuilds += 1
+        self.dirty = set()
+
+    def draw(self, surface, offset, time):
+        """Blit the splatters still live at time (ms), as seen from offset."""
+        self.update(time)
+        if sum(len(spots) for spots in self.spots) < self.min_live:
+            self.draw_sprites(surface, offset)
+            return
+        size = self.chunk_size
+        width, height = surface.get_size()
+        left, top = math.ceil(offset.x), math.ceil(offset.y)
+        col_start, row_start = left // size, top // size
+        col_end, row_end = -(-(left + width) // size), -(-(top + height) // size)
+        if len(self.composite) < (col_end - col_start) * (row_end - row_start):
+            cells = [cell for cell in self.composite
+                     if col_start <= cell[0] < col_end and row_start <= cell[1] < row_end]
+        else:
+            cells = [(col, row) for row in range(row_start, row_end) for col in range(col_start, col_end)
+                     if (col, row) in self.composite]
+        surface.blits([(self.composite[col, row], (col * size - left, row * size - top))
+                       for col, row in cells], False)
+
+    def draw_sprites(self, surface, offset):
+        left, top = math.ceil(offset.x), math.ceil(offset.y)
+        for index in sorted((index for index in range(len(self.layers)) if self.epochs[index] is not None),
+                            key=lambda index: self.epochs[index]):
+            sprite = self.sprite
+            if self.alphas[index] != 255:
+                sprite = self.fading_sprite
+                sprite.set_alpha(self.alphas[index])
+            surface.blits([(sprite, (x - left, y - top)) for x, y in self.spots[index]], False)
+
+    def clear(self):
+        for index in range(len(self.layers)):
+            self.wipe(index)
+        for chunk in self.composite.values():
+            self.free_chunk(chunk)
+        self.composite = {}
+        self.dirty = set()
+
+    def stats(self):
+        chunks = sum(len(layer) for layer in self.layers)
+        return (f"Decals: {chunks} bucket chunks, {len(self.composite)} composite, {len(self.spare)} spare, "
+                f"{self.stamps} stamps, {self.rebuilds} rebuilds")
@@ -6,15 +6,25 @@ from pygame.locals import *
 from constants import (WIDTH, HEIGHT, FPS, SPAWN_INTERVAL, COLLISION_THRESHOLD,
                        TEXT_COLOR, DARK_RED, PLAYER_MAX_HEALTH, PLAYER_SIZE,
                        BULLET_RANGE, HEALTH_PACK_AMOUNT, AMMO_PACK_AMOUNT, ZOMBIE_SIZE,
-                       BASE_ZOMBIE_SPEED, BASE_ZOMBIE_SIZE)
+                       BASE_ZOMBIE_SPEED, BASE_ZOMBIE_SIZE, BULLET_POOL_SIZE, PICKUP_POOL_SIZE)
 from Player import Player
-from Pickup import Pickup
+from Bullet import Bullet, draw_bullets
+from Pickup import Pickup, draw_pickups
+from DecalLayer import DecalLayer
+from ObjectPool import ObjectPool
+from AssetCache import asset_cache, load_image
 from utilityFunctions import load_map, load_collision_rects, draw_map, draw_objects, spawn_special_zombie
 from Companion import Companion
-from MapManager import MapManager
+from MapManager import MapManager, line_of_sight_many
+from BulletSweep import BulletSweep
+from EnemyPool import EnemyPool
 from minimap import draw_minimap
-from spawn import spawn_all_enemies_equally, find_player_spawn
+from spawn import spawn_all_enemies_equally, find_player_spawn, endless_assets
 from arsenal import draw_arsenal
+from HudProfiler import hud_profiler
+from ViewCuller import view_culler
+from Camera import Camera
+from TextCache import render_text, text_cache
 from BossZombie import BossZombie
 from sound import Sound
 from pause import pause
@@ -45,9 +55,11 @@ def endless_mode():
     safe_pos = find_player_spawn(tmx_data)
     player = Player(safe_pos)
     player.ammo = 50  # Starting with more ammo in endless mode
+    camera = Camera()
     
     # Load blood splatter effect
-    dead_sprite = pygame.image.load('assets/Dead_img.png').convert_alpha()
+    dead_sprite = load_image('assets/Dead_img.png')
+    asset_cache.preload(endless_assets())
     
     # Initialize companion
     companion = Companion(player.pos + pygame.Vector2(60, 0), "gun")
@@ -57,12 +69,20 @@ def endless_mode():
     # Initialize map manager
     obstacles = collision_rects
     map_manager = MapManager(obstacles, player.pos)
+    enemy_pool = EnemyPool()  # Array copy of the enemies, moved once per frame
     
     # Game object lists and counters
     zombies = []
-    bullets = []
-    pickups = []
-    dead_zombies = []
+    bullets = ObjectPool(Bullet, BULLET_POOL_SIZE)
+    pickups = ObjectPool(Pickup, PICKUP_POOL_SIZE)
+    dead_zombies = DecalLayer(dead_sprite)
+    # Pool high-water marks and cache figures, for sizing them, in the F3 overlay.
+    hud_profiler.track("bullets", bullets.stats)
+    hud_profiler.track("companion bullets", lambda: companion.bullets.stats())
+    hud_profiler.track("pickups", pickups.stats)
+    hud_profiler.track("decals", dead_zombies.stats)
+    hud_profiler.track("assets", lambda: "Assets: " + asset_cache.stats())
+    hud_profiler.track("texts", text_cache.stats)
     puddles = []
     total_kill_count = 0
     
@@ -91,6 +111,9 @@ def endless_mode():
         dt = clock.tick(FPS) / 1000.0
         current_time = pygame.time.get_ticks()
         survival_time = (current_time - start_time) // 1000  # Time in seconds
+        if not game_over:
+            camera.follow(player.pos)
+        offset = camera.offset
         
         # Process events
         for event in pygame.event.get():
@@ -101,9 +124,13 @@ def endless_mode():
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_p:  # Pause game
                     pause(screen)
+                if event.key == pygame.K_F3:  # Show HUD timings
+                    hud_profiler.visible = not hud_profiler.visible
                 if event.key == pygame.K_q and game_over:  # Quit when game over
+                    map_manager.close()
                     return
                 if event.key == pygame.K_r and game_over:  # Restart when game over
+                    map_manager.close()  # The restarted game builds its own worker pool
                     endless_mode()
                     return
                 if event.key == K_e:  # Toggle knife
@@ -115,18 +142,11 @@ def endless_mode():
             
             # Combat events
             if not game_over:
-                offset = pygame.Vector2(player.pos.x - WIDTH // 2, player.pos.y - HEIGHT // 2)
-                mouse_pos = pygame.mouse.get_pos()
-                world_mouse_pos = pygame.Vector2(mouse_pos) + offset
+                world_mouse_pos = camera.screen_to_world(pygame.mouse.get_pos())
                 
                 if event.type == MOUSEBUTTONDOWN:
                     if event.button == 1:  # Left-click to shoot
-                        result = player.shoot(world_mouse_pos)
-                        if result:
-                            if isinstance(result, list):
-                                bullets.extend(result)
-                            else:
-                                bullets.append(result)
+                        player.shoot(world_mouse_pos, bullets)
                     elif event.button == 3 and player.has_knife:  # Right-click knife attack
                         player.use_knife()
                         attacked = player.knife_attack(zombies)
@@ -134,7 +154,7 @@ def endless_mode():
                             if z in zombies:
                                 if z.take_damage(999, None):  # Instant kill via knife
                                     zombies.remove(z)
-                                    dead_zombies.append((z.pos.copy(), pygame.time.get_ticks()))
+                                    dead_zombies.stamp(z.pos, pygame.time.get_ticks())
                                     total_kill_count += 1
                                     wave_kills += 1
                 
@@ -164,78 +184,84 @@ def endless_mode():
                     player.pos.y + random.randint(-200, 200)
                 )
                 pickup_type = 'health' if random.random() < 0.5 else 'ammo'
-                pickups.append(Pickup(pickup_pos, pickup_type))
+                pickups.spawn(pickup_pos, pickup_type)
         
         if not game_over:
             # Update player
-            offset = pygame.Vector2(player.pos.x - WIDTH // 2, player.pos.y - HEIGHT // 2)
-            mouse_pos = pygame.mouse.get_pos()
-            world_mouse_pos = pygame.Vector2(mouse_pos) + offset
+            world_mouse_pos = camera.screen_to_world(pygame.mouse.get_pos())
             player.update_rotation(world_mouse_pos)
             player.update(collision_rects)
             player.update_invincibility()
             
             # Update bullets and check for collisions
-            for bullet in bullets[:]:
+            for bullet in list(bullets):
                 bullet.update()
                 if bullet.distance_traveled > BULLET_RANGE:
-                    bullets.remove(bullet)
-                    continue
-                for enemy in zombies[:]:
-                    if (bullet.pos - enemy.pos).length() < enemy.size:
-                        if enemy.take_damage(50, None):
-                            dead_zombies.append((enemy.pos.copy(), pygame.time.get_ticks()))
-                            zombies.remove(enemy)
-                            total_kill_count += 1
-                            wave_kills += 1
-                            # 30% chance to spawn a pickup
-                            if random.random() < 0.3:
-                                pickup_type = 'health' if random.random() < 0.5 else 'ammo'
-                                pickups.append(Pickup(enemy.pos.copy(), pickup_type))
-                        if bullet in bullets:
-                            bullets.remove(bullet)
-                        break
+                    bullets.release(bullet)
+            live = list(bullets)
+            sweep = BulletSweep(live, zombies, obstacles)
+            for index, bullet in enumerate(live):
+                enemy, wall = sweep.hit(index)
+                if enemy is not None:
+                    if enemy.take_damage(50, None):
+                        dead_zombies.stamp(enemy.pos, pygame.time.get_ticks())
+                        zombies.remove(enemy)
+                        sweep.remove(enemy)
+                        total_kill_count += 1
+                        wave_kills += 1
+                        # 30% chance to spawn a pickup
+                        if random.random() < 0.3:
+                            pickup_type = 'health' if random.random() < 0.5 else 'ammo'
+                            pickups.spawn(enemy.pos, pickup_type)
+                if enemy is not None or wall:
+                    bullets.release(bullet)
             
             # Update companion if visible
             if show_companion:
                 companion.update(player, zombies, obstacles)
-                for bullet in companion.bullets[:]:
+                for bullet in list(companion.bullets):
                     bullet.update()
                     if bullet.distance_traveled > bullet.max_distance:
-                        companion.bullets.remove(bullet)
-                        continue
-                    for enemy in zombies[:]:
-                        if (bullet.pos - enemy.pos).length() < enemy.size:
-                            if enemy.take_damage(50, None):
-                                dead_zombies.append((enemy.pos.copy(), pygame.time.get_ticks()))
-                                zombies.remove(enemy)
-                                total_kill_count += 1
-                                wave_kills += 1
-                                if random.random() < 0.3:
-                                    pickups.append(Pickup(enemy.pos.copy(), random.choice(["health", "ammo"])))
-                            if bullet in companion.bullets:
-                                companion.bullets.remove(bullet)
-                            break
+                        companion.bullets.release(bullet)
+                live = list(companion.bullets)
+                sweep = BulletSweep(live, zombies, obstacles)
+                for index, bullet in enumerate(live):
+                    enemy, wall = sweep.hit(index)
+                    if enemy is not None:
+                        if enemy.take_damage(50, None):
+                            dead_zombies.stamp(enemy.pos, pygame.time.get_ticks())
+                            zombies.remove(enemy)
+                            sweep.remove(enemy)
+                            total_kill_count += 1
+                            wave_kills += 1
+                            if random.random() < 0.3:
+                                pickups.spawn(enemy.pos, random.choice(["health", "ammo"]))
+                    if enemy is not None or wall:
+                        companion.bullets.release(bullet)
             
             # Update pickups
-            for pickup in pickups[:]:
+            for pickup in list(pickups):
                 if (player.pos - pickup.pos).length() < player.size + pickup.size:
                     pickup_sound.play()
                     if pickup.type == 'health':
                         player.health = min(PLAYER_MAX_HEALTH, player.health + HEALTH_PACK_AMOUNT)
                     else:
                         player.ammo += AMMO_PACK_AMOUNT
-                    pickups.remove(pickup)
+                    pickups.release(pickup)
             
             # Update zombies and check player collision
-            for enemy in zombies[:]:
+            map_manager.flow_field.update(player.pos)
+            enemies = zombies[:]
+            los_clear = line_of_sight_many([(enemy.pos.x, enemy.pos.y) for enemy in enemies], player.pos, collision_rects)
+            enemy_pool.update(enemies, player.pos, collision_rects, map_manager, los_clear)
+            for enemy in enemy_pool.touching(player.get_rect()):
+                damage = 20 if isinstance(enemy, BossZombie) else 10
+                player.take_damage(damage)
+            for enemy in zombies:
                 if isinstance(enemy, BossZombie):
-                    enemy.update(player.pos, collision_rects, map_manager)
-                else:
-                    enemy.update(player.pos, collision_rects, map_manager)
-                if player.get_rect().colliderect(enemy.get_rect()):
-                    damage = 20 if isinstance(enemy, BossZombie) else 10
-                    player.take_damage(damage)
+                    enemy.puddle_damage(player)
+            view_rect = camera.visible_rect()
+            map_manager.scheduler.process(player.pos, zombies, view_rect)
             
             # Check if player is dead
             if player.health <= 0:
@@ -247,26 +273,15 @@ def endless_mode():
         draw_objects(screen, tmx_data, "props", offset)
         
         # Draw blood effects
-        current_time = pygame.time.get_ticks()
-        for item in dead_zombies[:]:
-            pos, death_time = item
-            if current_time - death_time < 5000:
-                screen.blit(dead_sprite, pos - offset - pygame.Vector2(50, 20))
-            else:
-                dead_zombies.remove(item)
-        
-        # Draw all game objects
-        for zombie in zombies[:]:
-            if isinstance(zombie, BossZombie):
-                zombie.draw(screen, offset, player)
-            else:
-                zombie.draw(screen, offset)
+        dead_zombies.draw(screen, offset, pygame.time.get_ticks())
         
-        for bullet in bullets:
-            bullet.draw(screen, offset)
+        # Draw all game objects, skipping those off screen
+        view_culler.look(camera)
+        for zombie in view_culler.visible(zombies, always=BossZombie):
+            zombie.draw(screen, offset)
         
-        for pickup in pickups:
-            pickup.draw(screen, offset)
+        draw_bullets(screen, view_culler.visible(bullets), camera)
+        draw_pickups(screen, view_culler.visible(pickups), camera)
         
         if show_companion:
             companion.draw(screen, offset)
@@ -274,29 +289,36 @@ def endless_mode():
         player.draw(screen, offset)
         
         # Draw HUD elements
+        hud_profiler.start()
         # Health bar
         pygame.draw.rect(screen, (255, 0, 0), (20, 20, 200, 20))
         pygame.draw.rect(screen, (0, 255, 0), (20, 20, 200 * (player.health / PLAYER_MAX_HEALTH), 20))
         
         # Ammo and stats text
-        ammo_text = font.render(f'AMMO: {player.ammo}', True, TEXT_COLOR)
-        wave_text = font.render(f'WAVE: {wave_number}', True, TEXT_COLOR)
-        kills_text = font.render(f'KILLS: {total_kill_count}', True, TEXT_COLOR)
-        time_text = font.render(f'SURVIVAL TIME: {survival_time}s', True, TEXT_COLOR)
-        wave_progress_text = font.render(f'WAVE PROGRESS: {wave_kills}/{wave_kill_threshold}', True, TEXT_COLOR)
+        ammo_text = render_text(font, f'AMMO: {player.ammo}', True, TEXT_COLOR)
+        wave_text = render_text(font, f'WAVE: {wave_number}', True, TEXT_COLOR)
+        kills_text = render_text(font, f'KILLS: {total_kill_count}', True, TEXT_COLOR)
+        time_text = render_text(font, f'SURVIVAL TIME: {survival_time}s', True, TEXT_COLOR)
+        wave_progress_text = render_text(font, f'WAVE PROGRESS: {wave_kills}/{wave_kill_threshold}', True, TEXT_COLOR)
         
         screen.blit(ammo_text, (20, 45))
         screen.blit(wave_text, (WIDTH // 2 - 50, 20))
         screen.blit(kills_text, (20, 70))
         screen.blit(time_text, (WIDTH - 240, 20))
         screen.blit(wave_progress_text, (WIDTH - 240, 50))
+        hud_profiler.lap("stats")
         
         # Draw minimap
         draw_minimap(screen, tmx_data, collision_rects, player, zombies, 
                      companion if show_companion else None, None)
+        hud_profiler.lap("minimap")
         
         # Draw arsenal
         draw_arsenal(screen, player)
+        hud_profiler.lap("arsenal")
+        hud_profiler.count("text renders", text_cache.end_frame())
+        hud_profiler.count("draws skipped", view_culler.end_frame())
+        hud_profiler.draw(screen, font)
         
         # Game over screen
         if game_over:
@@ -304,13 +326,13 @@ def endless_mode():
             overlay.fill((0, 0, 0, 180))
             screen.blit(overlay, (0, 0))
             
-            game_over_text = large_font.render("GAME OVER", True, TEXT_COLOR)
-            restart_text = font.render("Press R to Restart", True, TEXT_COLOR)
-            quit_text = font.render("Press Q to Quit", True, TEXT_COLOR)
+            game_over_text = render_text(large_font, "GAME OVER", True, TEXT_COLOR)
+            restart_text = render_text(font, "Press R to Restart", True, TEXT_COLOR)
+            quit_text = render_text(font, "Press Q to Quit", True, TEXT_COLOR)
             
-            final_wave_text = font.render(f"Final Wave: {wave_number}", True, TEXT_COLOR)
-            final_kills_text = font.render(f"Total Kills: {total_kill_count}", True, TEXT_COLOR)
-            final_time_text = font.render(f"Survival Time: {survival_time} seconds", True, TEXT_COLOR)
+            final_wave_text = render_text(font, f"Final Wave: {wave_number}", True, TEXT_COLOR)
+            final_kills_text = render_text(font, f"Total Kills: {total_kill_count}", True, TEXT_COLOR)
+            final_time_text = render_text(font, f"Survival Time: {survival_time} seconds", True, TEXT_COLOR)
             
             vertical_spacing = 40
             center_y = HEIGHT // 2 - 50
@@ -0,0 +1,197 @@
+import numpy as np
+import pygame
+from constants import CHASE_CELL_SIZE
+from WalkabilityGrid import walkability_for
+
+
+def facing(direction):
+    """Zombie.angle for each (dx, dy) direction row."""
+    return np.degrees(np.arctan2(-direction[:, 1], direction[:, 0])) - 90
+
+
+def lengths(direction):
+    """Vector2.length() of each row, computed the same way."""
+    return np.sqrt(direction[:, 0] * direction[:, 0] + direction[:, 1] * direction[:, 1])
+
+
+class EnemyPool:
+    """
+    Struct-of-arrays copy of the enemy list: row i of pos, speed, size,
+    health and angle belongs to enemies[i]. update() takes the movement of
+    Zombie.update for all enemies at once: straight at the player when in
+    sight, otherwise one step along the shared flow field. Enemies neither
+    step can move (blocked, following their own A* path) and special
+    zombies keep their per-object update.
+    """
+    def __init__(self):
+        self.enemies = []
+        self.pos = np.zeros((0, 2))
+        self.speed = np.zeros(0)
+        self.size = np.zeros(0)
+        self.health = np.zeros(0)
+        self.angle = np.zeros(0)
+        self.special = np.zeros(0, dtype=bool)
+        self.faces_player = np.zeros(0, dtype=bool)
+        self.attacks = np.zeros(0, dtype=bool)  # Has update_attacks (bosses)
+
+    def sync(self, enemies):
+        """
+        Match the rows to enemies. The arrays are rebuilt from the objects only
+        when the list changed (spawns, kills); otherwise they already hold every
+        move of the last update() and reload(). Health is re-read every time,
+        since bullet hits change it on the objects.
+        """
+        if enemies == self.enemies:  # Same objects in the same order
+            self.health = np.array([e.health for e in self.enemies], dtype=float)
+            return
+        self.enemies = list(enemies)
+        fields = np.array([(e.pos.x, e.pos.y, e.speed, e.size, e.health, e.angle,
+                            e.is_special, getattr(e, "faces_player", False))
+                           for e in self.enemies], dtype=float).reshape(-1, 8)
+        self.pos = fields[:, :2].copy()
+        self.speed = fields[:, 2].copy()
+        self.size = fields[:, 3].copy()
+        self.health = fields[:, 4].copy()
+        self.angle = fields[:, 5].copy()
+        self.special = fields[:, 6] != 0
+        self.faces_player = fields[:, 7] != 0
+        self.attacks = np.array([hasattr(e, "update_attacks") for e in self.enemies], dtype=bool)
+
+    def reload(self, index):
+        """Refresh one row after its enemy moved on its own."""
+        enemy = self.enemies[index]
+        self.pos[index] = (enemy.pos.x, enemy.pos.y)
+        self.angle[index] = enemy.angle
+
+    def rects(self, pos, size):
+        """(left, top, width, height) of get_rect() for enemies of size at pos, truncated like pygame.Rect."""
+        half = size // 2
+        return np.trunc(pos[:, 0] - half), np.trunc(pos[:, 1] - half), np.trunc(size), np.trunc(size)
+
+    def area_free(self, pos, size, obstacles):
+        """True where the rect of an enemy of size at pos overlaps no collision rect."""
+        left, top, width, height = self.rects(pos, size)
+        walkability = walkability_for(obstacles)
+        sums = walkability.blocked_sums(CHASE_CELL_SIZE)
+        rows, cols = sums.shape[0] - 1, sums.shape[1] - 1
+        c0 = np.floor_divide(left, CHASE_CELL_SIZE).astype(int)
+        r0 = np.floor_divide(top, CHASE_CELL_SIZE).astype(int)
+        c1 = np.floor_divide(left + width - 1, CHASE_CELL_SIZE).astype(int)
+        r1 = np.floor_divide(top + height - 1, CHASE_CELL_SIZE).astype(int)
+        inside = (c0 >= 0) & (r0 >= 0) & (c1 < cols) & (r1 < rows)
+        c0, c1 = np.clip(c0, 0, cols - 1), np.clip(c1, 0, cols - 1)
+        r0, r1 = np.clip(r0, 0, rows - 1), np.clip(r1, 0, rows - 1)
+        blocked = sums[r1 + 1, c1 + 1] - sums[r0, c1 + 1] - sums[r1 + 1, c0] + sums[r0, c0]
+        free = inside & (blocked == 0)
+        # Areas touching a blocked cell or the map edge get the exact
+        # Rect.colliderect test against every collision rect.
+        check = np.nonzero(~free)[0]
+        if len(check):
+            _, boxes = walkability.rect_array()
+            x0, y0 = left[check], top[check]
+            x1, y1 = x0 + width[check], y0 + height[check]
+            hits = ((x0[:, None] < boxes[:, 0] + boxes[:, 2]) & (x1[:, None] > boxes[:, 0])
+                    & (y0[:, None] < boxes[:, 1] + boxes[:, 3]) & (y1[:, None] > boxes[:, 1]))
+            free[check] = ~hits.any(axis=1)
+        return free
+
+    def move(self, player_pos, los_clear, flow_field, obstacles):
+        """
+        Move every enemy that can be moved without its own update.
+        Returns (chased, flowed) masks: enemies that stepped straight at the
+        player, and ones that stepped along the flow field. The arrays hold
+        their new pos and angle.
+        """
+        count = len(self.enemies)
+        chased = np.zeros(count, dtype=bool)
+        flowed = np.zeros(count, dtype=bool)
+        if not count:
+            return chased, flowed
+        los_clear = np.asarray(los_clear, dtype=bool)
+        player = np.array((player_pos.x, player_pos.y))
+
+        # In sight: one step straight at the player, if it is not blocked.
+        direction = player - self.pos
+        distance = lengths(direction)
+        seeing = los_clear & ~self.special & (distance > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            candidate = self.pos + direction / distance[:, None] * self.speed[:, None]
+        if seeing.any():
+            chased[seeing] = self.area_free(candidate[seeing], self.size[seeing], obstacles)
+            self.angle[seeing] = facing(direction[seeing])
+        self.pos[chased] = candidate[chased]
+
+        # Out of sight, or blocked: one step towards the next flow field cell.
+        # Close enough to the cell centre, it snaps there without a collision test.
+        trying = np.nonzero((seeing & ~chased) | (~los_clear & ~self.special))[0]
+        if flow_field is not None and len(trying):
+            targets = flow_field.waypoints(self.pos[trying])
+            known = ~np.isnan(targets[:, 0])
+            trying, targets = trying[known], targets[known]
+            direction = targets - self.pos[trying]
+            distance = lengths(direction)
+            snap = distance < self.speed[trying]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                direction = np.where(snap[:, None], direction, direction / distance[:, None])
+            candidate = np.where(snap[:, None], targets, self.pos[trying] + direction * self.speed[trying, None])
+            moved = snap.copy()
+            if (~snap).any():
+                moved[~snap] = self.area_free(candidate[~snap], self.size[trying[~snap]], obstacles)
+            turned = moved & (distance > 0)
+            self.angle[trying[turned]] = facing(direction[turned])
+            self.pos[trying[moved]] = candidate[moved]
+            flowed[trying[moved]] = True
+
+        # Police and humans end every update facing the player.
+        turning = np.nonzero((chased | flowed) & self.faces_player)[0]
+        direction = player - self.pos[turning]
+        distance = lengths(direction)
+        self.angle[turning[distance > 0]] = facing(direction[distance > 0])
+        return chased, flowed
+
+    def update(self, enemies, player_pos, obstacles, map_manager, los_clear):
+        """
+        One tick for every non-special enemy. Special zombies are left to the
+        caller, which then reload()s their rows.
+        """
+        self.sync(enemies)
+        flow_field = map_manager.flow_field if map_manager else None
+        chased, flowed = self.move(player_pos, los_clear, flow_field, obstacles)
+        now = pygame.time.get_ticks()
+        los_clear = np.asarray(los_clear, dtype=bool)
+        moved = chased | flowed
+        enemies = self.enemies
+
+        # Enemies neither step moved get their own update, then one batched reload.
+        stuck = np.nonzero(~moved & ~self.special)[0]
+        for index, clear in zip(stuck.tolist(), los_clear[stuck].tolist()):
+            enemies[index].update(player_pos, obstacles, map_manager, clear)
+        if len(stuck):
+            self.pos[stuck] = [(enemies[i].pos.x, enemies[i].pos.y) for i in stuck.tolist()]
+            self.angle[stuck] = [enemies[i].angle for i in stuck.tolist()]
+
+        # Write the moved rows back, one flat pass per field.
+        rows = np.nonzero(moved)[0]
+        for index, x, y, angle in zip(rows.tolist(), self.pos[rows, 0].tolist(),
+                                      self.pos[rows, 1].tolist(), self.angle[rows].tolist()):
+            enemy = enemies[index]
+            enemy.pos = pygame.Vector2(x, y)
+            enemy.angle = angle
+        # Same bookkeeping as Zombie.update: a direct step, or a flow
+        # step out of sight, drops the enemy's own path.
+        for index in np.nonzero(chased | (flowed & ~los_clear))[0].tolist():
+            enemy = enemies[index]
+            if enemy.path:
+                enemy.path = []
+            enemy.path_index = 0
+        for index in np.nonzero(chased)[0].tolist():
+            enemies[index].last_path_update = now
+        for index in np.nonzero(moved & self.attacks)[0].tolist():
+            enemies[index].update_attacks(player_pos)
+
+    def touching(self, rect):
+        """Enemies whose get_rect() overlaps rect, in list order."""
+        left, top, width, height = self.rects(self.pos, self.size)
+        hit = ((left < rect.right) & (left + width > rect.left) & (top < rect.bottom) & (top + height > rect.top)
+               & (width > 0) & (height > 0))
+        return [self.enemies[i] for i in np.nonzero(hit)[0].tolist()]
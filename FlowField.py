@@ -0,0 +1,94 @@
+import pygame
+import math
+import numpy as np
+from collections import deque
+from SpatialHash import static_index_for
+
+
+class FlowField:
+    """
+    Player-centred breadth-first distance map over the MapManager grid.
+    The field is rebuilt only when the player moves into another cell, so every
+    chasing enemy can read its next step in O(1) instead of running its own A*.
+    """
+    def __init__(self, map_manager):
+        self.map_manager = map_manager
+        self.goal_node = None
+        self.next_node = {}  # node -> neighbouring node one step closer to the player
+        self.targets = None  # (rows, cols, 2) centre of each cell's next node, NaN where there is none
+        self.rebuilds = 0
+
+    def update(self, player_pos):
+        goal_node = self.map_manager.get_node_from_position(player_pos)
+        if goal_node is self.goal_node:
+            return
+        self.goal_node = goal_node
+        self.next_node = {}
+        self.targets = np.full((self.map_manager.rows, self.map_manager.cols, 2), np.nan)
+        if goal_node is None:
+            return
+
+        # Seed from the player's cell even if it touches an obstacle, so the
+        # walkable cells around the player still point towards it.
+        self.rebuilds += 1
+        visited = {goal_node}
+        frontier = deque([goal_node])
+        while frontier:
+            current = frontier.popleft()
+            for neighbor in self.map_manager.get_neighbors(current):
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    self.next_node[neighbor] = current
+                    frontier.append(neighbor)
+        if self.next_node:
+            cells = np.array([(node.row, node.col, step.x, step.y) for node, step in self.next_node.items()])
+            rows, cols = cells[:, 0].astype(int), cells[:, 1].astype(int)
+            self.targets[rows, cols] = cells[:, 2:]
+
+    def next_waypoint(self, pos):
+        """Return the centre of the next cell towards the player, or None."""
+        node = self.map_manager.get_node_from_position(pos)
+        step = self.next_node.get(node)
+        if step is None:
+            return None
+        return pygame.Vector2(step.x, step.y)
+
+    def waypoints(self, points):
+        """next_waypoint for an (n, 2) array of positions: (n, 2) cell centres, NaN where there is none."""
+        result = np.full((len(points), 2), np.nan)
+        if self.targets is None:
+            return result
+        cell_size = self.map_manager.cell_size
+        cols = np.floor_divide(points[:, 0], cell_size).astype(int)
+        rows = np.floor_divide(points[:, 1], cell_size).astype(int)
+        inside = (rows >= 0) & (rows < self.targets.shape[0]) & (cols >= 0) & (cols < self.targets.shape[1])
+        result[inside] = self.targets[rows[inside], cols[inside]]
+        return result
+
+
+def follow_flow_field(enemy, map_manager, obstacles):
+    """
+    Move an enemy one step along the shared flow field.
+    Returns False if the field has no step for the enemy's cell or the step is
+    blocked, so the caller can fall back to its own path.
+    """
+    if map_manager is None:
+        return False
+    target = map_manager.flow_field.next_waypoint(enemy.pos)
+    if target is None:
+        return False
+    direction = target - enemy.pos
+    if direction.length() < enemy.speed:
+        enemy.pos = target
+    else:
+        direction = direction.normalize()
+        candidate_pos = enemy.pos + direction * enemy.speed
+        candidate_rect = pygame.Rect(candidate_pos.x - enemy.size // 2,
+                                     candidate_pos.y - enemy.size // 2,
+                                     enemy.size, enemy.size)
+        if static_index_for(obstacles).collides(candidate_rect):
+            return False
+        enemy.pos = candidate_pos
+    if direction.length() > 0:
+        enemy.angle = math.degrees(math.atan2(-direction.y, direction.x)) - 90
+    return True
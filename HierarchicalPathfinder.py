@@ -0,0 +1,255 @@
+import heapq
+from collections import deque
+from itertools import count
+
+# Border runs shorter than this get a single transition in the middle,
+# longer runs get one at each end (Botea et al., HPA*).
+ENTRANCE_SPLIT_LENGTH = 6
+
+NEIGHBOR_OFFSETS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+class HierarchicalPathfinder:
+    """
+    HPA* over a boolean walkability grid covering the whole map.
+    The grid is split into square clusters; entrances between neighbouring
+    clusters and the in-cluster paths between them are precomputed, so a long
+    query only searches the small abstract graph and then stitches the stored
+    cell paths together. Cells are (row, col) tuples, movement is 4-connected
+    with unit cost, and start/goal cells may themselves be blocked.
+    """
+    def __init__(self, walkable, cluster_size):
+        self.walkable = walkable.tolist()
+        self.rows, self.cols = walkable.shape
+        self.cluster_size = cluster_size
+        self.cluster_nodes = {}  # cluster -> abstract nodes (cells) inside it
+        self.edges = {}          # abstract node -> {neighbour node: (cost, cell path)}
+        self.last_expansions = 0
+        self.build()
+
+    # --- Precomputation ---
+    def cluster_of(self, cell):
+        return (cell[0] // self.cluster_size, cell[1] // self.cluster_size)
+
+    def cluster_bounds(self, cluster):
+        row_start = cluster[0] * self.cluster_size
+        col_start = cluster[1] * self.cluster_size
+        return (row_start, col_start,
+                min(row_start + self.cluster_size, self.rows),
+                min(col_start + self.cluster_size, self.cols))
+
+    def is_walkable(self, row, col):
+        return 0 <= row < self.rows and 0 <= col < self.cols and self.walkable[row][col]
+
+    def add_abstract_node(self, cell):
+        if cell not in self.edges:
+            self.edges[cell] = {}
+            self.cluster_nodes.setdefault(self.cluster_of(cell), []).append(cell)
+
+    def add_transition(self, a, b):
+        self.add_abstract_node(a)
+        self.add_abstract_node(b)
+        self.edges[a][b] = (1, [b])
+        self.edges[b][a] = (1, [a])
+
+    def add_entrances(self, border_cells):
+        """border_cells: (cell, cell across the border) pairs in order along the border."""
+        run = []
+        for a, b in border_cells + [(None, None)]:
+            if a is not None and self.is_walkable(*a) and self.is_walkable(*b):
+                run.append((a, b))
+                continue
+            if run:
+                if len(run) < ENTRANCE_SPLIT_LENGTH:
+                    self.add_transition(*run[len(run) // 2])
+                else:
+                    self.add_transition(*run[0])
+                    self.add_transition(*run[-1])
+            run = []
+
+    def build(self):
+        size = self.cluster_size
+        for col in range(size - 1, self.cols - 1, size):
+            for row_start in range(0, self.rows, size):
+                rows = range(row_start, min(row_start + size, self.rows))
+                self.add_entrances([((row, col), (row, col + 1)) for row in rows])
+        for row in range(size - 1, self.rows - 1, size):
+            for col_start in range(0, self.cols, size):
+                cols = range(col_start, min(col_start + size, self.cols))
+                self.add_entrances([((row, col), (row + 1, col)) for col in cols])
+
+        for cluster, nodes in self.cluster_nodes.items():
+            for node in nodes:
+                for other, path in self.search_cluster(node, cluster, nodes).items():
+                    if other != node:
+                        self.edges[node][other] = (len(path), path)
+
+    def search_cluster(self, start, cluster, targets):
+        """
+        Breadth-first search from start that stays inside cluster.
+        Returns {target cell: cell path from start (exclusive) to target} for
+        every reachable target.
+        """
+        row_start, col_start, row_end, col_end = self.cluster_bounds(cluster)
+        wanted = set(targets)
+        parent = {start: None}
+        found = {}
+        frontier = deque([start])
+        while frontier:
+            current = frontier.popleft()
+            self.last_expansions += 1
+            if current in wanted:
+                path = []
+                cell = current
+                while cell != start:
+                    path.append(cell)
+                    cell = parent[cell]
+                path.reverse()
+                found[current] = path
+                if len(found) == len(wanted):
+                    break
+            row, col = current
+            for d_row, d_col in NEIGHBOR_OFFSETS:
+                neighbor = (row + d_row, col + d_col)
+                if (row_start <= neighbor[0] < row_end and col_start <= neighbor[1] < col_end
+                        and neighbor not in parent and self.walkable[neighbor[0]][neighbor[1]]):
+                    parent[neighbor] = current
+                    frontier.append(neighbor)
+        return found
+
+    # --- Queries ---
+    def find_path(self, start, goal):
+        """
+        Return a list of (row, col) cells from start to goal inclusive, or []
+        if the goal cannot be reached.
+        """
+        self.last_expansions = 0
+        if start == goal:
+            return [start]
+        start_cluster = self.cluster_of(start)
+        goal_cluster = self.cluster_of(goal)
+        if abs(start_cluster[0] - goal_cluster[0]) <= 1 and abs(start_cluster[1] - goal_cluster[1]) <= 1:
+            # Short query: search the grid directly, inside the clusters around both ends.
+            size = self.cluster_size
+            bounds = ((min(start_cluster[0], goal_cluster[0]) - 1) * size,
+                      (min(start_cluster[1], goal_cluster[1]) - 1) * size,
+                      (max(start_cluster[0], goal_cluster[0]) + 2) * size,
+                      (max(start_cluster[1], goal_cluster[1]) + 2) * size)
+            path = self.grid_astar(start, goal, bounds)
+            if path:
+                return path
+        return self.abstract_astar(start, goal)
+
+    def grid_astar(self, start, goal, bounds):
+        """Plain A* on the cell grid inside bounds (row_start, col_start, row_end, col_end)."""
+        row_start, col_start, row_end, col_end = bounds
+        tie = count()
+        open_heap = [(self.distance(start, goal), next(tie), start)]
+        g_score = {start: 0}
+        came_from = {}
+        closed = set()
+        while open_heap:
+            _, _, current = heapq.heappop(open_heap)
+            if current in closed:
+                continue
+            if current == goal:
+                path = [current]
+                while current in came_from:
+                    current = came_from[current]
+                    path.append(current)
+                path.reverse()
+                return path
+            closed.add(current)
+            self.last_expansions += 1
+            row, col = current
+            for d_row, d_col in NEIGHBOR_OFFSETS:
+                neighbor = (row + d_row, col + d_col)
+                if neighbor in closed or not (row_start <= neighbor[0] < row_end and col_start <= neighbor[1] < col_end):
+                    continue
+                if neighbor != goal and not self.is_walkable(*neighbor):
+                    continue
+                tentative_g = g_score[current] + 1
+                if tentative_g < g_score.get(neighbor, float('inf')):
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative_g
+                    heapq.heappush(open_heap, (tentative_g + self.distance(neighbor, goal), next(tie), neighbor))
+        return []
+
+    def endpoint_links(self, cell):
+        """
+        {abstract node: cell path from cell (exclusive) to the node} for the
+        nodes cell can reach. The first step may cross into a neighbouring
+        cluster, so a blocked cell, or one whose only open neighbours lie
+        across a cluster border, is still linked in.
+        """
+        links = {}
+        row, col = cell
+        for d_row, d_col in NEIGHBOR_OFFSETS:
+            first = (row + d_row, col + d_col)
+            if not self.is_walkable(*first):
+                continue
+            cluster = self.cluster_of(first)
+            for node, path in self.search_cluster(first, cluster, self.cluster_nodes.get(cluster, [])).items():
+                path = [first] + path
+                if node != cell and (node not in links or len(path) < len(links[node])):
+                    links[node] = path
+        return links
+
+    def abstract_astar(self, start, goal):
+        """A* on the abstract graph with start and goal temporarily linked in."""
+        start_links = dict(self.edges.get(start, {}))
+        for node, path in self.endpoint_links(start).items():
+            if node not in start_links or len(path) < start_links[node][0]:
+                start_links[node] = (len(path), path)
+        # Search from the goal and reverse the paths (movement is symmetric).
+        goal_links = {}
+        for node, path in self.endpoint_links(goal).items():
+            back = [goal] + path[:-1]
+            back.reverse()
+            goal_links[node] = back
+
+        tie = count()
+        open_heap = [(self.distance(start, goal), next(tie), start)]
+        g_score = {start: 0}
+        came_from = {}  # node -> (previous node, cell path from previous to node)
+        closed = set()
+        while open_heap:
+            _, _, current = heapq.heappop(open_heap)
+            if current in closed:
+                continue
+            if current == goal:
+                return self.refine(start, goal, came_from)
+            closed.add(current)
+            self.last_expansions += 1
+
+            if current == start:
+                links = start_links
+            else:
+                links = self.edges.get(current, {})
+                if current in goal_links:
+                    links = dict(links)
+                    links[goal] = (len(goal_links[current]), goal_links[current])
+            for neighbor, (cost, path) in links.items():
+                if neighbor in closed:
+                    continue
+                tentative_g = g_score[current] + cost
+                if tentative_g < g_score.get(neighbor, float('inf')):
+                    came_from[neighbor] = (current, path)
+                    g_score[neighbor] = tentative_g
+                    heapq.heappush(open_heap, (tentative_g + self.distance(neighbor, goal), next(tie), neighbor))
+        return []
+
+    def refine(self, start, goal, came_from):
+        segments = []
+        node = goal
+        while node != start:
+            node, path = came_from[node]
+            segments.append(path)
+        cells = [start]
+        for path in reversed(segments):
+            cells.extend(path)
+        return cells
+
+    @staticmethod
+    def distance(a, b):
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
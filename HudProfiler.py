@@ -0,0 +1,62 @@
+import time
+from collections import deque
+from constants import HUD_PROFILE_FRAMES, TEXT_COLOR
+
+
+class HudProfiler:
+    """
+    Per-frame cost of the HUD, split into named sections. Call start() before
+    the HUD is drawn and lap(name) after each part of it; report() averages
+    the last HUD_PROFILE_FRAMES frames. count(name, value) records a per-frame
+    figure, such as the texts rendered, averaged the same way. track(name,
+    stats) adds a line from stats() above the timings, for cache and pool
+    figures. The overlay is toggled in game with F3.
+    """
+    def __init__(self, frames=HUD_PROFILE_FRAMES):
+        self.frames = frames
+        self.samples = {}  # section name -> recent times in ms
+        self.counts = {}   # counter name -> recent per-frame values
+        self.tracked = {}  # name -> callable returning a line of stats
+        self.started = 0
+        self.visible = False
+
+    def start(self):
+        self.started = time.perf_counter()
+
+    def lap(self, name):
+        now = time.perf_counter()
+        if name not in self.samples:
+            self.samples[name] = deque(maxlen=self.frames)
+        self.samples[name].append((now - self.started) * 1000)
+        self.started = now
+
+    def count(self, name, value):
+        if name not in self.counts:
+            self.counts[name] = deque(maxlen=self.frames)
+        self.counts[name].append(value)
+
+    def track(self, name, stats):
+        """Show stats() in the overlay; a second call with the same name replaces it."""
+        self.tracked[name] = stats
+
+    def averages(self):
+        return {name: sum(times) / len(times) for name, times in self.samples.items()}
+
+    def report(self):
+        averages = self.averages()
+        parts = [f"{name} {ms:.2f}" for name, ms in averages.items()]
+        report = f"HUD {sum(averages.values()):.2f} ms/frame ({', '.join(parts)})"
+        for name, values in self.counts.items():
+            report += f", {name} {sum(values) / len(values):.2f}/frame"
+        return report
+
+    def draw(self, surface, font):
+        if self.visible and self.samples:
+            bottom = surface.get_height() - 10
+            for line in reversed([self.report()] + [stats() for stats in self.tracked.values()]):
+                text = font.render(line, True, TEXT_COLOR)
+                bottom -= text.get_height()
+                surface.blit(text, (20, bottom))
+
+
+hud_profiler = HudProfiler()
@@ -1,6 +1,14 @@
 import pygame
 import math
-from constants import MAZE_CELL_SIZE, MAZE_REGION_SIZE
+import numpy as np
+from collections import OrderedDict
+from constants import PATH_CELL_SIZE, PATH_CLUSTER_SIZE, PATH_CACHE_SIZE, LOS_CELL_SIZE
+from FlowField import FlowField
+from HierarchicalPathfinder import HierarchicalPathfinder
+from PathScheduler import PathScheduler
+from PathWorkerPool import PathWorkerPool
+from VisibilityTable import VISIBLE, UNKNOWN, segment_box_hits
+from WalkabilityGrid import walkability_for
 
 class Node:
     def __init__(self, x, y, walkable=True, row=0, col=0):
@@ -9,51 +17,195 @@ class Node:
         self.walkable = walkable
         self.row = row
         self.col = col
-        self.g = float('inf')
-        self.h = 0
-        self.f = float('inf')
-        self.parent = None
+
+def segment_blocked(start, end, cells, buckets):
+    """
+    Exact test of the segment start-end against the rects bucketed in cells.
+    Rect.clipline uses the same pixel coverage as Rect.colliderect.
+    """
+    segment = ((start[0], start[1]), (end[0], end[1]))
+    tested = set()  # Rects spanning several cells are tested once
+    for cell in cells:
+        for rect in buckets.get(cell, ()):
+            if id(rect) not in tested:
+                tested.add(id(rect))
+                if rect.clipline(segment):
+                    return True
+    return False
 
 def line_of_sight_clear(start, end, obstacles):
-    steps = int(start.distance_to(end) // 5)
-    if steps == 0:
-        steps = 1
-    for i in range(steps + 1):
-        pos = start.lerp(end, i / steps)
-        point = pygame.Rect(pos.x, pos.y, 1, 1)
-        for obs in obstacles:
-            # Use obs directly because it is a pygame.Rect.
-            if obs.colliderect(point):
-                return False
-    return True
+    """
+    True if the segment from start to end touches no obstacle.
+    The map's VisibilityTable answers most cell pairs directly. Otherwise the
+    cells of the occupancy grid along the segment are walked (Amanatides & Woo
+    DDA) and only the obstacles of blocked cells are tested exactly. Stretches
+    off the map are tested against the rects reaching past its edge.
+    """
+    walkability = walkability_for(obstacles)
+    visible = walkability.visibility().lookup(start, end)
+    if visible != UNKNOWN:
+        return visible == VISIBLE
+    cell_size = LOS_CELL_SIZE
+    grid = walkability.grid_rows(cell_size)
+    rows, cols = len(grid), len(grid[0]) if grid else 0
+    x0, y0 = start.x / cell_size, start.y / cell_size
+    x1, y1 = end.x / cell_size, end.y / cell_size
+    col, row = math.floor(x0), math.floor(y0)
+    end_col, end_row = math.floor(x1), math.floor(y1)
+    dx, dy = x1 - x0, y1 - y0
+    step_col = 1 if dx > 0 else -1
+    step_row = 1 if dy > 0 else -1
+    # Segment parameter t at the next vertical/horizontal grid line, and per cell.
+    t_delta_x = abs(1 / dx) if dx else math.inf
+    t_delta_y = abs(1 / dy) if dy else math.inf
+    t_max_x = ((col + 1 - x0) if dx > 0 else (x0 - col)) * t_delta_x if dx else math.inf
+    t_max_y = ((row + 1 - y0) if dy > 0 else (y0 - row)) * t_delta_y if dy else math.inf
+
+    blocked = []
+    for _ in range(abs(end_col - col) + abs(end_row - row) + 1):
+        if not (0 <= row < rows and 0 <= col < cols):
+            blocked.append(None)
+        elif not grid[row][col]:
+            blocked.append((row, col))
+        if t_max_x < t_max_y:
+            col += step_col
+            t_max_x += t_delta_x
+        else:
+            row += step_row
+            t_max_y += t_delta_y
+    if not blocked:
+        return True
+    return not segment_blocked(start, end, blocked, walkability.rect_buckets(cell_size))
+
+def line_of_sight_many(starts, end, obstacles):
+    """
+    Vectorised line_of_sight_clear from every point in starts to end.
+    starts: sequence of (x, y) points; returns a NumPy bool array.
+    Segments the VisibilityTable cannot answer are cut at every grid line they
+    cross and the cell under the midpoint of each piece is looked up at once;
+    only segments that pass a blocked cell are tested exactly.
+    """
+    starts = np.asarray(starts, dtype=float).reshape(-1, 2)
+    if not len(starts):
+        return np.ones(0, dtype=bool)
+    walkability = walkability_for(obstacles)
+    visible = walkability.visibility().lookup_many(starts, end)
+    clear = visible == VISIBLE
+    unknown = np.nonzero(visible == UNKNOWN)[0]
+    if len(unknown):
+        clear[unknown] = grid_line_of_sight(starts[unknown], end, walkability)
+    return clear
+
+def grid_line_of_sight(starts, end, walkability):
+    """The occupancy-grid pass of line_of_sight_many for the segments the table left open."""
+    clear = np.ones(len(starts), dtype=bool)
+    cell_size = LOS_CELL_SIZE
+    grid = walkability.grid(cell_size)
+    a = starts / cell_size
+    b = np.array((end[0], end[1]), dtype=float) / cell_size
+    d = b - a
+    low = np.floor(np.minimum(a, b))
+    crossings = (np.floor(np.maximum(a, b)) - low).astype(int)  # Grid lines crossed per axis
+
+    t = [np.zeros((len(a), 1)), np.ones((len(a), 1))]
+    for axis in (0, 1):
+        index = np.arange(crossings[:, axis].max())
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t_axis = (low[:, axis, None] + 1 + index - a[:, axis, None]) / d[:, axis, None]
+        # Padding entries repeat t = 1 and add only empty pieces.
+        t.append(np.where(index < crossings[:, axis, None], t_axis, 1.0))
+    t = np.sort(np.concatenate(t, axis=1), axis=1)
+    mid = (t[:, :-1] + t[:, 1:]) / 2
+    points = np.floor(a[:, None, :] + mid[..., None] * d[:, None, :]).astype(int)
+    cols, rows = points[..., 0], points[..., 1]
+    inside = (rows >= 0) & (rows < grid.shape[0]) & (cols >= 0) & (cols < grid.shape[1])
+    # Segments through a blocked cell, or off the map, need the exact test.
+    occupied = ~inside
+    occupied[inside] = ~grid[rows[inside], cols[inside]]
+    flagged = np.nonzero(occupied.any(axis=1))[0]
+    if len(flagged):
+        clear[flagged] = ~segments_blocked(starts[flagged], end, walkability)
+    return clear
+
+def segments_blocked(starts, end, walkability):
+    """
+    Exact, vectorised version of segment_blocked for many segments to end.
+    Rect.clipline clips integer (truncated) endpoints against the pixels a
+    rect covers. Segments that hit a rect shrunk by a pixel are blocked, ones
+    that miss it grown by a pixel are clear, and the few in between are left
+    to clipline itself.
+    """
+    rects, boxes = walkability.rect_array()
+    p0 = np.trunc(starts)
+    p1 = np.broadcast_to(np.trunc(np.array((end[0], end[1]), dtype=float)), p0.shape)
+    low = boxes[:, :2]
+    high = boxes[:, :2] + boxes[:, 2:] - 1
+    # Only (segment, rect) pairs with overlapping bounding boxes can touch.
+    near = ((np.minimum(p0, p1)[:, None] <= high + 1) & (np.maximum(p0, p1)[:, None] >= low - 1)).all(axis=2)
+    seg, box = np.nonzero(near)
+    outer = segment_box_hits(p0[seg], p1[seg], low[box] - 1, high[box] + 1)
+    inner = (segment_box_hits(p0[seg], p1[seg], low[box] + 1, high[box] - 1)
+             & ((high[box] - low[box]) >= 2).all(axis=1))
+    blocked = np.zeros(len(starts), dtype=bool)
+    blocked[seg[inner]] = True
+    for i, j in zip(seg[outer & ~inner].tolist(), box[outer & ~inner].tolist()):
+        if not blocked[i] and rects[j].clipline(((starts[i][0], starts[i][1]), (end[0], end[1]))):
+            blocked[i] = True
+    return blocked
 
 class MapManager:
+    """
+    Pathfinding over the whole map. The grid is the map's walkability bitmap
+    at PATH_CELL_SIZE; long queries go through a HierarchicalPathfinder built
+    once per map, short ones search the grid directly.
+    """
     def __init__(self, obstacles, reference_pos):
-        self.obstacles = obstacles
-        self.cell_size = MAZE_CELL_SIZE
-        self.region_size = MAZE_REGION_SIZE
+        self.cell_size = PATH_CELL_SIZE
         self.reference_pos = reference_pos
+        self.last_expansions = 0  # Nodes expanded by the most recent search
+        # LRU cache of found paths keyed by (start cell, goal cell, version).
+        self.version = 0
+        self.path_cache = OrderedDict()
+        self.path_cache_size = PATH_CACHE_SIZE
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.scheduler = PathScheduler(self)  # Serves astar requests within a per-frame budget
+        self.worker_pool = None
+        self.update_obstacles(obstacles)
+
+    def update_obstacles(self, obstacles):
+        """
+        Rebuild the grid, pathfinder, worker pool and flow field for a new
+        obstacle set. Bumping the version makes every cached path stale.
+        """
+        self.obstacles = obstacles
+        self.walkability = walkability_for(obstacles)
         self.grid = self.build_grid()
+        self.pathfinder = HierarchicalPathfinder(self.walkability.grid(self.cell_size), PATH_CLUSTER_SIZE)
+        if self.worker_pool:
+            self.worker_pool.close()
+        self.worker_pool = PathWorkerPool.create(self.walkability.grid(self.cell_size), PATH_CLUSTER_SIZE)
+        self.flow_field = FlowField(self)  # Shared by every chaser, see update_zombies
+        self.version += 1
+        self.scheduler.clear_in_flight()
+
+    def close(self):
+        """Stop the worker processes; paths are computed inline from then on."""
+        self.scheduler.clear_in_flight()
+        if self.worker_pool:
+            self.worker_pool.close()
+            self.worker_pool = None
 
     def build_grid(self):
+        walkable = self.walkability.grid(self.cell_size)
+        rows, cols = walkable.shape
         grid = []
-        region_half = self.region_size // 2
-        start_x = int(self.reference_pos.x - region_half)
-        start_y = int(self.reference_pos.y - region_half)
-        cols = self.region_size // self.cell_size
-        rows = self.region_size // self.cell_size
         for row in range(rows):
             grid_row = []
             for col in range(cols):
-                cell_x = start_x + col * self.cell_size
-                cell_y = start_y + row * self.cell_size
-                cell_rect = pygame.Rect(cell_x, cell_y, self.cell_size, self.cell_size)
-                walkable = True
-                for obs in self.obstacles:
-                    if cell_rect.colliderect(obs):
-                        walkable = False
-                        break
-                node = Node(cell_x + self.cell_size / 2, cell_y + self.cell_size / 2, walkable, row, col)
+                node = Node(col * self.cell_size + self.cell_size / 2,
+                            row * self.cell_size + self.cell_size / 2,
+                            bool(walkable[row, col]), row, col)
                 grid_row.append(node)
             grid.append(grid_row)
         self.rows = rows
@@ -61,11 +213,8 @@ class MapManager:
         return grid
 
     def get_node_from_position(self, pos):
-        region_half = self.region_size // 2
-        start_x = self.reference_pos.x - region_half
-        start_y = self.reference_pos.y - region_half
-        col = int((pos.x - start_x) // self.cell_size)
-        row = int((pos.y - start_y) // self.cell_size)
+        col = int(pos.x // self.cell_size)
+        row = int(pos.y // self.cell_size)
         if row < 0 or row >= self.rows or col < 0 or col >= self.cols:
             return None
         return self.grid[row][col]
@@ -85,41 +234,45 @@ class MapManager:
         return math.hypot(node.x - goal.x, node.y - goal.y)
 
     def astar(self, start_pos, goal_pos):
+        self.last_expansions = 0
+        key = self.path_key(start_pos, goal_pos)
+        if key is None:
+            return []
+        cells = self.cached_cells(key)
+        if cells is None:
+            cells = self.pathfinder.find_path(key[0], key[1])
+            self.last_expansions = self.pathfinder.last_expansions
+            self.remember_cells(key, cells)
+        return self.cells_to_path(cells)
+
+    # --- Path cache ---
+    def path_key(self, start_pos, goal_pos):
+        """Cache key (start cell, goal cell, version), or None if either end is off the map."""
         start_node = self.get_node_from_position(start_pos)
         goal_node = self.get_node_from_position(goal_pos)
         if not start_node or not goal_node:
-            return []
+            return None
+        return ((start_node.row, start_node.col), (goal_node.row, goal_node.col), self.version)
+
+    def cached_cells(self, key):
+        cells = self.path_cache.get(key)
+        if cells is not None:
+            self.cache_hits += 1
+            self.path_cache.move_to_end(key)
+        else:
+            self.cache_misses += 1
+        return cells
+
+    def remember_cells(self, key, cells):
+        if key[2] != self.version:
+            return  # Found on an obstacle set that has since been replaced
+        self.path_cache[key] = cells
+        if len(self.path_cache) > self.path_cache_size:
+            self.path_cache.popitem(last=False)
+
+    def cells_to_path(self, cells):
+        return [pygame.Vector2(self.grid[row][col].x, self.grid[row][col].y) for row, col in cells]
 
-        # Reset all nodes
-        for row in self.grid:
-            for node in row:
-                node.g = float('inf')
-                node.f = float('inf')
-                node.parent = None
-
-        open_set = [start_node]
-        start_node.g = 0
-        start_node.h = self.heuristic(start_node, goal_node)
-        start_node.f = start_node.h
-
-        while open_set:
-            current = min(open_set, key=lambda n: n.f)
-            if current == goal_node:
-                path = []
-                while current:
-                    path.append(pygame.Vector2(current.x, current.y))
-                    current = current.parent
-                path.reverse()
-                return path
-
-            open_set.remove(current)
-            for neighbor in self.get_neighbors(current):
-                tentative_g = current.g + self.heuristic(current, neighbor)
-                if tentative_g < neighbor.g:
-                    neighbor.parent = current
-                    neighbor.g = tentative_g
-                    neighbor.h = self.heuristic(neighbor, goal_node)
-                    neighbor.f = neighbor.g + neighbor.h
-                    if neighbor not in open_set:
-                        open_set.append(neighbor)
-        return []  # No path found
+    def path_cache_stats(self):
+        return {"hits": self.cache_hits, "misses": self.cache_misses,
+                "size": len(self.path_cache), "capacity": self.path_cache_size}
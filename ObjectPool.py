@@ -0,0 +1,58 @@
+class ObjectPool:
+    """
+    Fixed-capacity pool of short-lived game objects (bullets, pickups).
+    live holds the objects in play; released ones wait on a free list and are
+    reset() in place by the next spawn() instead of being allocated again.
+    release() swaps the last live object into the freed slot, so removal is O(1)
+    but does not keep spawn order.
+    """
+    def __init__(self, factory, capacity):
+        self.factory = factory
+        self.capacity = capacity
+        self.live = []
+        self.free = []
+        self.high_water = 0  # Most objects live at once, for sizing capacity
+        self.dropped = 0     # Spawns refused because the pool was full
+
+    def spawn(self, *args):
+        """A live object built from args, or None if the pool is full."""
+        if len(self.live) >= self.capacity:
+            self.dropped += 1
+            return None
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+        else:
+            obj = self.factory(*args)
+        obj.pool_index = len(self.live)
+        self.live.append(obj)
+        if len(self.live) > self.high_water:
+            self.high_water = len(self.live)
+        return obj
+
+    def release(self, obj):
+        """Take obj out of play; releasing it twice does nothing."""
+        index = obj.pool_index
+        if index < 0:
+            return
+        last = self.live.pop()
+        if last is not obj:
+            self.live[index] = last
+            last.pool_index = index
+        obj.pool_index = -1
+        self.free.append(obj)
+
+    def clear(self):
+        for obj in self.live:
+            obj.pool_index = -1
+        self.free.extend(self.live)
+        self.live = []
+
+    def stats(self):
+        return f"{self.factory.__name__}: {len(self.live)} live, high water {self.high_water}/{self.capacity}, {self.dropped} dropped"
+
+    def __iter__(self):
+        return iter(self.live)
+
+    def __len__(self):
+        return len(self.live)
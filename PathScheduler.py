@@ -0,0 +1,114 @@
+import time
+import pygame
+from constants import PATH_BUDGET_MS, PATH_BUDGET_EXPANSIONS, PATH_MAX_IN_FLIGHT
+
+
+class PathScheduler:
+    """
+    Queues path requests from enemies and serves them from the main loop within
+    a per-frame budget (milliseconds and/or node expansions). On-screen enemies
+    are served first, then the ones nearest to the player. An enemy keeps its
+    previous path until its new one is delivered.
+    When the map manager has a worker pool, requests are handed to it instead
+    and the finished futures are collected in later frames.
+    """
+    def __init__(self, map_manager, budget_ms=PATH_BUDGET_MS, budget_expansions=PATH_BUDGET_EXPANSIONS,
+                 max_in_flight=PATH_MAX_IN_FLIGHT):
+        self.map_manager = map_manager
+        self.budget_ms = budget_ms
+        self.budget_expansions = budget_expansions
+        self.max_in_flight = max_in_flight
+        self.pending = {}    # enemy -> goal position; a newer request replaces the old goal
+        self.in_flight = {}  # enemy -> (future, cache key) while a worker computes its path
+        self.served_last_frame = 0
+
+    def request(self, enemy, goal_pos):
+        self.pending[enemy] = pygame.Vector2(goal_pos)
+
+    def clear_in_flight(self):
+        """Forget requests computed on an obstacle set that has been replaced."""
+        for future, _ in self.in_flight.values():
+            future.cancel()
+        self.in_flight = {}
+
+    def deliver(self, enemy, path):
+        enemy.path = path
+        enemy.path_index = 0
+        # The enemy kept moving while the path was computed; skip the first
+        # waypoint if it is already behind it.
+        if len(path) > 1 and enemy.pos.distance_squared_to(path[1]) < path[0].distance_squared_to(path[1]):
+            enemy.path_index = 1
+        self.served_last_frame += 1
+
+    def process(self, player_pos, enemies, view_rect=None):
+        """Serve queued requests until this frame's budget is spent."""
+        self.served_last_frame = 0
+        if not self.pending and not self.in_flight:
+            return
+        alive = set(enemies)
+        for enemy in [e for e in self.pending if e not in alive]:
+            del self.pending[enemy]
+        for enemy in [e for e in self.in_flight if e not in alive]:
+            self.in_flight.pop(enemy)[0].cancel()
+
+        def priority(enemy):
+            on_screen = view_rect is not None and view_rect.collidepoint(enemy.pos)
+            return (not on_screen, enemy.pos.distance_squared_to(player_pos))
+
+        if self.map_manager.worker_pool:
+            self.collect()
+            self.submit(sorted(self.pending, key=priority))
+            return
+
+        deadline = time.perf_counter() + self.budget_ms / 1000
+        expansions = 0
+        # At least one request is served every frame so the queue always drains.
+        for enemy in sorted(self.pending, key=priority):
+            goal_pos = self.pending.pop(enemy)
+            self.deliver(enemy, self.map_manager.astar(enemy.pos, goal_pos))
+            expansions += self.map_manager.last_expansions
+            if time.perf_counter() >= deadline:
+                break
+            if self.budget_expansions and expansions >= self.budget_expansions:
+                break
+
+    def collect(self):
+        """Deliver every path whose worker has finished."""
+        for enemy, (future, key) in list(self.in_flight.items()):
+            if enemy not in self.in_flight or not future.done():
+                continue  # Re-queued after the pool broke, or still running
+            del self.in_flight[enemy]
+            if future.cancelled():
+                continue
+            try:
+                cells, _ = future.result()
+            except Exception:
+                # The pool broke (e.g. a worker died); carry on computing inline.
+                # The other requests it held go back in the queue.
+                if self.map_manager.worker_pool:
+                    self.map_manager.worker_pool.close()
+                    self.map_manager.worker_pool = None
+                for other, (other_future, other_key) in self.in_flight.items():
+                    other_future.cancel()
+                    self.pending.setdefault(other, self.map_manager.cells_to_path([other_key[1]])[0])
+                self.in_flight = {}
+                cells = self.map_manager.pathfinder.find_path(key[0], key[1])
+            self.map_manager.remember_cells(key, cells)
+            self.deliver(enemy, self.map_manager.cells_to_path(cells))
+
+    def submit(self, enemies):
+        """Hand requests to the worker pool; cached paths are delivered straight away."""
+        for enemy in enemies:
+            if len(self.in_flight) >= self.max_in_flight or not self.map_manager.worker_pool:
+                break
+            if enemy in self.in_flight:
+                continue  # Its newer goal is sent once the current request returns
+            key = self.map_manager.path_key(enemy.pos, self.pending.pop(enemy))
+            if key is None:
+                self.deliver(enemy, [])
+                continue
+            cells = self.map_manager.cached_cells(key)
+            if cells is not None:
+                self.deliver(enemy, self.map_manager.cells_to_path(cells))
+            else:
+                self.in_flight[enemy] = (self.map_manager.worker_pool.submit(key[0], key[1]), key)
@@ -0,0 +1,83 @@
+import os
+import sys
+import weakref
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from constants import PATH_WORKERS
+from HierarchicalPathfinder import HierarchicalPathfinder
+
+# Set in each worker process by _init_worker.
+_worker_pathfinder = None
+
+
+def _init_worker(shm_name, shape, cluster_size):
+    """Attach to the shared walkability grid and build this worker's HPA* graph."""
+    global _worker_pathfinder
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        walkable = np.ndarray(shape, dtype=bool, buffer=shm.buf)
+        _worker_pathfinder = HierarchicalPathfinder(walkable, cluster_size)
+        del walkable
+    finally:
+        shm.close()
+
+
+def _shutdown(executor, shm):
+    executor.shutdown(wait=False, cancel_futures=True)
+    shm.close()
+    shm.unlink()
+
+
+def _find_path(start, goal):
+    cells = _worker_pathfinder.find_path(start, goal)
+    return cells, _worker_pathfinder.last_expansions
+
+
+class PathWorkerPool:
+    """
+    Worker processes that answer HPA* queries off the main thread.
+    The map's walkability grid is copied once into shared memory; every worker
+    builds its own HierarchicalPathfinder from it on start-up. submit() returns a
+    concurrent.futures.Future resolving to (cells, expansions).
+
+    Workers are forked, because the game modules run pygame code at import time
+    and spawn/forkserver would re-import them. By then pygame (display, mixer)
+    has started threads of its own, and a forked child only keeps the thread
+    that forked it: a lock held by another thread stays held, and the child can
+    deadlock on it. The workers touch nothing but numpy and the pathfinder, which
+    makes that safe enough on Linux. create() refuses elsewhere (macOS can't
+    fork after Cocoa/SDL setup) and the game then searches on the main thread.
+    """
+    def __init__(self, walkable, cluster_size, workers=PATH_WORKERS):
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, walkable.nbytes))
+        shared = np.ndarray(walkable.shape, dtype=bool, buffer=self.shm.buf)
+        shared[:] = walkable
+        del shared
+        self.executor = ProcessPoolExecutor(max_workers=workers,
+                                            mp_context=multiprocessing.get_context("fork"),
+                                            initializer=_init_worker,
+                                            initargs=(self.shm.name, walkable.shape, cluster_size))
+        # Runs on close(), when the pool is garbage collected, or at exit.
+        self.finalizer = weakref.finalize(self, _shutdown, self.executor, self.shm)
+
+    @classmethod
+    def create(cls, walkable, cluster_size, workers=PATH_WORKERS):
+        """
+        Return a pool, or None when workers are disabled, the platform is not
+        Linux (see the class docstring), or there is no spare core for them.
+        """
+        workers = min(workers, (os.cpu_count() or 1) - 1)
+        if workers <= 0 or not sys.platform.startswith("linux"):
+            return None
+        try:
+            return cls(walkable, cluster_size, workers)
+        except (OSError, ValueError):
+            return None
+
+    def submit(self, start, goal):
+        return self.executor.submit(_find_path, start, goal)
+
+    def close(self):
+        self.finalizer()
@@ -2,20 +2,34 @@
 
 import pygame
 from constants import HEALTH_KIT_IMAGE, AMMO_KIT_IMAGE
+from AssetCache import load_image
 
 class Pickup:
+    __slots__ = ("pos", "type", "image", "size", "rect", "pool_index")
+
     def __init__(self, pos, pickup_type):
         """
         pickup_type: 'health' or 'ammo'
         """
         self.pos = pygame.Vector2(pos)
+        self.pool_index = -1
+        self.reset(pos, pickup_type)
+
+    def reset(self, pos, pickup_type):
+        """Reuse this pickup for a new drop (see ObjectPool)."""
+        self.pos.update(pos)
         self.type = pickup_type
-        if self.type == "health":
-            self.image = pygame.image.load(HEALTH_KIT_IMAGE).convert_alpha()
-        else:
-            self.image = pygame.image.load(AMMO_KIT_IMAGE).convert_alpha()
+        self.image = load_image(HEALTH_KIT_IMAGE if self.type == "health" else AMMO_KIT_IMAGE)
         self.size = self.image.get_width()  # Assume square image
         self.rect = self.image.get_rect(center=self.pos)
 
     def draw(self, surface, offset):
         surface.blit(self.image, (self.rect.x - offset.x, self.rect.y - offset.y))
+
+
+def draw_pickups(surface, pickups, camera):
+    """Pickup.draw for a list of pickups, as a single blits() call."""
+    if not pickups:
+        return
+    corners = camera.world_to_screen([pickup.rect.topleft for pickup in pickups]).astype(int)
+    surface.blits(list(zip((pickup.image for pickup in pickups), corners.tolist())), False)
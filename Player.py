@@ -6,8 +6,9 @@ from constants import (
     PLAYER_PISTOL_IMAGE_PATH, PLAYER_SHOTGUN_IMAGE_PATH, PLAYER_AKM_IMAGE_PATH,
     PISTOL_IMAGE_PATH, SHOTGUN_IMAGE_PATH, AKM_IMAGE_PATH, EXKNIFE_IMAGE
 )
-from Bullet import Bullet
+from AssetCache import load_image, rotate_image
 from sound import Sound
+from SpatialHash import static_index_for
 
 shotgun_sound = Sound('shotgun.mp3')
 shotgun_sound.set_volume(0.5)
@@ -33,24 +34,18 @@ class Player:
         self.gun_mode = self.gun_modes[self.current_gun_index]
         
         # Load images for player sprite.
-        self.pistol_image = pygame.image.load(PLAYER_PISTOL_IMAGE_PATH).convert_alpha()
-        self.pistol_image = pygame.transform.scale(self.pistol_image, (PLAYER_SIZE, PLAYER_SIZE))
+        self.pistol_image = load_image(PLAYER_PISTOL_IMAGE_PATH, (PLAYER_SIZE, PLAYER_SIZE))
         
-        self.shotgun_image = pygame.image.load(PLAYER_SHOTGUN_IMAGE_PATH).convert_alpha()
-        self.shotgun_image = pygame.transform.scale(self.shotgun_image, (PLAYER_SIZE, PLAYER_SIZE))
+        self.shotgun_image = load_image(PLAYER_SHOTGUN_IMAGE_PATH, (PLAYER_SIZE, PLAYER_SIZE))
         
-        self.akm_image = pygame.image.load(PLAYER_AKM_IMAGE_PATH).convert_alpha()
-        self.akm_image = pygame.transform.scale(self.akm_image, (PLAYER_SIZE, PLAYER_SIZE))
+        self.akm_image = load_image(PLAYER_AKM_IMAGE_PATH, (PLAYER_SIZE, PLAYER_SIZE))
         
         # Load arsenal images (for display in the arsenal rectangle).
-        self.pistol_arsenal = pygame.image.load(PISTOL_IMAGE_PATH).convert_alpha()
-        self.pistol_arsenal = pygame.transform.scale(self.pistol_arsenal, (50, 50))
+        self.pistol_arsenal = load_image(PISTOL_IMAGE_PATH, (50, 50))
         
-        self.shotgun_arsenal = pygame.image.load(SHOTGUN_IMAGE_PATH).convert_alpha()
-        self.shotgun_arsenal = pygame.transform.scale(self.shotgun_arsenal, (50, 50))
+        self.shotgun_arsenal = load_image(SHOTGUN_IMAGE_PATH, (50, 50))
         
-        self.akm_arsenal = pygame.image.load(AKM_IMAGE_PATH).convert_alpha()
-        self.akm_arsenal = pygame.transform.scale(self.akm_arsenal, (50, 50))
+        self.akm_arsenal = load_image(AKM_IMAGE_PATH, (50, 50))
         
         # Set initial images.
         self.current_image = self.pistol_image
@@ -61,10 +56,8 @@ class Player:
         
         # Knife attributes.
         self.has_knife = False
-        self.knife_normal_image = pygame.image.load("assets/knifeplayer.png").convert_alpha()
-        self.knife_normal_image = pygame.transform.scale(self.knife_normal_image, (PLAYER_SIZE, PLAYER_SIZE))
-        self.knife_attack_image = pygame.image.load(EXKNIFE_IMAGE).convert_alpha()
-        self.knife_attack_image = pygame.transform.scale(self.knife_attack_image, (PLAYER_SIZE, PLAYER_SIZE))
+        self.knife_normal_image = load_image("assets/knifeplayer.png", (PLAYER_SIZE, PLAYER_SIZE))
+        self.knife_attack_image = load_image(EXKNIFE_IMAGE, (PLAYER_SIZE, PLAYER_SIZE))
         self.knife_attack_active = False
         self.knife_attack_duration = 200  # milliseconds
         self.knife_attack_start = 0
@@ -105,40 +98,37 @@ class Player:
         else:
             return self.pistol_arsenal
 
-    def shoot(self, target_pos):
-        """Fire bullets based on the current gun mode.
-           If knife is active, do not shoot bullets."""
+    def shoot(self, target_pos, bullets):
+        """Fire bullets based on the current gun mode into the bullets ObjectPool.
+           If knife is active, do not shoot bullets. Returns True if a shot was fired."""
         if self.has_knife:
-            return None
+            return False
         if self.ammo <= 0:
-            return None
+            return False
         if self.gun_mode == 'pistol':
             pistol_sound.play()
             self.ammo -= 1
             direction = (target_pos - self.pos).normalize()
-            return Bullet(self.pos.copy(), direction)
+            bullets.spawn(self.pos, direction)
+            return True
         elif self.gun_mode == 'shotgun':
             shotgun_sound.set_volume(0.5)
             shotgun_sound.play()
             self.ammo -= 1
-            bullets = []
             base_direction = (target_pos - self.pos).normalize()
             for angle_offset in [-15, 0, 15]:
-                rotated = base_direction.rotate(angle_offset)
-                bullets.append(Bullet(self.pos.copy(), rotated))
-            return bullets
+                bullets.spawn(self.pos, base_direction.rotate(angle_offset))
+            return True
         elif self.gun_mode == 'akm':
             akm_sound.play()
             self.ammo -= 1
-            bullets = []
             base_direction = (target_pos - self.pos).normalize()
             for _ in range(5):
                 deviation = random.uniform(-2, 2)
-                rotated = base_direction.rotate(deviation)
-                bullets.append(Bullet(self.pos.copy(), rotated))
-            return bullets
+                bullets.spawn(self.pos, base_direction.rotate(deviation))
+            return True
         else:
-            return None
+            return False
 
     def use_knife(self):
         """Trigger knife attack animation."""
@@ -182,10 +172,8 @@ class Player:
             move = move.normalize() * self.speed
         old_pos = self.pos.copy()
         self.pos += move
-        for obs in obstacles:
-            if self.get_rect().colliderect(obs):
-                self.pos = old_pos
-                break
+        if static_index_for(obstacles).collides(self.get_rect()):
+            self.pos = old_pos
         if self.knife_attack_active and pygame.time.get_ticks() - self.knife_attack_start >= self.knife_attack_duration:
             self.current_image = self.knife_normal_image if self.has_knife else self.get_gun_image()
             self.knife_attack_active = False
@@ -202,6 +190,6 @@ class Player:
                            self.size, self.size)
 
     def draw(self, surface, offset, current_level=None):
-        rotated = pygame.transform.rotate(self.current_image, self.angle)
+        rotated = rotate_image(self.current_image, self.angle)
         rect = rotated.get_rect(center=self.pos - offset)
         surface.blit(rotated, rect.topleft)
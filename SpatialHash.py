@@ -0,0 +1,128 @@
+import numpy as np
+from constants import SPATIAL_BUCKET_SIZE, ENEMY_BUCKET_SIZE
+
+
+class StaticSpatialHash:
+    """
+    Uniform bucket grid over a fixed list of rects (a map's collision rects).
+    Each rect is stored in every bucket it overlaps, so a probe only looks at
+    the handful of rects near it instead of the whole list.
+    """
+    def __init__(self, rects, bucket_size=SPATIAL_BUCKET_SIZE):
+        self.bucket_size = bucket_size
+        self.buckets = {}  # (col, row) -> rects overlapping that bucket
+        self.bucket_arrays = None
+        for rect in rects:
+            # Zero-sized rects never collide, same as pygame.Rect.colliderect.
+            if rect.width <= 0 or rect.height <= 0:
+                continue
+            for key in self.keys(rect):
+                self.buckets.setdefault(key, []).append(rect)
+
+    def keys(self, rect):
+        size = self.bucket_size
+        for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+            for col in range(rect.left // size, (rect.right - 1) // size + 1):
+                yield (col, row)
+
+    def query(self, rect):
+        """Rects that may overlap rect (each listed once), in insertion order per bucket."""
+        found = []
+        seen = set()
+        for key in self.keys(rect):
+            for other in self.buckets.get(key, ()):
+                if id(other) not in seen:
+                    seen.add(id(other))
+                    found.append(other)
+        return found
+
+    def arrays(self):
+        """
+        (cells, boxes): one row per stored (bucket, rect) pair, the bucket's
+        (col, row) as ints and the rect's x, y, w, h as floats, for NumPy probes.
+        """
+        if self.bucket_arrays is None:
+            pairs = [(key, tuple(rect)) for key, bucket in self.buckets.items() for rect in bucket]
+            cells = np.array([key for key, _ in pairs], dtype=int).reshape(-1, 2)
+            boxes = np.array([box for _, box in pairs], dtype=float).reshape(-1, 4)
+            self.bucket_arrays = (cells, boxes)
+        return self.bucket_arrays
+
+    def collides(self, rect):
+        """True if rect overlaps any stored rect."""
+        size = self.bucket_size
+        buckets = self.buckets
+        for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+            for col in range(rect.left // size, (rect.right - 1) // size + 1):
+                bucket = buckets.get((col, row))
+                if bucket and rect.collidelist(bucket) != -1:
+                    return True
+        return False
+
+
+class DynamicSpatialHash:
+    """
+    Bucket grid over moving entities (anything with pos and size, e.g. the
+    enemies), rebuilt from their list once per tick. first_hit keeps the list
+    order, so a projectile hits the same enemy a full scan would have picked.
+    """
+    def __init__(self, bucket_size=ENEMY_BUCKET_SIZE):
+        self.bucket_size = bucket_size
+        self.buckets = {}  # (col, row) -> entities whose centre is in that bucket
+        self.entries = {}  # id(entity) -> (position in the list, bucket key)
+        self.max_size = 0
+
+    def rebuild(self, entities):
+        size = self.bucket_size
+        self.buckets = {}
+        self.entries = {}
+        self.max_size = 0
+        for index, entity in enumerate(entities):
+            key = (int(entity.pos.x // size), int(entity.pos.y // size))
+            self.buckets.setdefault(key, []).append(entity)
+            self.entries[id(entity)] = (index, key)
+            if entity.size > self.max_size:
+                self.max_size = entity.size
+
+    def remove(self, entity):
+        entry = self.entries.pop(id(entity), None)
+        if entry is not None:
+            self.buckets[entry[1]].remove(entity)
+
+    def query(self, pos, radius):
+        """Entities in the buckets within radius of pos."""
+        size = self.bucket_size
+        found = []
+        for row in range(int((pos.y - radius) // size), int((pos.y + radius) // size) + 1):
+            for col in range(int((pos.x - radius) // size), int((pos.x + radius) // size) + 1):
+                bucket = self.buckets.get((col, row))
+                if bucket:
+                    found.extend(bucket)
+        return found
+
+    def first_hit(self, pos):
+        """The first entity (in list order) whose centre is closer to pos than its size, or None."""
+        hit = None
+        hit_index = None
+        x, y = pos.x, pos.y
+        for entity in self.query(pos, self.max_size):
+            dx = x - entity.pos.x
+            dy = y - entity.pos.y
+            if dx * dx + dy * dy < entity.size * entity.size:
+                index = self.entries[id(entity)][0]
+                if hit is None or index < hit_index:
+                    hit, hit_index = entity, index
+        return hit
+
+
+# Movement code asks for the same level's index many times per frame.
+_last_index = (None, None)
+
+
+def static_index_for(obstacles):
+    """The StaticSpatialHash of a collision rect list, built once per map."""
+    global _last_index
+    if _last_index[0] is not obstacles:
+        from WalkabilityGrid import walkability_for
+        _last_index = (obstacles, walkability_for(obstacles).spatial_index())
+    return _last_index[1]
@@ -1,9 +1,9 @@
 import pygame
 import math
-from Zombie import Zombie, astar_path  # Import the A* function
-from constants import ZOMBIE_SPEED, ZOMBIE_SIZE
-
-SPECIAL_ZOMBIE_IMAGE_PATH = "assets/special_zombie.png"
+from Zombie import Zombie, request_path  # Import the A* request helper
+from constants import ZOMBIE_SPEED, ZOMBIE_SIZE, SPECIAL_ZOMBIE_IMAGE_PATH
+from SpatialHash import static_index_for
+from AssetCache import load_image
 
 class SpecialZombie(Zombie):
     def __init__(self, spawn_pos, speed_multiplier=1.0, immobile_duration=3000, harmful=True, flicker=False):
@@ -18,12 +18,11 @@ class SpecialZombie(Zombie):
         self.health = 200
         
         # Load special zombie image
-        self.image = pygame.image.load(SPECIAL_ZOMBIE_IMAGE_PATH).convert_alpha()
-        self.image = pygame.transform.scale(self.image, (self.size, self.size))
-        self.original_image = self.image.copy()
+        self.image = load_image(SPECIAL_ZOMBIE_IMAGE_PATH, (self.size, self.size))
+        self.original_image = self.image
         self.flicker_surface = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
 
-    def update(self, player_pos, obstacles):
+    def update(self, player_pos, obstacles, map_manager=None):
         current_time = pygame.time.get_ticks()
         
         # Remain immobile for the specified duration
@@ -32,8 +31,7 @@ class SpecialZombie(Zombie):
         
         # Use A* pathfinding to find the player
         if not self.path or self.path_index >= len(self.path):
-            self.path = astar_path(self.pos, player_pos, obstacles, cell_size=50)
-            self.path_index = 0
+            request_path(self, player_pos, obstacles, map_manager)
 
         if self.path and self.path_index < len(self.path):
             target = self.path[self.path_index]
@@ -47,13 +45,12 @@ class SpecialZombie(Zombie):
                 candidate_rect = pygame.Rect(candidate_pos.x - self.size // 2,
                                              candidate_pos.y - self.size // 2,
                                              self.size, self.size)
-                collision = any(candidate_rect.colliderect(obs) for obs in obstacles)
+                collision = static_index_for(obstacles).collides(candidate_rect)
                 if not collision:
                     self.pos = candidate_pos
                 else:
                     # Recalculate path if collision occurs
-                    self.path = astar_path(self.pos, player_pos, obstacles, cell_size=50)
-                    self.path_index = 0
+                    request_path(self, player_pos, obstacles, map_manager)
 
         # Update the angle to face the player
         direction = player_pos - self.pos
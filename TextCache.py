@@ -0,0 +1,53 @@
+from collections import OrderedDict
+from constants import TEXT_CACHE_SIZE
+
+
+class TextCache:
+    """
+    Rendered text surfaces keyed by (font, text, antialias, color, background).
+    A HUD label is only re-rendered when the value it shows changes; the
+    max_entries most recently used labels are kept. Like AssetCache surfaces,
+    the results are shared and must not be drawn on.
+    frame_renders counts cache misses since the last end_frame().
+    """
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()  # key -> Surface, least recently used first
+        self.renders = 0
+        self.hits = 0
+        self.frame_renders = 0
+
+    def render(self, font, text, antialias, color, background=None):
+        key = (font, text, antialias, tuple(color), tuple(background) if background is not None else None)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        surface = font.render(text, antialias, color, background)
+        self.surfaces[key] = surface
+        self.renders += 1
+        self.frame_renders += 1
+        while len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def end_frame(self):
+        """Texts rendered since the previous call; resets the count."""
+        renders = self.frame_renders
+        self.frame_renders = 0
+        return renders
+
+    def clear(self):
+        self.surfaces = OrderedDict()
+
+    def stats(self):
+        return f"{len(self.surfaces)} texts, {self.renders} renders, {self.hits} hits"
+
+
+text_cache = TextCache()
+
+
+def render_text(font, text, antialias, color, background=None):
+    """font.render() through the process-wide text_cache."""
+    return text_cache.render(font, text, antialias, color, background)
@@ -1,4 +1,6 @@
 import pygame
+from constants import SPIT_IMAGE_PATH
+from AssetCache import load_image
 
 class ToxicPuddle:
     def __init__(self, position, duration=5000, damage=5):
@@ -12,7 +14,7 @@ class ToxicPuddle:
         self.duration = duration
         self.damage = damage
         self.start_time = pygame.time.get_ticks()
-        self.image = pygame.image.load('assets/spit.png').convert_alpha()
+        self.image = load_image(SPIT_IMAGE_PATH)
         self.rect = self.image.get_rect(center=(self.position.x, self.position.y))
         self.radius = 100
 
@@ -0,0 +1,49 @@
+import pygame
+from constants import CULL_MARGIN
+
+
+class ViewCuller:
+    """
+    Picks the entities worth drawing this frame: those within margin of the
+    screen, instead of drawing (rotating a sprite, drawing a health bar) every
+    entity on the map. Entities need pos and size; size is taken as the reach
+    of their sprite from pos.
+    skipped counts the draws saved since the last end_frame().
+    """
+    def __init__(self, margin=CULL_MARGIN):
+        self.margin = margin
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.skipped = 0
+
+    def look(self, camera):
+        """Set the world rect drawn this frame: the camera's view, plus margin."""
+        self.rect = camera.visible_rect(self.margin)
+
+    def visible(self, entities, always=()):
+        """
+        The entities that can reach into view, in list order. Instances of the
+        always types are kept wherever they are (bosses draw their puddles too).
+        """
+        left, top, right, bottom = self.rect.left, self.rect.top, self.rect.right, self.rect.bottom
+        shown = [entity for entity in entities
+                 if left - entity.size < entity.pos.x < right + entity.size
+                 and top - entity.size < entity.pos.y < bottom + entity.size
+                 or isinstance(entity, always)]
+        self.skipped += len(entities) - len(shown)
+        return shown
+
+    def shows(self, rect):
+        """Whether a world rect reaches into view."""
+        if self.rect.colliderect(rect):
+            return True
+        self.skipped += 1
+        return False
+
+    def end_frame(self):
+        """Draws skipped since the previous call; resets the count."""
+        skipped = self.skipped
+        self.skipped = 0
+        return skipped
+
+
+view_culler = ViewCuller()
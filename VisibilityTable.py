@@ -0,0 +1,202 @@
+import os
+import hashlib
+import weakref
+import numpy as np
+from constants import PVS_CELL_SIZE, PVS_RADIUS
+
+# Lookup results
+VISIBLE = 1
+HIDDEN = 0
+UNKNOWN = -1
+
+
+def segment_box_entry(p0, p1, low, high):
+    """Row-wise Liang-Barsky: parameter t in [0, 1] where segment p0[i]-p1[i] enters the box [low[i], high[i]], or inf."""
+    d = p1 - p0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t1 = (low - p0) / d
+        t2 = (high - p0) / d
+    # Axis-parallel segments: the slab is either always or never entered.
+    inside = (low <= p0) & (p0 <= high)
+    flat = d == 0
+    t_enter = np.where(flat, np.where(inside, -np.inf, np.inf), np.minimum(t1, t2))
+    t_exit = np.where(flat, np.where(inside, np.inf, -np.inf), np.maximum(t1, t2))
+    enter = np.maximum(t_enter.max(axis=1), 0)
+    return np.where(enter <= np.minimum(t_exit.min(axis=1), 1), enter, np.inf)
+
+
+def segment_box_hits(p0, p1, low, high):
+    """Row-wise Liang-Barsky: does segment p0[i]-p1[i] touch the box [low[i], high[i]]?"""
+    return segment_box_entry(p0, p1, low, high) <= 1
+
+
+def save_table(path, arrays, state):
+    """Write the computed rows to disk if any were added since loading."""
+    if path is None or not state["dirty"]:
+        return
+    try:
+        np.savez_compressed(path, **arrays)
+        state["dirty"] = False
+    except OSError:
+        pass  # A read-only install just recomputes the rows next time
+
+
+class VisibilityTable:
+    """
+    Potentially-visible-set table over coarse PVS_CELL_SIZE cells of one map.
+    For every pair of cells two bits are kept, packed eight to a byte:
+    "clear" if every segment between the two cells misses all obstacles, and
+    "blocked" if every such segment hits one. Pairs with neither bit set are
+    boundary cases that still need the exact line-of-sight test.
+    Rows are computed the first time a cell is looked up and cached on disk
+    next to the map's TMX file as <map>.pvs.npz.
+    """
+    def __init__(self, walkability, cell_size=PVS_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cols = -(-walkability.width // cell_size)
+        self.rows = -(-walkability.height // cell_size)
+        count = self.rows * self.cols
+        rects, boxes = walkability.rect_array()
+        self.boxes = boxes
+        self.key = self.table_key(walkability.width, walkability.height, boxes)
+
+        cols, rows = np.meshgrid(np.arange(self.cols), np.arange(self.rows))
+        self.origins = np.stack((cols.ravel(), rows.ravel()), axis=1).astype(float) * cell_size
+
+        self.path = None
+        if walkability.source:
+            self.path = os.path.splitext(walkability.source)[0] + ".pvs.npz"
+        self.arrays = self.load()
+        if self.arrays is None:
+            packed = -(-count // 8)
+            self.arrays = {"key": self.key,
+                           "clear": np.zeros((count, packed), dtype=np.uint8),
+                           "blocked": np.zeros((count, packed), dtype=np.uint8),
+                           "computed": np.zeros(count, dtype=bool)}
+        self.state = {"dirty": False}
+        self.rows_computed = 0
+        # Saves new rows when the table is dropped (level change) or at exit.
+        self.finalizer = weakref.finalize(self, save_table, self.path, self.arrays, self.state)
+
+    def table_key(self, width, height, boxes):
+        digest = hashlib.sha1()
+        digest.update(np.array((self.cell_size, width, height), dtype=np.int64).tobytes())
+        digest.update(boxes.tobytes())
+        return np.frombuffer(digest.digest(), dtype=np.uint8)
+
+    def load(self):
+        if self.path is None or not os.path.exists(self.path):
+            return None
+        try:
+            with np.load(self.path) as data:
+                if not np.array_equal(data["key"], self.key):
+                    return None  # Built for another version of the map
+                return {name: data[name].copy() for name in ("key", "clear", "blocked", "computed")}
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def save(self):
+        save_table(self.path, self.arrays, self.state)
+
+    # --- Lookups ---
+    def cell_index(self, points):
+        """Cell index of each (x, y) point, or -1 off the map."""
+        cols = np.floor(points[:, 0] / self.cell_size).astype(int)
+        rows = np.floor(points[:, 1] / self.cell_size).astype(int)
+        inside = (cols >= 0) & (cols < self.cols) & (rows >= 0) & (rows < self.rows)
+        return np.where(inside, rows * self.cols + cols, -1)
+
+    def lookup(self, start, end):
+        """VISIBLE, HIDDEN or UNKNOWN for the segment from start to end."""
+        size = self.cell_size
+        start_col, start_row = int(start[0] // size), int(start[1] // size)
+        end_col, end_row = int(end[0] // size), int(end[1] // size)
+        if not (0 <= start_col < self.cols and 0 <= start_row < self.rows
+                and 0 <= end_col < self.cols and 0 <= end_row < self.rows):
+            return UNKNOWN
+        row = self.row(end_row * self.cols + end_col)
+        index = start_row * self.cols + start_col
+        bit = 7 - (index & 7)
+        if (self.arrays["clear"][row, index >> 3] >> bit) & 1:
+            return VISIBLE
+        if (self.arrays["blocked"][row, index >> 3] >> bit) & 1:
+            return HIDDEN
+        return UNKNOWN
+
+    def lookup_many(self, starts, end):
+        """VISIBLE, HIDDEN or UNKNOWN for the segment from each start to end."""
+        result = np.full(len(starts), UNKNOWN, dtype=np.int8)
+        end_index = self.cell_index(np.array(((end[0], end[1]),), dtype=float))[0]
+        if end_index < 0:
+            return result
+        row = self.row(end_index)
+        indices = self.cell_index(starts)
+        inside = indices >= 0
+        byte, bit = indices[inside] >> 3, 7 - (indices[inside] & 7)
+        clear = (self.arrays["clear"][row, byte] >> bit) & 1
+        blocked = (self.arrays["blocked"][row, byte] >> bit) & 1
+        result[inside] = np.where(clear == 1, VISIBLE, np.where(blocked == 1, HIDDEN, UNKNOWN))
+        return result
+
+    def row(self, index):
+        if not self.arrays["computed"][index]:
+            clear, blocked = self.compute_row(index)
+            self.arrays["clear"][index] = np.packbits(clear)
+            self.arrays["blocked"][index] = np.packbits(blocked)
+            self.arrays["computed"][index] = True
+            self.state["dirty"] = True
+            self.rows_computed += 1
+        return index
+
+    def compute_row(self, index):
+        """Bool arrays (clear, blocked) between cell index and every cell within PVS_RADIUS."""
+        size = self.cell_size
+        half = size / 2
+        origin = self.origins[index]
+        clear = np.zeros(len(self.origins), dtype=bool)
+        blocked = np.zeros(len(self.origins), dtype=bool)
+        targets = np.nonzero((np.abs(self.origins - origin) <= PVS_RADIUS).all(axis=1))[0]
+        origins = self.origins[targets]
+        # Only rects around the covered area can touch a segment inside it.
+        reach_low = origin - PVS_RADIUS - half - 1
+        reach_high = origin + size + PVS_RADIUS + half
+        boxes = self.boxes[((self.boxes[:, :2] <= reach_high) & (self.boxes[:, :2] + self.boxes[:, 2:] >= reach_low)).all(axis=1)]
+        clear[targets], blocked[targets] = self.compute_pairs(origin, origins, boxes)
+        return clear, blocked
+
+    def compute_pairs(self, origin, origins, boxes):
+        """(clear, blocked) between the cell at origin and the cells at origins."""
+        size = self.cell_size
+        half = size / 2
+        if not len(boxes):
+            return np.ones(len(origins), dtype=bool), np.zeros(len(origins), dtype=bool)
+        low = boxes[:, :2]
+        high = low + boxes[:, 2:]
+
+        # Clear: the swept cell from centre to centre (the convex hull of both
+        # cells) misses every rect. Rects are grown by half a cell, plus a pixel
+        # for the integer clipping of the exact test.
+        p0 = np.broadcast_to(origin + half, origins.shape)
+        p1 = origins + half
+        grown_low = low - half - 1
+        grown_high = high + half
+        near = ((np.minimum(p0, p1)[:, None] <= grown_high) & (np.maximum(p0, p1)[:, None] >= grown_low)).all(axis=2)
+        cell, box = np.nonzero(near)
+        hits = segment_box_hits(p0[cell], p1[cell], grown_low[box], grown_high[box])
+        clear = np.ones(len(origins), dtype=bool)
+        clear[cell[hits]] = False
+
+        # Blocked: a single rect spans the whole band between the two cells, so
+        # every segment from one to the other has to cross it. Checked against
+        # the rect shrunk by a pixel, which the exact test can never miss.
+        blocked = np.zeros(len(origins), dtype=bool)
+        for axis in (0, 1):
+            other = 1 - axis
+            first = np.minimum(origin[axis], origins[:, axis])
+            second = np.maximum(origin[axis], origins[:, axis])
+            across = (first[:, None] + size <= low[None, :, axis] + 1) & (second[:, None] >= high[None, :, axis] - 1)
+            band_low = np.minimum(origin[other], origins[:, other])
+            band_high = np.maximum(origin[other], origins[:, other]) + size
+            covers = (low[None, :, other] + 1 <= band_low[:, None]) & (high[None, :, other] - 1 >= band_high[:, None])
+            blocked |= (across & covers).any(axis=1)
+        return clear, blocked & ~clear
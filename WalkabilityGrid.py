@@ -0,0 +1,177 @@
+import math
+import numpy as np
+from collections import OrderedDict
+from constants import WIDTH, HEIGHT, WALKABILITY_CELL_SIZES
+from VisibilityTable import VisibilityTable
+from SpatialHash import StaticSpatialHash
+
+MAX_REGISTERED_MAPS = 8
+
+
+class WalkabilityGrid:
+    """
+    The collision rects of one map rasterised into NumPy boolean grids.
+    grid(cell_size)[row, col] is True when no collision rect overlaps that cell.
+    Each cell size is rasterised once and then shared by pathfinding and spawning.
+    """
+    def __init__(self, collision_rects, width, height, cell_sizes=WALKABILITY_CELL_SIZES, source=None):
+        self.collision_rects = collision_rects
+        self.width = width
+        self.height = height
+        self.source = source  # TMX file the rects came from, if any
+        self.visibility_table = None
+        self.static_index = None
+        self.grids = {}
+        self.lists = {}
+        self.buckets = {}
+        self.sums = {}
+        self.rect_boxes = None
+        for cell_size in cell_sizes:
+            self.grid(cell_size)
+
+    def grid(self, cell_size):
+        if cell_size not in self.grids:
+            self.grids[cell_size] = self.rasterise(cell_size)
+        return self.grids[cell_size]
+
+    def spatial_index(self):
+        """StaticSpatialHash over the collision rects, created on first use."""
+        if self.static_index is None:
+            self.static_index = StaticSpatialHash(self.collision_rects)
+        return self.static_index
+
+    def visibility(self):
+        """The map's VisibilityTable (potentially visible set), created on first use."""
+        if self.visibility_table is None:
+            self.visibility_table = VisibilityTable(self)
+        return self.visibility_table
+
+    def grid_rows(self, cell_size):
+        """grid(cell_size) as nested Python lists, for searches that index one cell at a time."""
+        if cell_size not in self.lists:
+            self.lists[cell_size] = self.grid(cell_size).tolist()
+        return self.lists[cell_size]
+
+    def blocked_sums(self, cell_size):
+        """
+        Summed-area table of the blocked cells of grid(cell_size), padded with a
+        leading zero row and column: the number of blocked cells in rows r0..r1
+        and columns c0..c1 is S[r1+1, c1+1] - S[r0, c1+1] - S[r1+1, c0] + S[r0, c0].
+        """
+        if cell_size not in self.sums:
+            blocked = (~self.grid(cell_size)).astype(np.int32)
+            self.sums[cell_size] = np.pad(blocked.cumsum(axis=0).cumsum(axis=1), ((1, 0), (1, 0)))
+        return self.sums[cell_size]
+
+    def rect_buckets(self, cell_size):
+        """
+        {(row, col): [rects overlapping that cell]} for every blocked cell of
+        grid(cell_size). Rects reaching past the map edge are also listed under None.
+        """
+        if cell_size not in self.buckets:
+            buckets = {None: []}
+            for rect, (row_start, col_start, row_end, col_end) in self.rect_cells(cell_size):
+                for row in range(row_start, row_end):
+                    for col in range(col_start, col_end):
+                        buckets.setdefault((row, col), []).append(rect)
+                if rect.left < 0 or rect.top < 0 or rect.right > self.width or rect.bottom > self.height:
+                    buckets[None].append(rect)
+            self.buckets[cell_size] = buckets
+        return self.buckets[cell_size]
+
+    def rect_array(self):
+        """(rects, boxes): the collidable rects and a float (n, 4) array of their x, y, w, h."""
+        if self.rect_boxes is None:
+            rects = [rect for rect in self.collision_rects if rect.width > 0 and rect.height > 0]
+            boxes = np.array([tuple(rect) for rect in rects], dtype=float).reshape(-1, 4)
+            self.rect_boxes = (rects, boxes)
+        return self.rect_boxes
+
+    def rect_cells(self, cell_size):
+        """Yield (rect, (row_start, col_start, row_end, col_end)) for the cells each rect overlaps."""
+        cols = math.ceil(self.width / cell_size)
+        rows = math.ceil(self.height / cell_size)
+        for rect in self.collision_rects:
+            # Zero-sized rects never collide, same as pygame.Rect.colliderect.
+            if rect.width <= 0 or rect.height <= 0:
+                continue
+            yield rect, (max(0, rect.top // cell_size), max(0, rect.left // cell_size),
+                         min(rows, -(-rect.bottom // cell_size)), min(cols, -(-rect.right // cell_size)))
+
+    def rasterise(self, cell_size):
+        cols = math.ceil(self.width / cell_size)
+        rows = math.ceil(self.height / cell_size)
+        walkable = np.ones((rows, cols), dtype=bool)
+        for _, (row_start, col_start, row_end, col_end) in self.rect_cells(cell_size):
+            walkable[row_start:row_end, col_start:col_end] = False
+        return walkable
+
+    def is_walkable(self, col, row, cell_size):
+        grid = self.grid(cell_size)
+        return 0 <= row < grid.shape[0] and 0 <= col < grid.shape[1] and bool(grid[row, col])
+
+    def is_area_walkable(self, rect, cell_size):
+        """True if every cell touched by rect is inside the map and walkable."""
+        grid = self.grid(cell_size)
+        col_start = rect.left // cell_size
+        row_start = rect.top // cell_size
+        col_end = -(-rect.right // cell_size)
+        row_end = -(-rect.bottom // cell_size)
+        if col_start < 0 or row_start < 0 or col_end > grid.shape[1] or row_end > grid.shape[0]:
+            return False
+        return bool(grid[row_start:row_end, col_start:col_end].all())
+
+
+# Grids are shared by key identity: the collision rect list of a level and its
+# tmx_data both map to the same WalkabilityGrid.
+_registry = OrderedDict()
+
+
+def _remember(key, walkability):
+    _registry[id(key)] = (key, walkability)
+    _registry.move_to_end(id(key))
+    while len(_registry) > MAX_REGISTERED_MAPS * 2:
+        _registry.popitem(last=False)
+
+
+def _lookup(key):
+    entry = _registry.get(id(key))
+    if entry is not None and entry[0] is key:
+        return entry[1]
+    return None
+
+
+def register_walkability(collision_rects, tmx_data):
+    """Rasterise a freshly loaded map and remember it for later lookups."""
+    walkability = WalkabilityGrid(collision_rects,
+                                  tmx_data.width * tmx_data.tilewidth,
+                                  tmx_data.height * tmx_data.tileheight,
+                                  source=getattr(tmx_data, "filename", None))
+    _remember(collision_rects, walkability)
+    _remember(tmx_data, walkability)
+    return walkability
+
+
+def walkability_for(obstacles):
+    """
+    Return the WalkabilityGrid for a list of collision rects.
+    Lists that did not come from load_collision_rects are rasterised on first
+    use, bounded by the screen and the obstacles themselves.
+    """
+    walkability = _lookup(obstacles)
+    if walkability is None:
+        width = max([WIDTH] + [rect.right for rect in obstacles])
+        height = max([HEIGHT] + [rect.bottom for rect in obstacles])
+        walkability = WalkabilityGrid(obstacles, width, height)
+        _remember(obstacles, walkability)
+    return walkability
+
+
+def walkability_for_map(tmx_data):
+    """Return the WalkabilityGrid for a loaded Tiled map."""
+    walkability = _lookup(tmx_data)
+    if walkability is None:
+        from utilityFunctions import load_collision_rects
+        load_collision_rects(tmx_data)
+        walkability = _lookup(tmx_data)
+    return walkability
@@ -1,22 +1,29 @@
 import pygame
 import math
 import random
-from constants import ZOMBIE_COLOR, ZOMBIE_SIZE, ZOMBIE_SPEED, COLLISION_THRESHOLD
+import heapq
+from constants import ZOMBIE_COLOR, ZOMBIE_SIZE, ZOMBIE_SPEED, COLLISION_THRESHOLD, PATH_ALGORITHM, ZOMBIE_IMAGE_PATH
+from AssetCache import load_image, rotate_image
 from MapManager import line_of_sight_clear
+from FlowField import follow_flow_field
+from WalkabilityGrid import walkability_for
+from SpatialHash import static_index_for
 
 # --- A* Pathfinding Algorithm ---
-def astar_path(start, goal, obstacles, cell_size=50):
+def astar_path(start, goal, obstacles, cell_size=50, stats=None, algorithm=PATH_ALGORITHM):
     """
     Compute a path from start to goal using a grid-based A* algorithm.
     start, goal: pygame.Vector2 positions.
-    obstacles: list of pygame.Rect obstacles.
+    obstacles: list of pygame.Rect obstacles (queried through their WalkabilityGrid).
     cell_size: grid cell size.
+    stats: optional dict; receives the number of expanded nodes under "expansions".
+    algorithm: "astar" expands every neighbour, "jps" runs Jump Point Search on
+    the same grid. Both return paths of the same length.
     Returns a list of pygame.Vector2 positions (centers of cells).
     """
-    grid_width = pygame.display.get_surface().get_width()
-    grid_height = pygame.display.get_surface().get_height()
-    cols = math.ceil(grid_width / cell_size)
-    rows = math.ceil(grid_height / cell_size)
+    walkability = walkability_for(obstacles)
+    walkable = walkability.grid(cell_size)
+    rows, cols = walkable.shape
     
     def node_from_pos(pos):
         return (int(pos.x // cell_size), int(pos.y // cell_size))
@@ -31,24 +38,27 @@ def astar_path(start, goal, obstacles, cell_size=50):
     
     def is_walkable(node):
         x, y = node
-        if x < 0 or x >= cols or y < 0 or y >= rows:
-            return False
-        node_rect = pygame.Rect(x * cell_size, y * cell_size, cell_size, cell_size)
-        for obs in obstacles:
-            if node_rect.colliderect(obs):
-                return False
-        return True
+        return 0 <= x < cols and 0 <= y < rows and walkable[y, x]
 
     start_node = node_from_pos(start)
     goal_node = node_from_pos(goal)
+
+    if algorithm == "jps":
+        return [pos_from_node(node) for node in jump_point_search(start_node, goal_node,
+                                                                   walkability.grid_rows(cell_size), stats)]
     
-    open_set = {start_node}
+    # Binary heap open set with lazy deletion; the closed set makes stale
+    # heap entries cheap to skip.
+    open_heap = [(heuristic(start_node, goal_node), start_node)]
     came_from = {}
     g_score = {start_node: 0}
-    f_score = {start_node: heuristic(start_node, goal_node)}
+    closed = set()
+    expansions = 0
     
-    while open_set:
-        current = min(open_set, key=lambda n: f_score.get(n, float('inf')))
+    while open_heap:
+        _, current = heapq.heappop(open_heap)
+        if current in closed:
+            continue
         if current == goal_node:
             # Reconstruct path
             path = []
@@ -57,9 +67,12 @@ def astar_path(start, goal, obstacles, cell_size=50):
                 current = came_from[current]
             path.append(pos_from_node(start_node))
             path.reverse()
+            if stats is not None:
+                stats["expansions"] = expansions
             return path
         
-        open_set.remove(current)
+        closed.add(current)
+        expansions += 1
         cx, cy = current
         # Check all 8 neighbors
         for dx in [-1, 0, 1]:
@@ -67,18 +80,145 @@ def astar_path(start, goal, obstacles, cell_size=50):
                 if dx == 0 and dy == 0:
                     continue
                 neighbor = (cx + dx, cy + dy)
-                if not is_walkable(neighbor):
+                if neighbor in closed or not is_walkable(neighbor):
                     continue
-                tentative_g = g_score.get(current, float('inf')) + (math.hypot(dx, dy))
+                tentative_g = g_score[current] + (math.hypot(dx, dy))
                 if tentative_g < g_score.get(neighbor, float('inf')):
                     came_from[neighbor] = current
                     g_score[neighbor] = tentative_g
-                    f_score[neighbor] = tentative_g + heuristic(neighbor, goal_node)
-                    if neighbor not in open_set:
-                        open_set.add(neighbor)
+                    heapq.heappush(open_heap, (tentative_g + heuristic(neighbor, goal_node), neighbor))
     # No path found
+    if stats is not None:
+        stats["expansions"] = expansions
     return []
 
+def jump_point_search(start_node, goal_node, cells, stats=None):
+    """
+    Jump Point Search (Harabor & Grastien) over the same 8-connected,
+    corner-cutting grid that astar_path searches.
+    Straight and diagonal runs are skipped until a cell with a forced neighbour
+    (or the goal) is reached, so only those jump points enter the open set.
+    start_node, goal_node: (col, row) cells; cells: walkability as nested lists [row][col].
+    Returns every cell of the path, start and goal included, or [].
+    """
+    rows, cols = len(cells), len(cells[0]) if cells else 0
+
+    def free(x, y):
+        return 0 <= x < cols and 0 <= y < rows and cells[y][x]
+
+    def jump(x, y, dx, dy):
+        # Walk from (x, y) in direction (dx, dy); return the first jump point or None.
+        while True:
+            x += dx
+            y += dy
+            if not free(x, y):
+                return None
+            if (x, y) == goal_node:
+                return (x, y)
+            if dx and dy:
+                if (free(x - dx, y + dy) and not free(x - dx, y)) or \
+                        (free(x + dx, y - dy) and not free(x, y - dy)):
+                    return (x, y)
+                # A diagonal cell is a jump point if a straight run from it finds one.
+                if jump(x, y, dx, 0) is not None or jump(x, y, 0, dy) is not None:
+                    return (x, y)
+            elif dx:
+                if (free(x + dx, y + 1) and not free(x, y + 1)) or \
+                        (free(x + dx, y - 1) and not free(x, y - 1)):
+                    return (x, y)
+            else:
+                if (free(x + 1, y + dy) and not free(x + 1, y)) or \
+                        (free(x - 1, y + dy) and not free(x - 1, y)):
+                    return (x, y)
+
+    def directions(node, parent):
+        # Natural and forced neighbours of node when reached from parent.
+        x, y = node
+        if parent is None:
+            return [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+        dx = (x > parent[0]) - (x < parent[0])
+        dy = (y > parent[1]) - (y < parent[1])
+        if dx and dy:
+            result = [(0, dy), (dx, 0), (dx, dy)]
+            if not free(x - dx, y):
+                result.append((-dx, dy))
+            if not free(x, y - dy):
+                result.append((dx, -dy))
+        elif dx:
+            result = [(dx, 0)]
+            if not free(x, y + 1):
+                result.append((dx, 1))
+            if not free(x, y - 1):
+                result.append((dx, -1))
+        else:
+            result = [(0, dy)]
+            if not free(x + 1, y):
+                result.append((1, dy))
+            if not free(x - 1, y):
+                result.append((-1, dy))
+        return result
+
+    def heuristic(a, b):
+        return math.hypot(b[0] - a[0], b[1] - a[1])
+
+    open_heap = [(heuristic(start_node, goal_node), start_node)]
+    came_from = {}
+    g_score = {start_node: 0}
+    closed = set()
+    expansions = 0
+
+    while open_heap:
+        _, current = heapq.heappop(open_heap)
+        if current in closed:
+            continue
+        if current == goal_node:
+            # Jump points lie on straight or diagonal lines; fill in the cells between them.
+            path = [current]
+            while current in came_from:
+                parent = came_from[current]
+                dx = (parent[0] > current[0]) - (parent[0] < current[0])
+                dy = (parent[1] > current[1]) - (parent[1] < current[1])
+                x, y = current
+                while (x, y) != parent:
+                    x += dx
+                    y += dy
+                    path.append((x, y))
+                current = parent
+            path.reverse()
+            if stats is not None:
+                stats["expansions"] = expansions
+            return path
+
+        closed.add(current)
+        expansions += 1
+        for dx, dy in directions(current, came_from.get(current)):
+            point = jump(current[0], current[1], dx, dy)
+            if point is None or point in closed:
+                continue
+            # Runs are straight or diagonal, so the Euclidean distance is the step cost.
+            tentative_g = g_score[current] + heuristic(current, point)
+            if tentative_g < g_score.get(point, float('inf')):
+                came_from[point] = current
+                g_score[point] = tentative_g
+                heapq.heappush(open_heap, (tentative_g + heuristic(point, goal_node), point))
+    if stats is not None:
+        stats["expansions"] = expansions
+    return []
+
+def request_path(enemy, goal, obstacles, map_manager=None):
+    """
+    Ask for a fresh path for enemy towards goal.
+    With a map_manager the request is queued on its PathScheduler (and possibly
+    computed by its worker pool) and the enemy keeps following its current path
+    until the result is delivered; without
+    one the path is computed inline with astar_path.
+    """
+    if map_manager:
+        map_manager.scheduler.request(enemy, goal)
+    else:
+        enemy.path = astar_path(enemy.pos, goal, obstacles, cell_size=50)
+        enemy.path_index = 0
+
 # --- Zombie Class ---
 class Zombie:
     def __init__(self, spawn_pos, speed_multiplier=1.0):
@@ -92,19 +232,20 @@ class Zombie:
         self.path = []
         self.path_index = 0
         self.last_path_update = pygame.time.get_ticks()
-        ZOMBIE_IMAGE_PATH = "assets/zombie.png"
-        self.original_image = pygame.image.load(ZOMBIE_IMAGE_PATH).convert_alpha()
-        self.original_image = pygame.transform.scale(self.original_image, (self.size, self.size))
+        self.original_image = load_image(ZOMBIE_IMAGE_PATH, (self.size, self.size))
         self.image = self.original_image
 
     def take_damage(self, damage, game=None):
         self.health -= damage
         return self.health <= 0
 
-    def update(self, player_pos, obstacles, map_manager):
+    def update(self, player_pos, obstacles, map_manager, los_clear=None):
         current_time = pygame.time.get_ticks()
+        # los_clear is passed in when line of sight was batched for every enemy.
+        if los_clear is None:
+            los_clear = line_of_sight_clear(self.pos, player_pos, obstacles)
         # Try direct approach if line-of-sight is clear.
-        if line_of_sight_clear(self.pos, player_pos, obstacles):
+        if los_clear:
             direction = player_pos - self.pos
             if direction.length() > 0:
                 self.angle = math.degrees(math.atan2(-direction.y, direction.x)) - 90
@@ -113,27 +254,22 @@ class Zombie:
                 candidate_rect = pygame.Rect(candidate_pos.x - self.size // 2,
                                              candidate_pos.y - self.size // 2,
                                              self.size, self.size)
-                collision = any(candidate_rect.colliderect(obs) for obs in obstacles)
+                collision = static_index_for(obstacles).collides(candidate_rect)
                 if not collision:
                     self.pos = candidate_pos
                     self.path = []
                     self.path_index = 0
                     self.last_path_update = current_time
-                else:
+                elif not follow_flow_field(self, map_manager, obstacles):
                     if current_time - self.last_path_update > 500:
-                        if map_manager:
-                            self.path = map_manager.astar(self.pos, player_pos)
-                        else:
-                            self.path = astar_path(self.pos, player_pos, obstacles, cell_size=50)
-                        self.path_index = 0
+                        request_path(self, player_pos, obstacles, map_manager)
                         self.last_path_update = current_time
+        elif follow_flow_field(self, map_manager, obstacles):
+            self.path = []
+            self.path_index = 0
         else:
             if (not self.path or self.path_index >= len(self.path)) and (current_time - self.last_path_update > 500):
-                if map_manager:
-                    self.path = map_manager.astar(self.pos, player_pos)
-                else:
-                    self.path = astar_path(self.pos, player_pos, obstacles, cell_size=50)
-                self.path_index = 0
+                request_path(self, player_pos, obstacles, map_manager)
                 self.last_path_update = current_time
             if self.path and self.path_index < len(self.path):
                 target = self.path[self.path_index]
@@ -147,16 +283,12 @@ class Zombie:
                     candidate_rect = pygame.Rect(candidate_pos.x - self.size // 2,
                                                  candidate_pos.y - self.size // 2,
                                                  self.size, self.size)
-                    collision = any(candidate_rect.colliderect(obs) for obs in obstacles)
+                    collision = static_index_for(obstacles).collides(candidate_rect)
                     if not collision:
                         self.pos = candidate_pos
                     else:
                         if current_time - self.last_path_update > 500:
-                            if map_manager:
-                                self.path = map_manager.astar(self.pos, player_pos)
-                            else:
-                                self.path = astar_path(self.pos, player_pos, obstacles, cell_size=50)
-                            self.path_index = 0
+                            request_path(self, player_pos, obstacles, map_manager)
                             self.last_path_update = current_time
                 self.angle = math.degrees(math.atan2(-direction.y, direction.x)) - 90
 
@@ -166,7 +298,7 @@ class Zombie:
                            self.size, self.size)
 
     def draw(self, surface, offset):
-        rotated_image = pygame.transform.rotate(self.original_image, self.angle)
+        rotated_image = rotate_image(self.original_image, self.angle)
         img_rect = rotated_image.get_rect(center=(self.pos.x - offset.x, self.pos.y - offset.y))
         surface.blit(rotated_image, img_rect)
         self.draw_health_bar(surface, offset)
@@ -1,22 +1,43 @@
 # arsenal.py
 import pygame
 from constants import PISTOL_IMAGE_PATH, SHOTGUN_IMAGE_PATH, AKM_IMAGE_PATH
+from AssetCache import load_image
+
+WEAPON_IMAGES = {'pistol': PISTOL_IMAGE_PATH, 'shotgun': SHOTGUN_IMAGE_PATH, 'akm': AKM_IMAGE_PATH}
+
+
+class ArsenalWidget:
+    """
+    HUD weapon panel. The panel is rendered into its own surface only when
+    the player's gun mode or knife state changes; every other frame it is a
+    single blit.
+    """
+    def __init__(self):
+        # Define the rectangle dimensions and position for the arsenal display.
+        self.rect = pygame.Rect(20, 100, 100, 100)
+        self.surface = pygame.Surface(self.rect.size)
+        self.state = None
+        self.renders = 0
+
+    def render(self, player):
+        self.renders += 1
+        self.surface.fill((50, 50, 50))
+        # Weapon image scaled to fit inside the arsenal rectangle. Not the
+        # player's pistol_arsenal etc.: those are 50x50, and scaling them up
+        # would blur the panel.
+        img = load_image(WEAPON_IMAGES.get(player.gun_mode, PISTOL_IMAGE_PATH), self.rect.size)
+        self.surface.blit(img, (0, 0))
+
+    def draw(self, surface, player):
+        state = (player.gun_mode, player.has_knife)
+        if state != self.state:
+            self.render(player)
+            self.state = state
+        surface.blit(self.surface, self.rect)
+
+
+arsenal_widget = ArsenalWidget()
+
 
 def draw_arsenal(surface, player):
-    # Define the rectangle dimensions and position for the arsenal display.
-    arsenal_rect = pygame.Rect(20, 100, 100, 100)
-    pygame.draw.rect(surface, (50, 50, 50), arsenal_rect)
-    
-    # Determine which weapon image to load based on player's current gun mode.
-    if player.gun_mode == 'pistol':
-        img = pygame.image.load(PISTOL_IMAGE_PATH).convert_alpha()
-    elif player.gun_mode == 'shotgun':
-        img = pygame.image.load(SHOTGUN_IMAGE_PATH).convert_alpha()
-    elif player.gun_mode == 'akm':
-        img = pygame.image.load(AKM_IMAGE_PATH).convert_alpha()
-    else:
-        img = pygame.image.load(PISTOL_IMAGE_PATH).convert_alpha()
-    
-    # Scale the image to fit inside the arsenal rectangle.
-    img = pygame.transform.scale(img, (arsenal_rect.width, arsenal_rect.height))
-    surface.blit(img, (arsenal_rect.x, arsenal_rect.y))
+    arsenal_widget.draw(surface, player)
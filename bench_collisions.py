@@ -0,0 +1,120 @@
+"""
+Bullet collision micro-benchmark.
+
+Places 200 enemies (zombie, army and boss sizes) and 100 live bullets in an
+area of a few screens and runs the per-tick bullet hit test three ways: the
+original end-point scan over every enemy per bullet, DynamicSpatialHash
+rebuilt each tick, and the swept BulletSweep used by the game. Reports the
+time per tick, checks the two end-point tests pick the same enemies, and
+counts the hits only the sweep finds (bullets that would have tunnelled).
+
+Usage: python bench_collisions.py [ticks] [enemies] [bullets]
+"""
+import sys
+import random
+import time
+
+import pygame
+from constants import ZOMBIE_SIZE, BULLET_SPEED
+from SpatialHash import DynamicSpatialHash
+from BulletSweep import BulletSweep
+
+AREA = (3200, 1920)
+
+
+class Target:
+    """Stand-in enemy: just the pos and size the hit test reads."""
+    def __init__(self, pos, size):
+        self.pos = pos
+        self.size = size
+
+
+class Shot:
+    """Stand-in bullet: position, position at the last sweep and velocity."""
+    def __init__(self, pos, velocity):
+        self.pos = pos
+        self.prev_pos = pygame.Vector2(pos)
+        self.velocity = velocity
+
+
+def make_world(enemies, bullets, rng):
+    sizes = (ZOMBIE_SIZE, ZOMBIE_SIZE * 0.75, ZOMBIE_SIZE * 2)
+    targets = [Target(pygame.Vector2(rng.uniform(0, AREA[0]), rng.uniform(0, AREA[1])),
+                      rng.choices(sizes, weights=(8, 3, 1))[0])
+               for _ in range(enemies)]
+    shots = []
+    for _ in range(bullets):
+        pos = pygame.Vector2(rng.uniform(0, AREA[0]), rng.uniform(0, AREA[1]))
+        shots.append(Shot(pos, pygame.Vector2(BULLET_SPEED, 0).rotate(rng.uniform(0, 360))))
+    return targets, shots
+
+
+def legacy_hits(targets, shots):
+    hits = []
+    for shot in shots:
+        hit = None
+        for enemy in targets:
+            if (shot.pos - enemy.pos).length() < enemy.size:
+                hit = enemy
+                break
+        hits.append(hit)
+    return hits
+
+
+def hash_hits(index, targets, shots):
+    index.rebuild(targets)
+    return [index.first_hit(shot.pos) for shot in shots]
+
+
+def swept_hits(targets, shots, obstacles):
+    sweep = BulletSweep(shots, targets, obstacles)
+    return [sweep.hit(i)[0] for i in range(len(shots))]
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    enemies = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    bullets = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    rng = random.Random(1234)
+    targets, shots = make_world(enemies, bullets, rng)
+    index = DynamicSpatialHash()
+
+    obstacles = []  # Open ground: only enemy hits are compared
+    legacy_time = hash_time = sweep_time = 0
+    hit_count = mismatches = tunnelled = 0
+    for _ in range(ticks):
+        # Everything moves a step, as in a game tick.
+        for enemy in targets:
+            enemy.pos += pygame.Vector2(rng.uniform(-2, 2), rng.uniform(-2, 2))
+        for shot in shots:
+            shot.pos += shot.velocity
+            if not (0 <= shot.pos.x < AREA[0] and 0 <= shot.pos.y < AREA[1]):
+                shot.pos.x %= AREA[0]
+                shot.pos.y %= AREA[1]
+                shot.prev_pos.update(shot.pos)  # Wrapped around, not a real move
+
+        start = time.perf_counter()
+        expected = legacy_hits(targets, shots)
+        legacy_time += time.perf_counter() - start
+        start = time.perf_counter()
+        found = hash_hits(index, targets, shots)
+        hash_time += time.perf_counter() - start
+        start = time.perf_counter()
+        swept = swept_hits(targets, shots, obstacles)
+        sweep_time += time.perf_counter() - start
+
+        hit_count += sum(1 for hit in expected if hit is not None)
+        mismatches += sum(1 for a, b in zip(expected, found) if a is not b)
+        tunnelled += sum(1 for a, b in zip(expected, swept) if a is None and b is not None)
+
+    print(f"{enemies} enemies, {bullets} bullets, {ticks} ticks, {hit_count} hits")
+    print(f"  {'linear scan':<16} {legacy_time * 1000 / ticks:>8.3f} ms/tick")
+    print(f"  {'spatial hash':<16} {hash_time * 1000 / ticks:>8.3f} ms/tick "
+          f"({legacy_time / hash_time:.1f}x)")
+    print(f"  {'swept (NumPy)':<16} {sweep_time * 1000 / ticks:>8.3f} ms/tick "
+          f"({legacy_time / sweep_time:.1f}x)")
+    print(f"  hit mismatches: {mismatches}, hits only the sweep finds: {tunnelled}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Blood decal micro-benchmark.
+
+Scatters a number of dead zombie splatters over one screen, stamped across
+the whole decal lifetime, and times a frame of them drawn the way the game
+used to (one sprite blit per dead zombie) against the DecalLayer, whose cost
+is bounded by the chunks in view rather than by the number of dead. Below
+DECAL_LAYER_MIN live splatters the layer blits the sprites itself, so its
+line there should match the per-sprite one.
+
+Usage: python bench_decals.py [frames]
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from constants import WIDTH, HEIGHT, DECAL_LIFETIME
+from AssetCache import load_image
+from DecalLayer import DecalLayer
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    sprite = load_image('assets/Dead_img.png')
+    layer = DecalLayer(sprite)
+    anchor = pygame.Vector2(50, 20)
+    offset = pygame.Vector2(0, 0)
+    rng = random.Random(1)
+    now = DECAL_LIFETIME
+    for count in (20, 60, 100, 200, 800):
+        dead = sorted(((pygame.Vector2(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)), rng.randrange(now))
+                       for _ in range(count)), key=lambda decal: decal[1])
+        layer.clear()
+        for pos, stamped in dead:
+            layer.stamp(pos, stamped)
+        live = [(pos, stamped) for pos, stamped in dead if now - stamped < DECAL_LIFETIME]
+        start = time.perf_counter()
+        for _ in range(frames):
+            for pos, stamped in live:
+                screen.blit(sprite, pos - offset - anchor)
+        per_sprite = (time.perf_counter() - start) * 1000 / frames
+        start = time.perf_counter()
+        for _ in range(frames):
+            layer.draw(screen, offset, now)
+        layered = (time.perf_counter() - start) * 1000 / frames
+        print(f"  {count:>4} dead  per-sprite {per_sprite:>6.2f} ms/frame  DecalLayer {layered:>6.2f} ms/frame")
+    print(f"  {layer.stats()}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Enemy update micro-benchmark.
+
+Spawns 100, 250 and 500 mixed enemies on the Endless mode map and times one
+tick of the enemy loop both ways: every enemy's own update (the loop as it
+was before EnemyPool), and EnemyPool.update with its array chase step. The
+batched line-of-sight query both need is timed separately. Both runs start
+from the same positions and their final positions are compared.
+
+Usage: python bench_enemies.py [ticks] [map.tmx]
+"""
+import os
+import sys
+import math
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from constants import WIDTH, HEIGHT
+from utilityFunctions import load_map, load_collision_rects
+from spawn import find_player_spawn
+from MapManager import MapManager, line_of_sight_many
+from WalkabilityGrid import walkability_for
+from EnemyPool import EnemyPool
+from Zombie import Zombie
+from ArmyZombie import ArmyZombie
+from PoliceZombie import PoliceZombie
+from BossZombie import BossZombie
+
+
+def spawn(kinds, spots):
+    return [kind(pos) for kind, pos in zip(kinds, spots)]
+
+
+def bench(tmx_path, count, ticks, rng):
+    tmx_data = load_map(tmx_path)
+    obstacles = load_collision_rects(tmx_data)
+    home = pygame.Vector2(find_player_spawn(tmx_data))
+    grid = walkability_for(obstacles).grid(50)
+    cells = [(col, row) for row, col in zip(*grid.nonzero())]
+    spots = [pygame.Vector2(col * 50 + 25, row * 50 + 25) for col, row in rng.choices(cells, k=count)]
+    kinds = rng.choices((Zombie, ArmyZombie, PoliceZombie, BossZombie), weights=(8, 3, 3, 1), k=count)
+
+    results = {}
+    for label in ("per-object", "EnemyPool"):
+        enemies = spawn(kinds, spots)
+        map_manager = MapManager(obstacles, home)
+        pool = EnemyPool()
+        los_time = update_time = 0
+        for tick in range(ticks):
+            player_pos = home + pygame.Vector2(math.cos(tick / 30) * 150, math.sin(tick / 30) * 150)
+            map_manager.flow_field.update(player_pos)
+            start = time.perf_counter()
+            los_clear = line_of_sight_many([(e.pos.x, e.pos.y) for e in enemies], player_pos, obstacles)
+            los_time += time.perf_counter() - start
+            start = time.perf_counter()
+            if label == "EnemyPool":
+                pool.update(enemies, player_pos, obstacles, map_manager, los_clear)
+            else:
+                for enemy, clear in zip(enemies, los_clear.tolist()):
+                    enemy.update(player_pos, obstacles, map_manager, clear)
+            update_time += time.perf_counter() - start
+        if map_manager.worker_pool:
+            map_manager.worker_pool.close()
+        results[label] = [(e.pos.x, e.pos.y) for e in enemies]
+        print(f"  {count:>4} enemies {label:<11} update {update_time * 1000 / ticks:>7.2f} ms/tick"
+              f"   line of sight {los_time * 1000 / ticks:>6.2f} ms/tick")
+    drift = max((math.hypot(a[0] - b[0], a[1] - b[1])
+                 for a, b in zip(results["per-object"], results["EnemyPool"])), default=0)
+    print(f"  {count:>4} enemies largest position difference: {drift:.3f} px")
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    tmx_path = sys.argv[2] if len(sys.argv) > 2 else "deadvillage3.tmx"
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    print(tmx_path)
+    for count in (100, 250, 500):
+        bench(tmx_path, count, ticks, random.Random(count))
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+HUD weapon panel micro-benchmark.
+
+Draws the arsenal panel for a number of frames, switching gun every 60
+frames, both the way draw_arsenal used to (decode and scale the PNG each
+frame) and through the cached ArsenalWidget, and checks both produce the
+same pixels for every gun. In game, F3 shows the same split live for the
+whole HUD (HudProfiler).
+
+Usage: python bench_hud.py [frames]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from constants import WIDTH, HEIGHT, PISTOL_IMAGE_PATH, SHOTGUN_IMAGE_PATH, AKM_IMAGE_PATH
+from arsenal import ArsenalWidget
+
+
+class Holder:
+    """Stand-in player: just the state the panel reads."""
+    def __init__(self):
+        self.gun_mode = 'pistol'
+        self.has_knife = False
+
+
+def legacy_arsenal(surface, player):
+    arsenal_rect = pygame.Rect(20, 100, 100, 100)
+    pygame.draw.rect(surface, (50, 50, 50), arsenal_rect)
+    path = {'shotgun': SHOTGUN_IMAGE_PATH, 'akm': AKM_IMAGE_PATH}.get(player.gun_mode, PISTOL_IMAGE_PATH)
+    img = pygame.image.load(path).convert_alpha()
+    img = pygame.transform.scale(img, (arsenal_rect.width, arsenal_rect.height))
+    surface.blit(img, (arsenal_rect.x, arsenal_rect.y))
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    player = Holder()
+    widget = ArsenalWidget()
+    guns = ('pistol', 'shotgun', 'akm')
+    timings = {}
+    for label, draw in (("per-frame load", legacy_arsenal), ("ArsenalWidget", widget.draw)):
+        start = time.perf_counter()
+        for frame in range(frames):
+            player.gun_mode = guns[frame // 60 % len(guns)]
+            draw(screen, player)
+        timings[label] = (time.perf_counter() - start) * 1000 / frames
+    for label, ms in timings.items():
+        print(f"  {label:<15} {ms:>7.3f} ms/frame")
+    print(f"  ArsenalWidget re-rendered {widget.renders} times in {frames} frames")
+
+    mismatches = 0
+    for gun, has_knife in [(gun, has_knife) for gun in guns for has_knife in (False, True)]:
+        player.gun_mode = gun
+        player.has_knife = has_knife
+        legacy_arsenal(screen, player)
+        expected = pygame.image.tostring(screen.subsurface(widget.rect), "RGB")
+        screen.fill((0, 0, 0))
+        widget.draw(screen, player)
+        mismatches += pygame.image.tostring(screen.subsurface(widget.rect), "RGB") != expected
+    print(f"  gun/knife states drawn differently: {mismatches}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
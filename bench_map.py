@@ -0,0 +1,66 @@
+"""
+Tile map drawing micro-benchmark.
+
+Draws each level map along a camera walk three ways: the old way
+(every tile of every layer, one blit each), draw_tiles (only the on-screen
+tiles) and draw_map (baked chunks from ChunkCache). Chunk baking happens on
+first sight, so the draw_map time includes it. Run it with a different
+window size to see the cost follow the screen size rather than the map size.
+golden_map.py checks the pixels.
+
+Usage: python bench_map.py [frames] [width] [height]
+"""
+import os
+import sys
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from constants import WIDTH, HEIGHT
+from utilityFunctions import load_map, draw_map, draw_tiles
+from ChunkCache import chunk_cache
+
+MAPS = ("deadvillage3.tmx", "newcity.tmx", "theroom.tmx", "heaq1.tmx", "heaq2.tmx", "deadcity.tmx")
+
+
+def draw_every_tile(surface, tmx_data, offset):
+    for layer in tmx_data.visible_layers:
+        if hasattr(layer, 'data'):
+            for x, y, gid in layer:
+                tile = tmx_data.get_tile_image_by_gid(gid)
+                if tile:
+                    surface.blit(tile, (x * tmx_data.tilewidth - offset.x,
+                                          y * tmx_data.tileheight - offset.y))
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    size = (int(sys.argv[2]), int(sys.argv[3])) if len(sys.argv) > 3 else (WIDTH, HEIGHT)
+    pygame.init()
+    pygame.display.set_mode(size)
+    target = pygame.Surface(size)
+    rng = random.Random(5)
+    print(f"{size[0]}x{size[1]} view")
+    for name in MAPS:
+        tmx_data = load_map(name)
+        width, height = tmx_data.width * tmx_data.tilewidth, tmx_data.height * tmx_data.tileheight
+        # The camera follows a player walking across the map, as in game.
+        start = pygame.Vector2(rng.uniform(0, width), rng.uniform(0, height))
+        step = pygame.Vector2(5.3, 0).rotate(rng.uniform(0, 360))
+        offsets = [start + step * frame - pygame.Vector2(size) / 2 for frame in range(frames)]
+        timings = {}
+        for label, draw in (("every tile", draw_every_tile), ("draw_tiles", draw_tiles), ("draw_map", draw_map)):
+            start = time.perf_counter()
+            for offset in offsets:
+                draw(target, tmx_data, offset)
+            timings[label] = (time.perf_counter() - start) * 1000 / frames
+        print(f"  {name:<17} {tmx_data.width:>3}x{tmx_data.height:<3} tiles  "
+              + "   ".join(f"{label} {ms:>6.2f}" for label, ms in timings.items()) + " ms/frame")
+    print(f"  {chunk_cache.stats()}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
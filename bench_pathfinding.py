@@ -0,0 +1,222 @@
+"""
+Pathfinding micro-benchmark.
+
+Runs the same batch of start/goal queries through the original list-based
+A* searches and the current ones (HPA* for MapManager, heap A* for
+astar_path) on every shipped TMX map, and reports node expansions per
+millisecond. astar_path is also run map-wide with A* and Jump Point Search,
+checking that both return paths of the same length, and HPA* is checked to
+find a path exactly when a full-grid A* does (including cell pairs that
+once came back unreachable).
+
+Usage: python bench_pathfinding.py [queries_per_map]
+"""
+import os
+import sys
+import math
+import glob
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from constants import WIDTH, HEIGHT
+from utilityFunctions import load_map, load_collision_rects
+from spawn import find_player_spawn
+from MapManager import MapManager
+from Zombie import astar_path
+from WalkabilityGrid import walkability_for
+
+# (start, goal) cells HPA* used to report unreachable: blocked endpoints or
+# endpoints whose only open neighbours are across a cluster border.
+KNOWN_HPA_PAIRS = {
+    "deadvillage3.tmx": [((0, 24), (21, 20))],
+    "deadcity.tmx": [((46, 34), (7, 90))],
+    "theroom.tmx": [((10, 13), (17, 30))],
+}
+
+
+def legacy_map_astar(map_manager, start_pos, goal_pos):
+    """The list-based MapManager.astar as it was before the heap rewrite, run on the full map grid."""
+    start_node = map_manager.get_node_from_position(start_pos)
+    goal_node = map_manager.get_node_from_position(goal_pos)
+    if not start_node or not goal_node:
+        return [], 0
+    g, f, parent = {}, {}, {}
+    g[start_node] = 0
+    f[start_node] = map_manager.heuristic(start_node, goal_node)
+    open_set = [start_node]
+    expansions = 0
+    while open_set:
+        current = min(open_set, key=lambda n: f.get(n, float('inf')))
+        if current == goal_node:
+            path = []
+            while current:
+                path.append(pygame.Vector2(current.x, current.y))
+                current = parent.get(current)
+            path.reverse()
+            return path, expansions
+        open_set.remove(current)
+        expansions += 1
+        for neighbor in map_manager.get_neighbors(current):
+            tentative_g = g[current] + map_manager.heuristic(current, neighbor)
+            if tentative_g < g.get(neighbor, float('inf')):
+                parent[neighbor] = current
+                g[neighbor] = tentative_g
+                f[neighbor] = tentative_g + map_manager.heuristic(neighbor, goal_node)
+                if neighbor not in open_set:
+                    open_set.append(neighbor)
+    return [], expansions
+
+
+def legacy_astar_path(start, goal, obstacles, cell_size=50):
+    """The set-based Zombie.astar_path as it was before the heap rewrite."""
+    cols = math.ceil(WIDTH / cell_size)
+    rows = math.ceil(HEIGHT / cell_size)
+
+    def is_walkable(node):
+        x, y = node
+        if x < 0 or x >= cols or y < 0 or y >= rows:
+            return False
+        node_rect = pygame.Rect(x * cell_size, y * cell_size, cell_size, cell_size)
+        for obs in obstacles:
+            if node_rect.colliderect(obs):
+                return False
+        return True
+
+    start_node = (int(start.x // cell_size), int(start.y // cell_size))
+    goal_node = (int(goal.x // cell_size), int(goal.y // cell_size))
+    open_set = {start_node}
+    came_from = {}
+    g_score = {start_node: 0}
+    f_score = {start_node: math.dist(start_node, goal_node)}
+    expansions = 0
+    while open_set:
+        current = min(open_set, key=lambda n: f_score.get(n, float('inf')))
+        if current == goal_node:
+            path = [current]
+            while current in came_from:
+                current = came_from[current]
+                path.append(current)
+            return path, expansions
+        open_set.remove(current)
+        expansions += 1
+        cx, cy = current
+        for dx in [-1, 0, 1]:
+            for dy in [-1, 0, 1]:
+                if dx == 0 and dy == 0:
+                    continue
+                neighbor = (cx + dx, cy + dy)
+                if not is_walkable(neighbor):
+                    continue
+                tentative_g = g_score[current] + math.hypot(dx, dy)
+                if tentative_g < g_score.get(neighbor, float('inf')):
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative_g
+                    f_score[neighbor] = tentative_g + math.dist(neighbor, goal_node)
+                    open_set.add(neighbor)
+    return [], expansions
+
+
+def random_walkable_points(is_free, sample, count, rng):
+    """Draw `count` random points from `sample` that pass `is_free`."""
+    points = []
+    for _ in range(count * 50):
+        if len(points) == count:
+            break
+        point = sample(rng)
+        if is_free(point):
+            points.append(point)
+    return points
+
+
+def path_length(path):
+    return sum(path[i].distance_to(path[i + 1]) for i in range(len(path) - 1))
+
+
+def report(label, expansions, elapsed):
+    rate = expansions / (elapsed * 1000) if elapsed else float('inf')
+    print(f"  {label:<24} {expansions:>9} expansions {elapsed * 1000:>10.1f} ms {rate:>10.1f} exp/ms")
+
+
+def bench_map(tmx_path, queries, rng):
+    tmx_data = load_map(tmx_path)
+    obstacles = load_collision_rects(tmx_data)
+    print(f"{tmx_path}: {tmx_data.width * tmx_data.tilewidth}x{tmx_data.height * tmx_data.tileheight} px, "
+          f"{len(obstacles)} collision rects")
+
+    # MapManager.astar: queries anywhere on the map grid.
+    map_manager = MapManager(obstacles, find_player_spawn(tmx_data))
+    nodes = [node for row in map_manager.grid for node in row if node.walkable]
+    pairs = [(pygame.Vector2(rng.choice(nodes).x, rng.choice(nodes).y),
+              pygame.Vector2(rng.choice(nodes).x, rng.choice(nodes).y)) for _ in range(queries)]
+
+    for label, search in (("MapManager.astar legacy", lambda s, g: legacy_map_astar(map_manager, s, g)),
+                          ("MapManager.astar HPA*", lambda s, g: (map_manager.astar(s, g), map_manager.last_expansions))):
+        total, start = 0, time.perf_counter()
+        for s, g in pairs:
+            total += search(s, g)[1]
+        report(label, total, time.perf_counter() - start)
+
+    # HPA* reachability against A* over the whole grid, blocked cells included.
+    pathfinder = map_manager.pathfinder
+    rows, cols = pathfinder.rows, pathfinder.cols
+    cell_pairs = KNOWN_HPA_PAIRS.get(os.path.basename(tmx_path), []) + [
+        ((rng.randrange(rows), rng.randrange(cols)), (rng.randrange(rows), rng.randrange(cols)))
+        for _ in range(queries)]
+    mismatches = sum(1 for s, g in cell_pairs
+                     if bool(pathfinder.find_path(s, g)) != bool(pathfinder.grid_astar(s, g, (0, 0, rows, cols))))
+    print(f"  HPA* reachability mismatches: {mismatches}/{len(cell_pairs)}")
+
+    # astar_path: queries inside the screen-sized grid it searches.
+    def free(point):
+        cell = pygame.Rect(int(point.x // 50) * 50, int(point.y // 50) * 50, 50, 50)
+        return cell.collidelist(obstacles) == -1
+
+    points = random_walkable_points(free, lambda r: pygame.Vector2(r.uniform(0, WIDTH), r.uniform(0, HEIGHT)),
+                                    queries * 2, rng)
+    pairs = list(zip(points[::2], points[1::2]))
+
+    total, start = 0, time.perf_counter()
+    for s, g in pairs:
+        total += legacy_astar_path(s, g, obstacles)[1]
+    report("astar_path legacy", total, time.perf_counter() - start)
+
+    stats = {}
+    total, start = 0, time.perf_counter()
+    for s, g in pairs:
+        astar_path(s, g, obstacles, cell_size=50, stats=stats)
+        total += stats["expansions"]
+    report("astar_path heap", total, time.perf_counter() - start)
+
+    # astar_path A* vs JPS: queries anywhere on the map.
+    walkable = walkability_for(obstacles).grid(50)
+    cells = [(col, row) for row, col in zip(*walkable.nonzero())]
+    pairs = [tuple(pygame.Vector2(col * 50 + 25, row * 50 + 25) for col, row in rng.sample(cells, 2))
+             for _ in range(queries)]
+    lengths = {}
+    for algorithm in ("astar", "jps"):
+        lengths[algorithm] = []
+        total, start = 0, time.perf_counter()
+        for s, g in pairs:
+            lengths[algorithm].append(path_length(astar_path(s, g, obstacles, cell_size=50,
+                                                             stats=stats, algorithm=algorithm)))
+            total += stats["expansions"]
+        report(f"astar_path {algorithm} (map)", total, time.perf_counter() - start)
+    mismatches = sum(1 for a, j in zip(lengths["astar"], lengths["jps"]) if abs(a - j) > 1e-6)
+    print(f"  JPS path length mismatches: {mismatches}/{len(pairs)}")
+
+
+def main():
+    queries = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    rng = random.Random(1234)
+    for tmx_path in sorted(glob.glob("*.tmx")):
+        bench_map(tmx_path, queries, rng)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
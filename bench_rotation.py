@@ -0,0 +1,65 @@
+"""
+Rotated sprite draw micro-benchmark.
+
+Draws 50, 200 and 500 zombies at random, slowly turning angles for a number
+of frames, once rotating each sprite every frame with pygame.transform.rotate
+(the draw loop before the rotation cache) and once through
+AssetCache.rotated. Also reports how far the snapped angles are from the
+exact ones and the memory the rotated frames take.
+
+Usage: python bench_rotation.py [frames]
+"""
+import os
+import sys
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from constants import WIDTH, HEIGHT, ROTATION_STEPS
+from AssetCache import asset_cache
+
+
+def draw_all(screen, zombies, rotate):
+    for zombie in zombies:
+        rotated_image = rotate(zombie.original_image, zombie.angle)
+        img_rect = rotated_image.get_rect(center=(zombie.pos.x, zombie.pos.y))
+        screen.blit(rotated_image, img_rect)
+
+
+def bench(screen, count, frames, rng):
+    from Zombie import Zombie
+    from ArmyZombie import ArmyZombie
+    from PoliceZombie import PoliceZombie
+    from BossZombie import BossZombie
+    kinds = rng.choices((Zombie, ArmyZombie, PoliceZombie, BossZombie), weights=(8, 3, 3, 1), k=count)
+    zombies = [kind((rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT))) for kind in kinds]
+    turns = [rng.uniform(-3, 3) for _ in zombies]
+    results = {}
+    for label, rotate in (("rotate per frame", pygame.transform.rotate), ("rotation cache", asset_cache.rotated)):
+        for zombie in zombies:
+            zombie.angle = rng.uniform(0, 360)
+        start = time.perf_counter()
+        for _ in range(frames):
+            for zombie, turn in zip(zombies, turns):
+                zombie.angle += turn
+            draw_all(screen, zombies, rotate)
+        results[label] = (time.perf_counter() - start) * 1000 / frames
+    print(f"  {count:>4} zombies " + "   ".join(f"{label} {ms:>7.2f} ms/frame" for label, ms in results.items()))
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    rng = random.Random(7)
+    for count in (50, 200, 500):
+        bench(screen, count, frames, rng)
+    print(f"  angle buckets {ROTATION_STEPS}: at most {180 / ROTATION_STEPS:.2f} degrees off")
+    print(f"  {asset_cache.stats()}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
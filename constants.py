@@ -6,6 +6,11 @@ EXKNIFE_IMAGE = "assets/exknife.png"         # Extended arm asset for knife atta
 GUN_COMPANION = "assets/survivor_idle.png"
 ZOMBIE_IMAGE_PATH = "assets/zombie.png"
 SPECIAL_ZOMBIE_IMAGE_PATH = "assets/special_zombie.png"
+ARMY_ZOMBIE_IMAGE_PATH = "assets/Army_zombie.png"
+POLICE_ZOMBIE_IMAGE_PATH = "assets/Police_zombie.png"
+BOSS_ZOMBIE_IMAGE_PATH = "assets/Boss_zombie.png"
+HUMAN_IMAGE_PATH = "assets/knifeplayer.png"
+SPIT_IMAGE_PATH = "assets/spit.png"             # Boss toxic puddle
 HEALTH_KIT_IMAGE = "assets/hk.png"             # Health kit asset
 AMMO_KIT_IMAGE = "assets/ammo.png"             # Ammo kit asset
 PLAYER_PISTOL_IMAGE_PATH = "assets/player_pistol.png"
@@ -29,6 +34,21 @@ AMMO_PACK_AMOUNT = 10
 BULLET_SPEED = 15
 BULLET_RANGE = 500
 BULLET_COLOR = (255, 255, 0)
+BULLET_POOL_SIZE = 256            # Player bullets in flight at once
+COMPANION_BULLET_POOL_SIZE = 64   # Gun companion bullets in flight at once
+PICKUP_POOL_SIZE = 128            # Pickups lying on the map
+DECAL_LIFETIME = 5000             # How long blood splatters stay on the ground, in ms
+DECAL_BUCKETS = 10                # Time buckets DecalLayer splits that lifetime into
+DECAL_LAYER_MIN = 64              # Live splatters below which DecalLayer blits the sprites
+DECAL_CHUNK_SIZE = 128            # Side of the decal layer chunks, in pixels
+HUD_PROFILE_FRAMES = 120          # Frames HudProfiler averages over
+ROTATION_STEPS = 64               # Angles each rotating sprite is pre-rendered at
+ROTATION_CACHE_BYTES = 64 * 1024 * 1024  # Memory the rotated sprite frames may use
+MAP_CHUNK_SIZE = 512              # Side of the baked map chunks, in pixels
+MAP_CHUNK_CACHE_BYTES = 48 * 1024 * 1024  # Memory the baked map chunks may use
+MINIMAP_SIZE = 200
+MINIMAP_REFRESH_HZ = 10           # How often the minimap's entity dots are redrawn
+TEXT_CACHE_SIZE = 128             # Rendered HUD and menu texts kept by TextCache
 
 # Maze and level settings (as per original)
 MAZE_REGION_SIZE = 2000  
@@ -38,6 +58,27 @@ DESTRUCTIBLE_PROB = 0.3
 DYNAMIC_PROB = 0.1       
 SAFE_ZONE_MARGIN = 150   
 
+# Pathfinding settings
+WALKABILITY_CELL_SIZES = (25, 50, 200)  # Bitmap resolutions rasterised per map
+PATH_CELL_SIZE = 50      # MapManager grid cell size (covers the whole map)
+LOS_CELL_SIZE = 50       # Occupancy grid walked by line_of_sight_clear
+PVS_CELL_SIZE = 100      # Cells of the precomputed visibility table
+PVS_RADIUS = 1000        # Cell pairs further apart than this are left to the exact test
+PATH_ALGORITHM = "jps"   # astar_path search: "astar" or "jps" (Jump Point Search)
+PATH_CLUSTER_SIZE = 10   # HPA* cluster side, in cells
+PATH_BUDGET_MS = 2.0     # Time the path scheduler may spend per frame
+PATH_BUDGET_EXPANSIONS = 0  # Node expansions per frame (0 = no limit)
+PATH_CACHE_SIZE = 256    # Paths kept in MapManager's LRU cache
+PATH_WORKERS = 2         # Worker processes computing paths off the main thread (0 = inline)
+PATH_MAX_IN_FLIGHT = 16  # Path requests handed to the workers at any one time
+SPATIAL_BUCKET_SIZE = 128  # Bucket side of the static collision index
+ENEMY_BUCKET_SIZE = 128  # Bucket side of the per-tick enemy index used for bullet hits
+CULL_MARGIN = 64         # Pixels beyond the screen edge entities are still drawn within
+CAMERA_SMOOTHING = 0     # Part of the way to the player the camera leaves for the next frame (0 = locked on)
+CHASE_CELL_SIZE = 25     # Occupancy grid EnemyPool checks a chase step against before the exact test
+SPAWN_CHECK_CELL_SIZE = 25
+SPAWN_ATTEMPTS = 10
+
 # Colors
 BLACK = (0, 0, 0)
 DARK_RED = (100, 0, 0)
@@ -0,0 +1,72 @@
+"""
+Golden-image check for the baked map chunks.
+
+Renders every level map from a fixed set of camera offsets (map corners,
+edges, the centre, fractional and off-map positions) with the per-tile
+reference path, draw_tiles, and with draw_map, which blits ChunkCache
+chunks, and compares the frames pixel for pixel. It runs a second pass
+with a chunk cache too small to hold a screenful, so evicted chunks are
+baked again. Exits non-zero on any difference. With --save DIR, the
+reference and chunk frames of mismatches are written there as PNGs.
+
+Usage: python golden_map.py [--save DIR]
+"""
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from constants import WIDTH, HEIGHT
+from utilityFunctions import load_map, draw_map, draw_tiles
+from ChunkCache import chunk_cache
+
+MAPS = ("deadvillage3.tmx", "newcity.tmx", "theroom.tmx", "heaq1.tmx", "heaq2.tmx", "deadcity.tmx")
+BACKGROUND = (100, 0, 0)
+
+
+def camera_offsets(tmx_data):
+    width, height = tmx_data.width * tmx_data.tilewidth, tmx_data.height * tmx_data.tileheight
+    xs = (-WIDTH / 2, 0, 0.5, 257.25, (width - WIDTH) / 2 + 0.75, width - WIDTH, width - WIDTH / 2 - 0.4)
+    ys = (-HEIGHT / 2, 0, 0.5, 131.6, (height - HEIGHT) / 2 + 0.25, height - HEIGHT, height - HEIGHT / 2 - 0.9)
+    return [pygame.Vector2(x, y) for x in xs for y in ys]
+
+
+def check(tmx_data, name, save_dir):
+    expected, found = pygame.Surface((WIDTH, HEIGHT)), pygame.Surface((WIDTH, HEIGHT))
+    mismatches = 0
+    for index, offset in enumerate(camera_offsets(tmx_data)):
+        expected.fill(BACKGROUND)
+        found.fill(BACKGROUND)
+        draw_tiles(expected, tmx_data, offset)
+        draw_map(found, tmx_data, offset)
+        if pygame.image.tostring(expected, "RGB") != pygame.image.tostring(found, "RGB"):
+            mismatches += 1
+            if save_dir:
+                stem = os.path.join(save_dir, f"{os.path.splitext(name)[0]}_{index}")
+                pygame.image.save(expected, stem + "_tiles.png")
+                pygame.image.save(found, stem + "_chunks.png")
+    return mismatches
+
+
+def main():
+    save_dir = sys.argv[sys.argv.index("--save") + 1] if "--save" in sys.argv else None
+    if save_dir:
+        os.makedirs(save_dir, exist_ok=True)
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    failed = 0
+    for label, max_bytes in (("default cache", chunk_cache.max_bytes), ("tiny cache", 2 * 1024 * 1024)):
+        chunk_cache.max_bytes = max_bytes
+        for name in MAPS:
+            tmx_data = load_map(name)
+            mismatches = check(tmx_data, name, save_dir)
+            failed += mismatches
+            print(f"  {label:<13} {name:<17} {len(camera_offsets(tmx_data))} frames, {mismatches} differ")
+    print(f"  {chunk_cache.stats()}")
+    pygame.quit()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
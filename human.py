@@ -1,10 +1,15 @@
 import pygame
 import math
-from constants import ZOMBIE_COLOR, ZOMBIE_SIZE, ZOMBIE_SPEED, COLLISION_THRESHOLD
+from constants import ZOMBIE_COLOR, ZOMBIE_SIZE, ZOMBIE_SPEED, COLLISION_THRESHOLD, HUMAN_IMAGE_PATH
+from AssetCache import load_image, rotate_image
 from MapManager import line_of_sight_clear
-from Zombie import astar_path  # Import the A* pathfinding function
+from FlowField import follow_flow_field
+from Zombie import request_path  # Queues A* requests on the map manager's scheduler
+from SpatialHash import static_index_for
 
 class Human:
+    faces_player = True  # Turns towards the player after every move, see EnemyPool
+
     def __init__(self, spawn_pos, speed_multiplier=1.0):
         self.pos = pygame.Vector2(spawn_pos)
         self.speed = ZOMBIE_SPEED * speed_multiplier
@@ -16,20 +21,21 @@ class Human:
         self.path = []
         self.path_index = 0
         self.last_path_update = pygame.time.get_ticks()
-        HUMAN_IMAGE_PATH = "assets/knifeplayer.png"
-        self.original_image = pygame.image.load(HUMAN_IMAGE_PATH).convert_alpha()
-        self.original_image = pygame.transform.scale(self.original_image, (self.size, self.size))
+        self.original_image = load_image(HUMAN_IMAGE_PATH, (self.size, self.size))
         self.image = self.original_image
 
     def take_damage(self, damage, game=None):
         self.health -= damage
         return self.health <= 0
 
-    def update(self, player_pos, obstacles, map_manager):
+    def update(self, player_pos, obstacles, map_manager, los_clear=None):
         current_time = pygame.time.get_ticks()
+        # los_clear is passed in when line of sight was batched for every enemy.
+        if los_clear is None:
+            los_clear = line_of_sight_clear(self.pos, player_pos, obstacles)
 
         # Try direct approach if line-of-sight is clear
-        if line_of_sight_clear(self.pos, player_pos, obstacles):
+        if los_clear:
             direction = player_pos - self.pos
             if direction.length() > 0:
                 self.angle = math.degrees(math.atan2(-direction.y, direction.x)) - 90
@@ -38,23 +44,24 @@ class Human:
                 candidate_rect = pygame.Rect(candidate_pos.x - self.size // 2,
                                              candidate_pos.y - self.size // 2,
                                              self.size, self.size)
-                collision = any(candidate_rect.colliderect(obs) for obs in obstacles)
+                collision = static_index_for(obstacles).collides(candidate_rect)
                 if not collision:
                     self.pos = candidate_pos
                     self.path = []
                     self.path_index = 0
                     self.last_path_update = current_time
-                else:
+                elif not follow_flow_field(self, map_manager, obstacles):
                     # Recalculate path if collision occurs
                     if current_time - self.last_path_update > 500:
-                        self.path = astar_path(self.pos, player_pos, obstacles, cell_size=50)
-                        self.path_index = 0
+                        request_path(self, player_pos, obstacles, map_manager)
                         self.last_path_update = current_time
+        elif follow_flow_field(self, map_manager, obstacles):
+            self.path = []
+            self.path_index = 0
         else:
             # Use A* pathfinding if no direct line-of-sight
             if (not self.path or self.path_index >= len(self.path)) and (current_time - self.last_path_update > 500):
-                self.path = astar_path(self.pos, player_pos, obstacles, cell_size=50)
-                self.path_index = 0
+                request_path(self, player_pos, obstacles, map_manager)
                 self.last_path_update = current_time
 
             if self.path and self.path_index < len(self.path):
@@ -69,14 +76,13 @@ class Human:
                     candidate_rect = pygame.Rect(candidate_pos.x - self.size // 2,
                                                  candidate_pos.y - self.size // 2,
                                                  self.size, self.size)
-                    collision = any(candidate_rect.colliderect(obs) for obs in obstacles)
+                    collision = static_index_for(obstacles).collides(candidate_rect)
                     if not collision:
                         self.pos = candidate_pos
                     else:
                         # Recalculate path if collision occurs
                         if current_time - self.last_path_update > 500:
-                            self.path = astar_path(self.pos, player_pos, obstacles, cell_size=50)
-                            self.path_index = 0
+                            request_path(self, player_pos, obstacles, map_manager)
                             self.last_path_update = current_time
 
         # Update the angle to face the player
@@ -90,7 +96,7 @@ class Human:
                            self.size, self.size)
 
     def draw(self, surface, offset):
-        rotated_image = pygame.transform.rotate(self.original_image, self.angle)
+        rotated_image = rotate_image(self.original_image, self.angle)
         img_rect = rotated_image.get_rect(center=(self.pos.x - offset.x, self.pos.y - offset.y))
         surface.blit(rotated_image, img_rect)
         self.draw_health_bar(surface, offset)
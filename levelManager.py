@@ -1,6 +1,7 @@
 # levelManager.py
 import pygame
 from constants import WIDTH, HEIGHT, FPS
+from TextCache import render_text
 
 class LevelManager:
     def __init__(self):
@@ -33,6 +34,6 @@ class LevelManager:
         current_time = pygame.time.get_ticks()
         if current_time - self.level_start_time < self.level_intro_duration:
             text = self.level_texts.get(self.current_level, f"Level {self.current_level}")
-            intro_text = font.render(text, True, (255, 255, 255))
+            intro_text = render_text(font, text, True, (255, 255, 255))
             rect = intro_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
             screen.blit(intro_text, rect)
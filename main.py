@@ -5,22 +5,33 @@ import math
 from pygame.locals import *
 from constants import (WIDTH, HEIGHT, FPS, SPAWN_INTERVAL, COLLISION_THRESHOLD, 
                        TEXT_COLOR, DARK_RED, PLAYER_MAX_HEALTH, PLAYER_SIZE, 
-                       BULLET_RANGE, HEALTH_PACK_AMOUNT, AMMO_PACK_AMOUNT, ZOMBIE_SIZE,BLACK)
+                       BULLET_RANGE, HEALTH_PACK_AMOUNT, AMMO_PACK_AMOUNT, ZOMBIE_SIZE,BLACK,
+                       BULLET_POOL_SIZE, PICKUP_POOL_SIZE)
 from Player import Player
-from Pickup import Pickup
+from Bullet import Bullet, draw_bullets
+from Pickup import Pickup, draw_pickups
+from DecalLayer import DecalLayer
+from ObjectPool import ObjectPool
+from AssetCache import asset_cache, load_image
 from utilityFunctions import load_map, load_collision_rects, draw_map, draw_objects, spawn_special_zombie
 from levelManager import LevelManager
 from Companion import Companion
-from MapManager import MapManager
+from MapManager import MapManager, line_of_sight_many
+from BulletSweep import BulletSweep
+from EnemyPool import EnemyPool
 from minimap import draw_minimap
 from checkpoint import load_checkpoints, draw_checkpoints
-from spawn import spawn_enemy, find_player_spawn
+from spawn import spawn_enemy, find_player_spawn, level_assets
 from storyline import play_level_story
 from doctor_minigame import doc_main
 from human import Human
 from rps import rock_paper_scissors_minigame
 from antidoteg import run_antidote_hunt
 from arsenal import draw_arsenal
+from HudProfiler import hud_profiler
+from ViewCuller import view_culler
+from Camera import Camera
+from TextCache import render_text, text_cache
 from BossZombie import BossZombie
 from sound import Sound
 from pause import pause
@@ -39,6 +50,7 @@ STATE_MINIGAME = "minigame"
 STATE_SLIDES = "slides"
 
 KILL_THRESHOLD = 5  # When objective_kills reaches this value, checkpoint is activated.
+enemy_pool = EnemyPool()  # Array copy of the enemies, moved by update_zombies
 
 def load_specific_map(current_level):
     """
@@ -53,7 +65,9 @@ def load_specific_map(current_level):
       - Level 7: "heaq2.tmx"
       - Level 8: (Placeholder for RPS minigame; using "heaq2.tmx")
       - Else: default map.
+    The level's enemy and pickup sprites are preloaded into the asset cache too.
     """
+    asset_cache.preload(level_assets(current_level))
     if current_level == 1:
         return load_map("deadvillage3.tmx")
     elif current_level == 2:
@@ -108,12 +122,11 @@ def process_storyline(screen, current_level, storyline_shown):
             return STATE_MENU, True
     return STATE_RUNNING, True
 
-def handle_running_events(event, player, zombies, world_mouse_pos, objective_kills,dead_zombies,total_kill_count):
+def handle_running_events(event, player, zombies, bullets, world_mouse_pos, objective_kills,dead_zombies,total_kill_count):
     """
-    Handles key and mouse events during gameplay.
-    Returns any additional bullets (if shot) and updated objective_kills.
+    Handles key and mouse events during gameplay; shots are spawned into bullets.
+    Returns updated objective_kills and total_kill_count.
     """
-    additional_bullets = []
     if event.type == KEYDOWN:
         if event.key == K_e:
             player.toggle_knife()
@@ -125,12 +138,7 @@ def handle_running_events(event, player, zombies, world_mouse_pos, objective_kil
             show_companion = not show_companion
     elif event.type == MOUSEBUTTONDOWN:
         if event.button == 1:  # Left-click to shoot
-            result = player.shoot(world_mouse_pos)
-            if result:
-                if isinstance(result, list):
-                    additional_bullets.extend(result)
-                else:
-                    additional_bullets.append(result)
+            player.shoot(world_mouse_pos, bullets)
         elif event.button == 3 and player.has_knife:
             player.use_knife()
             attacked = player.knife_attack(zombies)
@@ -138,38 +146,40 @@ def handle_running_events(event, player, zombies, world_mouse_pos, objective_kil
                 if z in zombies:
                     if z.take_damage(999, None):  # Instant kill via knife
                         zombies.remove(z)
-                        dead_zombies.append((z.pos.copy(), pygame.time.get_ticks()))
+                        dead_zombies.stamp(z.pos, pygame.time.get_ticks())
                         total_kill_count += 1
                         # Increase objective kill count if below threshold.
                         if objective_kills < KILL_THRESHOLD:
                             objective_kills += 1
-    return additional_bullets, objective_kills, total_kill_count
+    return objective_kills, total_kill_count
 
-def update_bullets(bullets, zombies, pickups, dead_zombies, tmx_data, current_level, total_kill_count, objective_kills):
+def update_bullets(bullets, zombies, obstacles, pickups, dead_zombies, tmx_data, current_level, total_kill_count, objective_kills):
     """
-    Update bullets and check for collisions with enemies.
+    Update bullets and check for collisions with enemies and walls.
     Returns updated bullets, total_kill_count, and objective_kills.
     """
-    for bullet in bullets[:]:
+    for bullet in list(bullets):
         bullet.update()
         if bullet.distance_traveled > BULLET_RANGE:
-            bullets.remove(bullet)
-            continue
-        for enemy in zombies[:]:
-            if (bullet.pos - enemy.pos).length() < enemy.size:
-                if enemy.take_damage(50, None):
-                    dead_zombies.append((enemy.pos.copy(), pygame.time.get_ticks()))
-                    zombies.remove(enemy)
-                    total_kill_count += 1
-                    if objective_kills < KILL_THRESHOLD:
-                        objective_kills += 1
-                    # 30% chance to spawn a pickup.
-                    if random.random() < 0.3:
-                        pickup_type = 'health' if random.random() < 0.5 else 'ammo'
-                        pickups.append(Pickup(enemy.pos.copy(), pickup_type))
-                if bullet in bullets:
-                    bullets.remove(bullet)
-                break
+            bullets.release(bullet)
+    live = list(bullets)
+    sweep = BulletSweep(live, zombies, obstacles)
+    for index, bullet in enumerate(live):
+        enemy, wall = sweep.hit(index)
+        if enemy is not None:
+            if enemy.take_damage(50, None):
+                dead_zombies.stamp(enemy.pos, pygame.time.get_ticks())
+                zombies.remove(enemy)
+                sweep.remove(enemy)
+                total_kill_count += 1
+                if objective_kills < KILL_THRESHOLD:
+                    objective_kills += 1
+                # 30% chance to spawn a pickup.
+                if random.random() < 0.3:
+                    pickup_type = 'health' if random.random() < 0.5 else 'ammo'
+                    pickups.spawn(enemy.pos, pickup_type)
+        if enemy is not None or wall:
+            bullets.release(bullet)
     return bullets, total_kill_count, objective_kills
 
 def update_companion(companion, player, zombies, obstacles, total_kill_count, objective_kills, pickups, dead_zombies):
@@ -178,132 +188,138 @@ def update_companion(companion, player, zombies, obstacles, total_kill_count, ob
     Returns updated total_kill_count and objective_kills.
     """
     companion.update(player, zombies, obstacles)
-    for bullet in companion.bullets[:]:
+    for bullet in list(companion.bullets):
         bullet.update()
         if bullet.distance_traveled > bullet.max_distance:
-            companion.bullets.remove(bullet)
-            continue
-        for enemy in zombies[:]:
-            if (bullet.pos - enemy.pos).length() < enemy.size:
-                if enemy.take_damage(50, None):
-                    dead_zombies.append((enemy.pos.copy(), pygame.time.get_ticks()))
-                    zombies.remove(enemy)
-                    total_kill_count += 1
-                    if objective_kills < KILL_THRESHOLD:
-                        objective_kills += 1
-                    if random.random() < 0.3:
-                        pickups.append(Pickup(enemy.pos.copy(), random.choice(["health", "ammo"])))
-                if bullet in companion.bullets:
-                    companion.bullets.remove(bullet)
-                break
+            companion.bullets.release(bullet)
+    live = list(companion.bullets)
+    sweep = BulletSweep(live, zombies, obstacles)
+    for index, bullet in enumerate(live):
+        enemy, wall = sweep.hit(index)
+        if enemy is not None:
+            if enemy.take_damage(50, None):
+                dead_zombies.stamp(enemy.pos, pygame.time.get_ticks())
+                zombies.remove(enemy)
+                sweep.remove(enemy)
+                total_kill_count += 1
+                if objective_kills < KILL_THRESHOLD:
+                    objective_kills += 1
+                if random.random() < 0.3:
+                    pickups.spawn(enemy.pos, random.choice(["health", "ammo"]))
+        if enemy is not None or wall:
+            companion.bullets.release(bullet)
     return total_kill_count, objective_kills
 
 def update_pickups(player, pickups):
     """
     Check if player collects any pickups.
     """
-    for pickup in pickups[:]:
+    for pickup in list(pickups):
         if (player.pos - pickup.pos).length() < player.size + pickup.size:
             pickup_sound.play()
             if pickup.type == 'health':
                 player.health = min(PLAYER_MAX_HEALTH, player.health + HEALTH_PACK_AMOUNT)
             else:
                 player.ammo += AMMO_PACK_AMOUNT
-            pickups.remove(pickup)
+            pickups.release(pickup)
     return pickups
 
-def update_zombies(zombies, player, collision_rects, map_manager, tmx_data, current_level, total_kill_count, objective_kills, dead_zombies):
+def update_zombies(zombies, player, collision_rects, map_manager, tmx_data, current_level, total_kill_count, objective_kills, dead_zombies, view_rect):
     """
     Update each zombie (and special zombies) and handle collisions with the player.
+    view_rect (the camera's) puts on-screen zombies first in the path queue.
     Returns updated zombies, total_kill_count, and objective_kills.
     """
     new_zombies = []
-    for enemy in zombies[:]:
-        if enemy.is_special:
-            enemy.update(player.pos, collision_rects, map_manager)
-            if (enemy.pos - player.pos).length() <= 150:
-                new_enemies = [spawn_enemy(1.0, tmx_data, current_level) for _ in range(8)]
-                if current_level != 4:
-                    zombies.extend(new_enemies)
-                dead_zombies.append((enemy.pos.copy(), pygame.time.get_ticks()))
-                zombies.remove(enemy)
-                total_kill_count += 1
-                if objective_kills < KILL_THRESHOLD:
-                    objective_kills += 1
-                continue
-        else:
-            enemy.update(player.pos, collision_rects, map_manager)
-        if player.get_rect().colliderect(enemy.get_rect()):
+    map_manager.flow_field.update(player.pos)
+    enemies = zombies[:]
+    los_clear = line_of_sight_many([(enemy.pos.x, enemy.pos.y) for enemy in enemies], player.pos, collision_rects)
+    enemy_pool.update(enemies, player.pos, collision_rects, map_manager, los_clear)
+    for index, enemy in enumerate(enemies):
+        if not enemy.is_special:
+            continue
+        enemy.update(player.pos, collision_rects, map_manager)
+        if (enemy.pos - player.pos).length() <= 150:
+            new_enemies = [spawn_enemy(1.0, tmx_data, current_level) for _ in range(8)]
+            if current_level != 4:
+                zombies.extend(new_enemies)
+            dead_zombies.stamp(enemy.pos, pygame.time.get_ticks())
+            zombies.remove(enemy)
+            total_kill_count += 1
+            if objective_kills < KILL_THRESHOLD:
+                objective_kills += 1
+            continue
+        enemy_pool.reload(index)
+    for enemy in enemy_pool.touching(player.get_rect()):
+        if enemy in zombies:  # Special zombies that just burst are gone
             player.take_damage(10)
+    for enemy in zombies:
+        if isinstance(enemy, BossZombie):
+            enemy.puddle_damage(player)
     zombies.extend(new_zombies)
+    map_manager.scheduler.process(player.pos, zombies, view_rect)
     return zombies, total_kill_count, objective_kills
 
-def draw_game_scene(screen, tmx_data, offset, player, bullets, pickups, zombies, companion, checkpoints, dead_zombies, dead_sprite, total_kill_count, objective_kills, current_level, level_manager, collision_rects, map_manager, active_checkpoint, font, large_font, puddles):
+def draw_game_scene(screen, tmx_data, camera, player, bullets, pickups, zombies, companion, checkpoints, dead_zombies, total_kill_count, objective_kills, current_level, level_manager, collision_rects, map_manager, active_checkpoint, font, large_font, puddles):
     """
     Draw the game scene in the running state, including the map, objects, UI, blood effects, and minimap.
     """
+    offset = camera.offset
     screen.fill(BLACK)
     draw_map(screen, tmx_data, offset)
     draw_objects(screen, tmx_data, "props", offset)
 
-    # Draw blood effect: show dead zombie sprite (blood splatter) for 5 seconds.
-    current_time = pygame.time.get_ticks()
-    for item in dead_zombies[:]:
-        pos, death_time = item
-        if current_time - death_time < 5000:
-            screen.blit(dead_sprite, pos - offset - pygame.Vector2(50, 20))
-        else:
-            dead_zombies.remove(item)
+    # Draw blood effect: dead zombie sprites (blood splatter) fade out after 5 seconds.
+    dead_zombies.draw(screen, offset, pygame.time.get_ticks())
     
+    view_culler.look(camera)
     for puddle in puddles:
-        puddle.draw(screen, offset)
+        if view_culler.shows(puddle.rect):
+            puddle.draw(screen, offset)
         print("YOLO")
         distance_to_puddle = (player.pos - puddle.position).length()
         if distance_to_puddle <= puddle.radius:  # Check if the player is within the puddle's radius
             print("Player is in the puddle!")  # Debug print
             player.take_damage(puddle.damage)
 
-    for zombie in zombies[:]:
-        if isinstance(zombie, BossZombie):
-            zombie.draw(screen, offset, player)  # Update BossZombie behavior
-        else:
-            zombie.draw(screen, offset)
+    for zombie in view_culler.visible(zombies, always=BossZombie):
+        zombie.draw(screen, offset)
 
     if checkpoints:
         draw_checkpoints(screen, checkpoints, offset)
-    for bullet in bullets:
-        bullet.draw(screen, offset)
-    for pickup in pickups:
-        pickup.draw(screen, offset)
+    draw_bullets(screen, view_culler.visible(bullets), camera)
+    draw_pickups(screen, view_culler.visible(pickups), camera)
 
     if show_companion:
         companion.draw(screen, offset)
     player.draw(screen, offset, current_level)
 
     # Draw health bar.
+    hud_profiler.start()
     pygame.draw.rect(screen, (255, 0, 0), (20, 20, 200, 20))
     pygame.draw.rect(screen, (0, 255, 0), (20, 20, 200 * (player.health / PLAYER_MAX_HEALTH), 20))
-    ammo_text = font.render(f'AMMO: {player.ammo}', True, TEXT_COLOR)
+    ammo_text = render_text(font, f'AMMO: {player.ammo}', True, TEXT_COLOR)
     screen.blit(ammo_text, (20, 45))
-    level_text = font.render(f'LEVEL: {current_level}', True, TEXT_COLOR)
+    level_text = render_text(font, f'LEVEL: {current_level}', True, TEXT_COLOR)
     screen.blit(level_text, (WIDTH // 2 - 50, 20))
 
     # Draw objective texts.
-    objective_title = font.render('OBJECTIVE:', True, TEXT_COLOR)
-    objective_progress = font.render(f'{min(objective_kills, KILL_THRESHOLD)}/{KILL_THRESHOLD}', True, TEXT_COLOR)
-    total_kill_text = font.render(f'TOTAL KILLS: {total_kill_count}', True, TEXT_COLOR)
+    objective_title = render_text(font, 'OBJECTIVE:', True, TEXT_COLOR)
+    objective_progress = render_text(font, f'{min(objective_kills, KILL_THRESHOLD)}/{KILL_THRESHOLD}', True, TEXT_COLOR)
+    total_kill_text = render_text(font, f'TOTAL KILLS: {total_kill_count}', True, TEXT_COLOR)
     objective_y = HEIGHT // 2 - 50
     progress_y = objective_y + 30
     total_kill_y = progress_y + 30
     screen.blit(objective_title, (20, objective_y))
     screen.blit(objective_progress, (50, progress_y))
     screen.blit(total_kill_text, (20, total_kill_y))
+    hud_profiler.lap("stats")
 
     # Display proper status text.
     if objective_kills < KILL_THRESHOLD:
-        status_text = font.render(f"Objective: Eliminate {KILL_THRESHOLD} zombies", True, TEXT_COLOR)
+        status_text = render_text(font, f"Objective: Eliminate {KILL_THRESHOLD} zombies", True, TEXT_COLOR)
     else:
-        status_text = font.render("Objective: Find and reach the checkpoint!", True, TEXT_COLOR)
+        status_text = render_text(font, "Objective: Find and reach the checkpoint!", True, TEXT_COLOR)
         if active_checkpoint:
             cp_rect = active_checkpoint["rect"]
             checkpoint_x = cp_rect.x - offset.x
@@ -335,12 +351,18 @@ def draw_game_scene(screen, tmx_data, offset, player, bullets, pickups, zombies,
                                   arrow_center[1] + direction.y * arrow_length),
                                  (arrow_center[0] + direction.x * arrow_length + head_length * direction.y,
                                   arrow_center[1] + direction.y * arrow_length - head_length * direction.x), 3)
-        cp_obj_text = font.render("Find and reach the checkpoint!", True, TEXT_COLOR)
+        cp_obj_text = render_text(font, "Find and reach the checkpoint!", True, TEXT_COLOR)
         screen.blit(cp_obj_text, (20, total_kill_y + 30))
     screen.blit(status_text, (WIDTH - status_text.get_width() - 25, 230))
     level_manager.draw_level_intro(screen, large_font)
+    hud_profiler.lap("objective")
     draw_minimap(screen, tmx_data, collision_rects, player, zombies, companion if show_companion else None, active_checkpoint)
+    hud_profiler.lap("minimap")
     draw_arsenal(screen, player)
+    hud_profiler.lap("arsenal")
+    hud_profiler.count("text renders", text_cache.end_frame())
+    hud_profiler.count("draws skipped", view_culler.end_frame())
+    hud_profiler.draw(screen, font)
     pygame.display.flip()
 
 def draw_menu(screen, large_font, font, current_level, total_kill_count, player):
@@ -349,12 +371,12 @@ def draw_menu(screen, large_font, font, current_level, total_kill_count, player)
     """
     return 
     screen.fill(DARK_RED)
-    title_text = large_font.render("RESIDENT EVIL 2D SURVIVAL", True, TEXT_COLOR)
-    level_text = large_font.render(f"LEVEL {current_level}", True, TEXT_COLOR)
-    start_text = font.render("Press S to Start", True, TEXT_COLOR)
-    quit_text = font.render("Press Q to Quit", True, TEXT_COLOR)
-    kills_text = font.render(f"Total Kills: {total_kill_count}", True, TEXT_COLOR)
-    ammo_text = font.render(f"Ammo: {player.ammo}", True, TEXT_COLOR)
+    title_text = render_text(large_font, "RESIDENT EVIL 2D SURVIVAL", True, TEXT_COLOR)
+    level_text = render_text(large_font, f"LEVEL {current_level}", True, TEXT_COLOR)
+    start_text = render_text(font, "Press S to Start", True, TEXT_COLOR)
+    quit_text = render_text(font, "Press Q to Quit", True, TEXT_COLOR)
+    kills_text = render_text(font, f"Total Kills: {total_kill_count}", True, TEXT_COLOR)
+    ammo_text = render_text(font, f"Ammo: {player.ammo}", True, TEXT_COLOR)
     
     screen.blit(title_text, (WIDTH // 2 - title_text.get_width() // 2, HEIGHT // 3))
     screen.blit(level_text, (WIDTH // 2 - level_text.get_width() // 2, HEIGHT // 2))
@@ -371,7 +393,7 @@ def draw_overlay(screen, text, large_font):
     overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
     overlay.fill((0, 0, 0, 180))
     screen.blit(overlay, (0, 0))
-    text_surface = large_font.render(text, True, TEXT_COLOR)
+    text_surface = render_text(large_font, text, True, TEXT_COLOR)
     screen.blit(text_surface, (WIDTH // 2 - text_surface.get_width() // 2, HEIGHT // 3))
     pygame.display.flip()
 
@@ -382,21 +404,21 @@ def draw_level_complete(screen, large_font, font, total_kill_count, player):
     overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
     overlay.fill((0, 0, 0, 180))
     screen.blit(overlay, (0, 0))
-    complete_text = large_font.render("LEVEL COMPLETE", True, TEXT_COLOR)
+    complete_text = render_text(large_font, "LEVEL COMPLETE", True, TEXT_COLOR)
     screen.blit(complete_text, (WIDTH // 2 - complete_text.get_width() // 2, HEIGHT // 3))
     
     vertical_spacing = 35
     stats_start_y = HEIGHT // 2 - 50
-    kills_text = font.render(f"Level Kills: {KILL_THRESHOLD}/{KILL_THRESHOLD}", True, TEXT_COLOR)
-    total_kills_text = font.render(f"Total Kills: {total_kill_count}", True, TEXT_COLOR)
-    ammo_text = font.render(f"Ammo: {player.ammo}", True, TEXT_COLOR)
+    kills_text = render_text(font, f"Level Kills: {KILL_THRESHOLD}/{KILL_THRESHOLD}", True, TEXT_COLOR)
+    total_kills_text = render_text(font, f"Total Kills: {total_kill_count}", True, TEXT_COLOR)
+    ammo_text = render_text(font, f"Ammo: {player.ammo}", True, TEXT_COLOR)
     screen.blit(kills_text, (WIDTH // 2 - kills_text.get_width() // 2, stats_start_y))
     screen.blit(total_kills_text, (WIDTH // 2 - total_kills_text.get_width() // 2, stats_start_y + vertical_spacing))
     screen.blit(ammo_text, (WIDTH // 2 - ammo_text.get_width() // 2, stats_start_y + vertical_spacing * 2))
     
     options_start_y = stats_start_y + vertical_spacing * 3 + 20
-    next_text = font.render("Press N for Next Level", True, TEXT_COLOR)
-    quit_text = font.render("Press Q to Quit", True, TEXT_COLOR)
+    next_text = render_text(font, "Press N for Next Level", True, TEXT_COLOR)
+    quit_text = render_text(font, "Press Q to Quit", True, TEXT_COLOR)
     screen.blit(next_text, (WIDTH // 2 - next_text.get_width() // 2, options_start_y))
     screen.blit(quit_text, (WIDTH // 2 - quit_text.get_width() // 2, options_start_y + vertical_spacing))
     pygame.display.flip()
@@ -408,9 +430,9 @@ def draw_game_over(screen, large_font, font, total_kill_count):
     overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
     overlay.fill((0, 0, 0, 180))
     screen.blit(overlay, (0, 0))
-    game_over_text = large_font.render("GAME OVER", True, TEXT_COLOR)
-    restart_text = font.render("Press R to Restart", True, TEXT_COLOR)
-    final_kills_text = font.render(f"Total Kills: {total_kill_count}", True, TEXT_COLOR)
+    game_over_text = render_text(large_font, "GAME OVER", True, TEXT_COLOR)
+    restart_text = render_text(font, "Press R to Restart", True, TEXT_COLOR)
+    final_kills_text = render_text(font, f"Total Kills: {total_kill_count}", True, TEXT_COLOR)
     screen.blit(game_over_text, (WIDTH // 2 - game_over_text.get_width() // 2, HEIGHT // 2 - 50))
     screen.blit(restart_text, (WIDTH // 2 - restart_text.get_width() // 2, HEIGHT // 2 + 20))
     screen.blit(final_kills_text, (WIDTH // 2 - final_kills_text.get_width() // 2, HEIGHT // 2 - 100))
@@ -434,8 +456,9 @@ def main():
 
     safe_pos = find_player_spawn(tmx_data)
     player = Player(safe_pos)
+    camera = Camera()
     # Load the blood effect (dead zombie) sprite.
-    dead_sprite = pygame.image.load('assets/Dead_img.png').convert_alpha()
+    dead_sprite = load_image('assets/Dead_img.png')
 
     companion = Companion(player.pos + pygame.Vector2(60, 0), "gun")
     global show_companion
@@ -449,9 +472,16 @@ def main():
 
     # Game object lists and counters.
     zombies = []
-    bullets = []
-    pickups = []
-    dead_zombies = []
+    bullets = ObjectPool(Bullet, BULLET_POOL_SIZE)
+    pickups = ObjectPool(Pickup, PICKUP_POOL_SIZE)
+    dead_zombies = DecalLayer(dead_sprite)
+    # Pool high-water marks and cache figures, for sizing them, in the F3 overlay.
+    hud_profiler.track("bullets", bullets.stats)
+    hud_profiler.track("companion bullets", lambda: companion.bullets.stats())
+    hud_profiler.track("pickups", pickups.stats)
+    hud_profiler.track("decals", dead_zombies.stats)
+    hud_profiler.track("assets", lambda: "Assets: " + asset_cache.stats())
+    hud_profiler.track("texts", text_cache.stats)
     puddles = []
     total_kill_count = 0
     objective_kills = 0
@@ -469,6 +499,7 @@ def main():
     while True:
         dt = clock.tick(FPS) / 1000.0
         current_time = pygame.time.get_ticks()
+        camera.follow(player.pos)
 
         # Global event processing.
         for event in pygame.event.get():
@@ -479,6 +510,8 @@ def main():
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_p:  # Press 'P' to pause
                     pause(screen)
+                if event.key == pygame.K_F3:  # Press 'F3' to show HUD timings
+                    hud_profiler.visible = not hud_profiler.visible
                     
             # Process events per state.
             if state == STATE_MENU:
@@ -491,19 +524,15 @@ def main():
                 # Storyline state events are handled internally.
                 pass
             elif state == STATE_RUNNING:
-                offset = pygame.Vector2(player.pos.x - WIDTH // 2, player.pos.y - HEIGHT // 2)
-                mouse_pos = pygame.mouse.get_pos()
-                world_mouse_pos = pygame.Vector2(mouse_pos) + offset
-                add_bullets, objective_kills,total_kill_count = handle_running_events(event, player, zombies, world_mouse_pos, objective_kills,dead_zombies,total_kill_count)
-                if add_bullets:
-                    bullets.extend(add_bullets)
+                world_mouse_pos = camera.screen_to_world(pygame.mouse.get_pos())
+                objective_kills, total_kill_count = handle_running_events(event, player, zombies, bullets, world_mouse_pos, objective_kills,dead_zombies,total_kill_count)
                 if event.type == SPAWN_EVENT:
                     if spawn_zombies and objective_kills < KILL_THRESHOLD:
                         new_enemies = [spawn_enemy(1.0, tmx_data, current_level) for _ in range(2)]
                         zombies.extend(new_enemies)
                 for puddle in puddles:
-                    puddle.draw(screen, offset)
-                    distance_to_puddle = (player.pos - (puddle.position - offset - pygame.Vector2(60,40))).length()
+                    puddle.draw(screen, camera.offset)
+                    distance_to_puddle = (player.pos - (puddle.position - camera.offset - pygame.Vector2(60,40))).length()
 
                     if distance_to_puddle <= puddle.radius:  # Check if the player is within the puddle's radius
                         print("Player is in the puddle!")  # Debug print
@@ -514,6 +543,8 @@ def main():
                         current_level += 1
                         tmx_data = load_specific_map(current_level)
                         collision_rects = load_collision_rects(tmx_data)
+                        obstacles = collision_rects
+                        map_manager.update_obstacles(collision_rects)
                         checkpoints = load_checkpoints(tmx_data)
                         safe_pos = find_player_spawn(tmx_data)
                         player = Player(safe_pos)
@@ -541,6 +572,7 @@ def main():
                         sys.exit()
             elif state == STATE_GAME_OVER:
                 if event.type == KEYDOWN and event.key == K_r:
+                    map_manager.close()  # The restarted game builds its own worker pool
                     main()
                     return
             elif state == STATE_SLIDES:
@@ -560,6 +592,8 @@ def main():
                         current_level += 1
                         tmx_data = load_specific_map(current_level)
                         collision_rects = load_collision_rects(tmx_data)
+                        obstacles = collision_rects
+                        map_manager.update_obstacles(collision_rects)
                         checkpoints = load_checkpoints(tmx_data)
                         safe_pos = find_player_spawn(tmx_data)
                         player = Player(safe_pos)
@@ -584,20 +618,18 @@ def main():
         elif state == STATE_STORYLINE:
             state, storyline_shown = process_storyline(screen, current_level, storyline_shown)
         elif state == STATE_RUNNING:
-            offset = pygame.Vector2(player.pos.x - WIDTH // 2, player.pos.y - HEIGHT // 2)
-            mouse_pos = pygame.mouse.get_pos()
-            world_mouse_pos = pygame.Vector2(mouse_pos) + offset
+            world_mouse_pos = camera.screen_to_world(pygame.mouse.get_pos())
             player.update_rotation(world_mouse_pos)
             player.update(collision_rects)
             player.update_invincibility()
 
-            bullets, total_kill_count, objective_kills = update_bullets(bullets, zombies, pickups, dead_zombies, tmx_data, current_level, total_kill_count, objective_kills)
+            bullets, total_kill_count, objective_kills = update_bullets(bullets, zombies, obstacles, pickups, dead_zombies, tmx_data, current_level, total_kill_count, objective_kills)
 
             if show_companion:
                 total_kill_count, objective_kills = update_companion(companion, player, zombies, obstacles, total_kill_count, objective_kills, pickups, dead_zombies)
 
             pickups = update_pickups(player, pickups)
-            zombies, total_kill_count, objective_kills = update_zombies(zombies, player, collision_rects, map_manager, tmx_data, current_level, total_kill_count, objective_kills, dead_zombies)
+            zombies, total_kill_count, objective_kills = update_zombies(zombies, player, collision_rects, map_manager, tmx_data, current_level, total_kill_count, objective_kills, dead_zombies, camera.visible_rect())
 
             if player.health <= 0:
                 state = STATE_GAME_OVER
@@ -611,8 +643,8 @@ def main():
                 if player.get_rect().colliderect(active_checkpoint["rect"]):
                     state = STATE_LEVEL_COMPLETE
 
-            draw_game_scene(screen, tmx_data, offset, player, bullets, pickups, zombies,
-                            companion, checkpoints, dead_zombies, dead_sprite,
+            draw_game_scene(screen, tmx_data, camera, player, bullets, pickups, zombies,
+                            companion, checkpoints, dead_zombies,
                             total_kill_count, objective_kills, current_level, level_manager,
                             collision_rects, map_manager, active_checkpoint, font, large_font, puddles)
         elif state == STATE_LEVEL_COMPLETE:
@@ -1,49 +1,96 @@
+import numpy as np
 import pygame
-from constants import WIDTH, HEIGHT
+from constants import WIDTH, HEIGHT, MINIMAP_SIZE, MINIMAP_REFRESH_HZ
+
+DOT_RADIUS = 5
+
+
+def dot_sprite(color):
+    """A pygame.draw.circle dot of DOT_RADIUS on a transparent square, centred on (DOT_RADIUS, DOT_RADIUS)."""
+    dot = pygame.Surface((DOT_RADIUS * 2 + 1, DOT_RADIUS * 2 + 1), pygame.SRCALPHA)
+    pygame.draw.circle(dot, color, (DOT_RADIUS, DOT_RADIUS), DOT_RADIUS)
+    return dot
+
+
+class Minimap:
+    """
+    Minimap at the top-right corner of the screen. The obstacles are baked into
+    a background once per map; the entity dots are redrawn on a copy of it at
+    most refresh_hz times a second, and the last result is blitted in between.
+    """
+    def __init__(self, size=MINIMAP_SIZE, refresh_hz=MINIMAP_REFRESH_HZ):
+        self.size = size
+        self.refresh_ms = 1000 / refresh_hz
+        self.source = None  # (tmx_data, collision_rects) the background was baked from
+        self.background = None
+        self.frame = pygame.Surface((size, size))
+        self.scale = (1, 1)
+        self.last_refresh = None
+        self.dots = {}
+
+    def bake(self, tmx_data, collision_rects):
+        """Draw the obstacles (collision_rects) as gray rectangles, scaled from the full Tiled map."""
+        map_width = tmx_data.width * tmx_data.tilewidth
+        map_height = tmx_data.height * tmx_data.tileheight
+        scale_x = self.size / map_width
+        scale_y = self.size / map_height
+        self.background = pygame.Surface((self.size, self.size))
+        self.background.fill((50, 50, 50))
+        for rect in collision_rects:
+            mini_rect = pygame.Rect(rect.x * scale_x, rect.y * scale_y, rect.width * scale_x, rect.height * scale_y)
+            pygame.draw.rect(self.background, (100, 100, 100), mini_rect)
+        self.scale = (scale_x, scale_y)
+        self.source = (tmx_data, collision_rects)
+        self.last_refresh = None
+
+    def dot(self, color):
+        if color not in self.dots:
+            self.dots[color] = dot_sprite(color)
+        return self.dots[color]
+
+    def dot_blits(self, positions, color):
+        """(dot, topleft) pairs for (n, 2) world positions, truncated like int(pos * scale)."""
+        if not len(positions):
+            return []
+        mini = np.trunc(np.asarray(positions, dtype=float) * self.scale).astype(int) - DOT_RADIUS
+        dot = self.dot(color)
+        return [(dot, position) for position in mini.tolist()]
+
+    def refresh(self, player, zombies, companion, checkpoint):
+        """
+        Redraw the dynamic layer on the baked background:
+          - The player as a green circle,
+          - Zombies as red circles,
+          - The companion as a blue circle if available,
+          - If a checkpoint is active, draws it as a yellow rectangle.
+        """
+        self.frame.blit(self.background, (0, 0))
+        batch = self.dot_blits([(player.pos.x, player.pos.y)], (0, 255, 0))
+        batch += self.dot_blits([(zombie.pos.x, zombie.pos.y) for zombie in zombies], (255, 0, 0))
+        if companion is not None:
+            batch += self.dot_blits([(companion.pos.x, companion.pos.y)], (0, 0, 255))
+        self.frame.blits(batch, False)
+        if checkpoint is not None:
+            scale_x, scale_y = self.scale
+            cp_rect = checkpoint["rect"]
+            mini_cp = pygame.Rect(cp_rect.x * scale_x, cp_rect.y * scale_y, cp_rect.width * scale_x, cp_rect.height * scale_y)
+            pygame.draw.rect(self.frame, (255, 255, 0), mini_cp, 2)
+
+    def draw(self, surface, tmx_data, collision_rects, player, zombies, companion, checkpoint=None):
+        if self.source is None or self.source[0] is not tmx_data or self.source[1] is not collision_rects:
+            self.bake(tmx_data, collision_rects)
+        now = pygame.time.get_ticks()
+        if self.last_refresh is None or now - self.last_refresh >= self.refresh_ms:
+            self.refresh(player, zombies, companion, checkpoint)
+            self.last_refresh = now
+        surface.blit(self.frame, (WIDTH - self.size - 10, 10))
+
+
+minimap = Minimap()
+
 
 def draw_minimap(surface, tmx_data, collision_rects, player, zombies, companion, checkpoint=None):
     """
-    Draws a minimap at the top-right corner of the screen.
-    It scales the full map dimensions from the Tiled map and draws:
-      - Obstacles (from collision_rects) as gray rectangles,
-      - The player as a green circle,
-      - Zombies as red circles,
-      - The companion as a blue circle if available,
-      - If a checkpoint is active, draws it as a yellow rectangle.
+    Draws a minimap at the top-right corner of the screen, see Minimap.
     """
-    minimap_width = 200
-    minimap_height = 200
-    minimap_surface = pygame.Surface((minimap_width, minimap_height))
-    minimap_surface.fill((50, 50, 50))
-    
-    map_width = tmx_data.width * tmx_data.tilewidth
-    map_height = tmx_data.height * tmx_data.tileheight
-    scale_x = minimap_width / map_width
-    scale_y = minimap_height / map_height
-
-    # Draw obstacles.
-    for rect in collision_rects:
-        mini_rect = pygame.Rect(rect.x * scale_x, rect.y * scale_y, rect.width * scale_x, rect.height * scale_y)
-        pygame.draw.rect(minimap_surface, (100, 100, 100), mini_rect)
-    
-    # Draw player.
-    mini_player = (int(player.pos.x * scale_x), int(player.pos.y * scale_y))
-    pygame.draw.circle(minimap_surface, (0, 255, 0), mini_player, 5)
-    
-    # Draw zombies.
-    for zombie in zombies:
-        mini_zombie = (int(zombie.pos.x * scale_x), int(zombie.pos.y * scale_y))
-        pygame.draw.circle(minimap_surface, (255, 0, 0), mini_zombie, 5)
-    
-    # Draw companion.
-    if companion is not None:
-        mini_comp = (int(companion.pos.x * scale_x), int(companion.pos.y * scale_y))
-        pygame.draw.circle(minimap_surface, (0, 0, 255), mini_comp, 5)
-    
-    # Draw checkpoint if active.
-    if checkpoint is not None:
-        cp_rect = checkpoint["rect"]
-        mini_cp = pygame.Rect(cp_rect.x * scale_x, cp_rect.y * scale_y, cp_rect.width * scale_x, cp_rect.height * scale_y)
-        pygame.draw.rect(minimap_surface, (255, 255, 0), mini_cp, 2)
-    
-    surface.blit(minimap_surface, (WIDTH - minimap_width - 10, 10))
+    minimap.draw(surface, tmx_data, collision_rects, player, zombies, companion, checkpoint)
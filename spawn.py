@@ -1,7 +1,10 @@
 import pygame
 import random
 import math
-from constants import PLAYER_SIZE, ZOMBIE_SIZE
+from constants import (PLAYER_SIZE, ZOMBIE_SIZE, SPAWN_CHECK_CELL_SIZE, SPAWN_ATTEMPTS, ZOMBIE_IMAGE_PATH,
+                       ARMY_ZOMBIE_IMAGE_PATH, POLICE_ZOMBIE_IMAGE_PATH, BOSS_ZOMBIE_IMAGE_PATH, HUMAN_IMAGE_PATH,
+                       SPECIAL_ZOMBIE_IMAGE_PATH, SPIT_IMAGE_PATH, HEALTH_KIT_IMAGE, AMMO_KIT_IMAGE)
+from WalkabilityGrid import walkability_for_map
 
 # Global flag to track boss spawn
 boss_spawned = False
@@ -40,6 +43,42 @@ def random_point_in_rect(rect):
     y = random.uniform(rect.y, rect.y + rect.height)
     return pygame.Vector2(x, y)
 
+def random_walkable_point_in_rect(rect, tmx_data, size=ZOMBIE_SIZE):
+    """
+    Return a random point inside rect where a body of the given size does not
+    overlap any collision rect, checked against the map's walkability bitmap.
+    Gives up after SPAWN_ATTEMPTS tries and returns the last point drawn.
+    """
+    walkability = walkability_for_map(tmx_data)
+    for _ in range(SPAWN_ATTEMPTS):
+        pos = random_point_in_rect(rect)
+        body = pygame.Rect(pos.x - size // 2, pos.y - size // 2, size, size)
+        if walkability.is_area_walkable(body, SPAWN_CHECK_CELL_SIZE):
+            break
+    return pos
+
+def level_assets(current_level):
+    """
+    (path, size) of every sprite spawn_enemy and the special zombie bursts can
+    create on current_level, for AssetCache.preload when the level loads.
+    """
+    small = ZOMBIE_SIZE * 0.75
+    assets = [(ZOMBIE_IMAGE_PATH, (ZOMBIE_SIZE, ZOMBIE_SIZE)),
+              (SPECIAL_ZOMBIE_IMAGE_PATH, (ZOMBIE_SIZE * 2, ZOMBIE_SIZE * 2)),
+              (HEALTH_KIT_IMAGE, None), (AMMO_KIT_IMAGE, None)]
+    if current_level == 4:
+        assets.append((HUMAN_IMAGE_PATH, (ZOMBIE_SIZE, ZOMBIE_SIZE)))
+    elif current_level >= 2:
+        assets += [(POLICE_ZOMBIE_IMAGE_PATH, (small, small)), (ARMY_ZOMBIE_IMAGE_PATH, (small, small))]
+    if current_level == 7:
+        assets += [(BOSS_ZOMBIE_IMAGE_PATH, (ZOMBIE_SIZE * 2, ZOMBIE_SIZE * 2)), (SPIT_IMAGE_PATH, None)]
+    return assets
+
+def endless_assets():
+    """level_assets for Endless mode, where spawn_all_enemies_equally picks any enemy."""
+    return level_assets(2) + [(HUMAN_IMAGE_PATH, (ZOMBIE_SIZE, ZOMBIE_SIZE)),
+                              (BOSS_ZOMBIE_IMAGE_PATH, (ZOMBIE_SIZE * 2, ZOMBIE_SIZE * 2)), (SPIT_IMAGE_PATH, None)]
+
 def spawn_enemy(speed_multiplier=1.0, tmx_data=None, current_level=1):
     """
     Spawns an enemy (zombie or human) based on the current level.
@@ -53,7 +92,7 @@ def spawn_enemy(speed_multiplier=1.0, tmx_data=None, current_level=1):
         # Boss spawns only ONCE, specifically in boss zones on level 7
         if current_level == 7 and not boss_spawned and boss_zones:
             zone = random.choice(boss_zones)
-            pos = random_point_in_rect(zone)
+            pos = random_walkable_point_in_rect(zone, tmx_data, ZOMBIE_SIZE * 2)
             boss_spawned = True  # Set flag to prevent future spawns
             
             from BossZombie import BossZombie
@@ -62,7 +101,7 @@ def spawn_enemy(speed_multiplier=1.0, tmx_data=None, current_level=1):
         # Use existing spawn zones for other enemies if no specific zone found
         if spawn_zones:
             zone = random.choice(spawn_zones)
-            pos = random_point_in_rect(zone)
+            pos = random_walkable_point_in_rect(zone, tmx_data)
     
     if pos is None:
         # Fallback: choose a random position relative to (0,0)
@@ -101,7 +140,7 @@ def spawn_all_enemies_equally(speed_multiplier=1.0, tmx_data=None):
         _, spawn_zones, _ = load_spawn_zones(tmx_data)
         if spawn_zones:
             zone = random.choice(spawn_zones)
-            pos = random_point_in_rect(zone)
+            pos = random_walkable_point_in_rect(zone, tmx_data)
     
     if pos is None:
         # Fallback: random position
@@ -133,5 +172,5 @@ def find_player_spawn(tmx_data):
     player_zones, _, _ = load_spawn_zones(tmx_data)
     if player_zones:
         zone = random.choice(player_zones)
-        return random_point_in_rect(zone)
+        return random_walkable_point_in_rect(zone, tmx_data, PLAYER_SIZE)
     return pygame.Vector2(0, 0)
\ No newline at end of file
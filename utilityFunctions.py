@@ -9,6 +9,8 @@ from constants import (
 )
 from Zombie import Zombie
 from PoliceZombie import PoliceZombie  # Add this import
+from WalkabilityGrid import register_walkability
+from ChunkCache import chunk_cache
 
 def load_map(map_path=None):
     """
@@ -24,19 +26,21 @@ def load_collision_rects(tmx_data):
     Extract collision rectangles from the object layer named "props".
     Only objects with property 'collidable' set to true are used.
     Returns a list of pygame.Rect objects (in world coordinates).
+    The rects are also rasterised into the map's WalkabilityGrid.
     """
     collision_rects = []
     try:
         layer = tmx_data.get_layer_by_name("props")
     except Exception as e:
         print("Error: 'props' layer not found in map.", e)
-        return collision_rects
+        layer = []
 
     for obj in layer:
         prop = obj.properties.get("collidable")
         if prop in [True, "true", "True"]:
             rect = pygame.Rect(obj.x, obj.y, obj.width, obj.height)
             collision_rects.append(rect)
+    register_walkability(collision_rects, tmx_data)
     return collision_rects
 
 def draw_grid(surface, offset):
@@ -49,41 +53,102 @@ def draw_grid(surface, offset):
     for y in range(start_y, end_y, GRID_SPACING):
         pygame.draw.line(surface, GRID_COLOR, (0, y - offset.y), (WIDTH, y - offset.y))
 
-def draw_map(surface, tmx_data, offset):
+# (tmx_data, (extra columns, extra rows)) of the last map asked about, see tile_overhang.
+_last_overhang = (None, None)
+
+
+def tile_overhang(tmx_data):
     """
-    Draw all visible tile layers from the Tiled map, applying the camera offset.
+    How many cells past its own cell the largest tile image of the map reaches
+    (right and down, as tiles are drawn from their top-left corner).
+    """
+    global _last_overhang
+    if _last_overhang[0] is not tmx_data:
+        widths = [image.get_width() for image in tmx_data.images if image] or [tmx_data.tilewidth]
+        heights = [image.get_height() for image in tmx_data.images if image] or [tmx_data.tileheight]
+        _last_overhang = (tmx_data, (math.ceil(max(widths) / tmx_data.tilewidth) - 1,
+                                     math.ceil(max(heights) / tmx_data.tileheight) - 1))
+    return _last_overhang[1]
+
+
+def visible_tiles(tmx_data, offset, view_size):
+    """(col_start, row_start, col_end, row_end) of the tiles that can show in a view_size window at offset."""
+    extra_cols, extra_rows = tile_overhang(tmx_data)
+    col_start = max(0, math.floor(offset.x / tmx_data.tilewidth) - extra_cols)
+    row_start = max(0, math.floor(offset.y / tmx_data.tileheight) - extra_rows)
+    col_end = min(tmx_data.width, math.ceil((offset.x + view_size[0]) / tmx_data.tilewidth))
+    row_end = min(tmx_data.height, math.ceil((offset.y + view_size[1]) / tmx_data.tileheight))
+    return col_start, row_start, col_end, row_end
+
+
+def tile_blits(tmx_data, offset, view_size):
+    """
+    (image, position) pairs for every tile of the visible tile layers that can
+    show in a view_size window at offset, in drawing order. Positions are whole
+    pixels, the offset rounded up as blit() truncates on-screen positions, so
+    tiles drawn one by one or baked into chunks land on the same pixels.
     """
+    left, top = math.ceil(offset.x), math.ceil(offset.y)
+    col_start, row_start, col_end, row_end = visible_tiles(tmx_data, pygame.Vector2(left, top), view_size)
+    images = tmx_data.images
+    tilewidth, tileheight = tmx_data.tilewidth, tmx_data.tileheight
+    batch = []
     for layer in tmx_data.visible_layers:
         if hasattr(layer, 'data'):
-            for x, y, gid in layer:
-                tile = tmx_data.get_tile_image_by_gid(gid)
-                if tile:
-                    surface.blit(tile, (x * tmx_data.tilewidth - offset.x,
-                                          y * tmx_data.tileheight - offset.y))
+            for y in range(row_start, row_end):
+                row = layer.data[y]
+                tile_top = y * tileheight - top
+                for x in range(col_start, col_end):
+                    tile = images[row[x]]
+                    if tile:
+                        batch.append((tile, (x * tilewidth - left, tile_top)))
+    return batch
+
+
+def object_blits(tmx_data, layer, offset, view_size):
+    """(image, position) pairs for the tile objects of an object layer that overlap the view (all if view_size is None)."""
+    view = pygame.Rect(0, 0, *view_size) if view_size else None
+    left, top = math.ceil(offset.x), math.ceil(offset.y)  # Whole pixels, as in tile_blits
+    batch = []
+    for obj in layer:
+        if hasattr(obj, 'gid') and obj.gid:
+            tile = tmx_data.get_tile_image_by_gid(obj.gid)
+            if tile:
+                position = (math.floor(obj.x) - left, math.floor(obj.y) - top)
+                if view is None or view.colliderect(tile.get_rect(topleft=position)):
+                    batch.append((tile, position))
+    return batch
+
+
+def draw_tiles(surface, tmx_data, offset):
+    """
+    Draw the visible tile layers tile by tile. Only the tiles inside the surface
+    are visited, so the cost follows the screen size, not the map size. This is
+    the reference path the baked map chunks are rendered with.
+    """
+    surface.blits(tile_blits(tmx_data, offset, surface.get_size()), False)
+
+
+def draw_map(surface, tmx_data, offset):
+    """
+    Draw all visible tile layers from the Tiled map, applying the camera offset.
+    The layers never change after load, so they are drawn from chunks baked by
+    the shared ChunkCache.
+    """
+    chunk_cache.draw(surface, tmx_data, None, offset)
 
 def draw_objects(surface, tmx_data, layer_name, offset):
     """
     Draw objects from a specific object layer.
-    If an object has a valid gid, draw its associated tile image;
-    otherwise, draw a magenta rectangle for debugging.
+    Objects with a valid gid are drawn as their tile image, baked into chunks
+    like the tile layers; the others are only collision or trigger areas.
     """
     try:
-        layer = tmx_data.get_layer_by_name(layer_name)
+        tmx_data.get_layer_by_name(layer_name)
     except Exception as e:
         print(f"Error: Layer '{layer_name}' not found.", e)
         return
-
-    for obj in layer:
-        if hasattr(obj, 'gid') and obj.gid:
-            tile = tmx_data.get_tile_image_by_gid(obj.gid)
-            if tile:
-                surface.blit(tile, (obj.x - offset.x, obj.y - offset.y))
-            else:
-                rect = pygame.Rect(obj.x - offset.x, obj.y - offset.y, obj.width, obj.height)
-                # pygame.draw.rect(surface, (255, 0, 255), rect, 2)
-        else:
-            rect = pygame.Rect(obj.x - offset.x, obj.y - offset.y, obj.width, obj.height)
-            # pygame.draw.rect(surface, (255, 0, 255), rect, 2)
+    chunk_cache.draw(surface, tmx_data, layer_name, offset)
 
 def spawn_zombie(player_pos, speed_multiplier=1.0, tmx_data=None):
     """